@@ -0,0 +1,132 @@
+# benchmarks/bench_backtest.py
+"""
+Measures backtest throughput over synthetic universes of increasing size.
+
+Every case (symbols x years of hourly mock bars, one engine) runs in a
+fresh process, so its peak RSS is its own. Per-component timings come
+from the pipeline instrumentation: the busy time of the data, signal,
+risk, portfolio and execution stages.
+
+Run with:
+    poetry run python -m benchmarks.bench_backtest [--quick]
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import yaml
+
+CONFIG_PATH = Path(__file__).parent.parent / 'src' / 'core' / 'config.yaml'
+
+# (symbols, years of hourly bars)
+UNIVERSES: List[Tuple[int, float]] = [(4, 0.25), (16, 0.5), (32, 1.0)]
+QUICK_UNIVERSES: List[Tuple[int, float]] = [(2, 0.05), (8, 0.1)]
+ENGINES = ('event', 'vectorized')
+COMPONENTS = ('data', 'signal', 'risk', 'portfolio', 'executor')
+
+
+def universe_config(n_symbols: int, years: float, engine: str) -> Dict[str, Any]:
+    """The default configuration over n_symbols mock symbols and `years` of hourly bars."""
+    with open(CONFIG_PATH) as f:
+        settings = yaml.safe_load(f)
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    end = start + timedelta(days=365 * years)
+    settings['trading'].update(pairs=[f"S{i:03d}/USDT" for i in range(n_symbols)], engine=engine)
+    settings['data'].update(source='mock', timeframe='1h')
+    settings['backtester'].update(start_date=start.isoformat(), end_date=end.isoformat(), seed=0)
+    settings['signal']['model_path'] = None
+    settings['metrics'] = {'enabled': True, 'path': os.devnull}
+    return settings
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_case(n_symbols: int, years: float, engine: str) -> Dict[str, Any]:
+    """
+    Runs one backtest and measures it; meant to run in its own process.
+
+    Returns:
+        Bars (symbol-bars) processed, seconds, bars per second, peak RSS
+        and the busy seconds of each component.
+    """
+    from src.core.config import config
+    from src.backtester.backtester import Backtester
+    from src.backtester.vectorized_backtester import VectorizedBacktester
+
+    config.load_dict(universe_config(n_symbols, years, engine))
+    engine_class = VectorizedBacktester if engine == 'vectorized' else Backtester
+    # Logging is not set up in the worker, so the agents' messages are dropped
+    backtester = engine_class()
+    start = time.perf_counter()
+    backtester.run()
+    seconds = time.perf_counter() - start
+
+    stages = backtester.metrics.summary()['stages']
+    bars = stages['data']['events_out']
+    components = {name: 0.0 for name in COMPONENTS}
+    for key, stage in stages.items():
+        name = key.split('.')[0]
+        if name in components:
+            components[name] += stage['busy_seconds']
+    return {
+        'symbols': n_symbols,
+        'years': years,
+        'engine': engine,
+        'bars': bars,
+        'seconds': seconds,
+        'bars_per_sec': bars / seconds,
+        'peak_rss_mb': peak_rss_mb(),
+        'component_seconds': components,
+        'final_value': backtester.summary()['final_value'],
+    }
+
+
+def run_universes(universes: List[Tuple[int, float]], engines=ENGINES) -> List[Dict[str, Any]]:
+    """Runs every universe with every engine, each in a fresh process."""
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for n_symbols, years in universes:
+        for engine in engines:
+            with context.Pool(1) as pool:
+                results.append(pool.apply(run_case, (n_symbols, years, engine)))
+    return results
+
+
+def print_table(results: List[Dict[str, Any]]):
+    """Prints throughput, memory and the component split of each case."""
+    header = f"{'symbols':>8}{'years':>7}{'engine':>12}{'bars':>10}{'bars/s':>11}{'RSS MiB':>9}"
+    print(header + ''.join(f"{name:>10}" for name in COMPONENTS))
+    for result in results:
+        row = (
+            f"{result['symbols']:>8}{result['years']:>7.2f}{result['engine']:>12}{result['bars']:>10}"
+            f"{result['bars_per_sec']:>11.0f}{result['peak_rss_mb']:>9.0f}"
+        )
+        print(row + ''.join(f"{result['component_seconds'][name]:>9.2f}s" for name in COMPONENTS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--quick', action='store_true', help='Small universes only')
+    parser.add_argument('--engine', choices=ENGINES, help='Only this engine')
+    args = parser.parse_args()
+
+    results = run_universes(
+        QUICK_UNIVERSES if args.quick else UNIVERSES,
+        (args.engine,) if args.engine else ENGINES,
+    )
+    print_table(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_events.py
+"""
+Measures the per-event construction time and memory of the event types.
+
+Compares the slotted dataclass events against the Pydantic models they
+replaced, and against the same events with debug validation switched on.
+
+Run with:
+    poetry run python -m benchmarks.bench_events
+"""
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Literal
+
+from pydantic import BaseModel
+
+from src.core import events
+
+
+class PydanticMarketDataEvent(BaseModel):
+    """The Pydantic MarketDataEvent as it was before the slotted events."""
+    timestamp: datetime
+    symbol: str
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+class PydanticSignalEvent(BaseModel):
+    """The Pydantic SignalEvent as it was before the slotted events."""
+    timestamp: datetime
+    symbol: str
+    signal_type: Literal['buy', 'sell', 'hold']
+    strength: float
+
+
+TIMESTAMP = datetime(2023, 1, 1, tzinfo=timezone.utc)
+MARKET_FIELDS = dict(
+    timestamp=TIMESTAMP, symbol='BTC/USDT',
+    open=30000.0, high=30100.0, low=29900.0, close=30050.0, volume=512.0
+)
+SIGNAL_FIELDS = dict(timestamp=TIMESTAMP, symbol='BTC/USDT', signal_type='buy', strength=0.8)
+
+
+def construction_ns(factory: Callable[[], object], number: int) -> float:
+    """Returns the best-of-five construction time per object in nanoseconds."""
+    timer = timeit.Timer(factory)
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e9
+
+
+def allocated_bytes(factory: Callable[[], object], number: int) -> float:
+    """Returns the memory retained per object, measured with tracemalloc."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory() for _ in range(number)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    # The list itself holds one pointer per object
+    return (after - before) / number - 8
+
+
+def main(number: int = 100_000) -> None:
+    """Prints a comparison table for the market data and signal events."""
+    cases = [
+        ('MarketDataEvent', 'pydantic', lambda: PydanticMarketDataEvent(**MARKET_FIELDS)),
+        ('MarketDataEvent', 'slotted', lambda: events.MarketDataEvent(**MARKET_FIELDS)),
+        ('MarketDataEvent', 'slotted+validate', lambda: events.MarketDataEvent(**MARKET_FIELDS)),
+        ('SignalEvent', 'pydantic', lambda: PydanticSignalEvent(**SIGNAL_FIELDS)),
+        ('SignalEvent', 'slotted', lambda: events.SignalEvent(**SIGNAL_FIELDS)),
+        ('SignalEvent', 'slotted+validate', lambda: events.SignalEvent(**SIGNAL_FIELDS)),
+    ]
+
+    print(f"{'event':<18}{'variant':<18}{'ns/event':>12}{'bytes/event':>14}")
+    for name, variant, factory in cases:
+        events.set_event_validation(variant.endswith('validate'))
+        # Validation is slow, so time fewer of those
+        n = number // 20 if variant.endswith('validate') else number
+        ns = construction_ns(factory, n)
+        size = allocated_bytes(factory, n)
+        print(f"{name:<18}{variant:<18}{ns:>12.0f}{size:>14.0f}")
+    events.set_event_validation(False)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,85 @@
+# benchmarks/bench_micro.py
+"""
+Microbenchmarks of the per-event hot path.
+
+Times building each event type, Settings.get for shallow, nested and
+missing keys (and attribute access), and publishing one batch through a
+sync EventBus.
+
+Run with:
+    poetry run python -m benchmarks.bench_micro
+"""
+from typing import Dict
+
+from benchmarks.bench_events import MARKET_FIELDS, SIGNAL_FIELDS, TIMESTAMP, construction_ns
+from src.core import events
+from src.core.config import Settings
+from src.core.event_bus import EventBus
+
+RISK_FIELDS = dict(timestamp=TIMESTAMP, symbol='BTC/USDT', signal_type='buy', adjusted_size=0.1)
+DECISION_FIELDS = dict(timestamp=TIMESTAMP, symbol='BTC/USDT', action='buy', quantity=0.5)
+EXECUTION_FIELDS = dict(
+    timestamp=TIMESTAMP, symbol='BTC/USDT', action='buy',
+    quantity=0.5, fill_price=30050.0, commission=15.0, status='filled'
+)
+SETTINGS = {
+    'trading': {'exchange': 'binance', 'pairs': ['BTC/USDT', 'ETH/USDT']},
+    'risk': {'ewma_lambda': 0.94},
+    'executor': {'commission_rate': 0.001},
+}
+
+
+def event_construction(number: int) -> Dict[str, float]:
+    """Nanoseconds to build one event of each type."""
+    events.set_event_validation(False)
+    cases = {
+        'MarketDataEvent': lambda: events.MarketDataEvent(**MARKET_FIELDS),
+        'SignalEvent': lambda: events.SignalEvent(**SIGNAL_FIELDS),
+        'RiskAdjustedSignalEvent': lambda: events.RiskAdjustedSignalEvent(**RISK_FIELDS),
+        'PortfolioDecisionEvent': lambda: events.PortfolioDecisionEvent(**DECISION_FIELDS),
+        'OrderExecutionEvent': lambda: events.OrderExecutionEvent(**EXECUTION_FIELDS),
+    }
+    return {name: construction_ns(factory, number) for name, factory in cases.items()}
+
+
+def config_get(number: int) -> Dict[str, float]:
+    """Nanoseconds per Settings lookup on a small settings tree."""
+    settings = Settings.from_dict(SETTINGS)
+    return {
+        'shallow': construction_ns(lambda: settings.get('trading'), number),
+        'nested': construction_ns(lambda: settings.get('risk.ewma_lambda'), number),
+        'missing': construction_ns(lambda: settings.get('risk.vol_target', None), number),
+        'attribute': construction_ns(lambda: settings.risk.ewma_lambda, number),
+    }
+
+
+def bus_publish(number: int, n_symbols: int = 8) -> Dict[str, float]:
+    """Nanoseconds per event to route one timestamp's bars to a no-op stage."""
+    bus = EventBus(mode='sync')
+    bus.subscribe(events.MarketDataEvent, lambda batch: None, stage='signal')
+    batch = [
+        events.MarketDataEvent(**{**MARKET_FIELDS, 'symbol': f"S{j:03d}/USDT"})
+        for j in range(n_symbols)
+    ]
+    return {f"{n_symbols} symbols": construction_ns(lambda: bus.publish(batch), number // n_symbols) / n_symbols}
+
+
+def run_micro(number: int = 100_000) -> Dict[str, Dict[str, float]]:
+    """Runs every microbenchmark; results are nanoseconds per operation."""
+    return {
+        'event_construction_ns': event_construction(number),
+        'config_get_ns': config_get(number),
+        'bus_publish_ns': bus_publish(number),
+    }
+
+
+def print_micro(results: Dict[str, Dict[str, float]]):
+    """Prints one line per microbenchmark."""
+    print(f"{'benchmark':<24}{'case':<26}{'ns/op':>10}")
+    for group, cases in results.items():
+        for case, ns in cases.items():
+            print(f"{group:<24}{case:<26}{ns:>10.0f}")
+
+
+if __name__ == '__main__':
+    print_micro(run_micro())
@@ -0,0 +1,102 @@
+# benchmarks/bench_order_execution.py
+"""
+Measures live order throughput against the local stub exchange.
+
+Compares sending a rebalance's orders one request at a time over a single
+connection with the async OrderExecutor (concurrent, pooled, rate
+limited) with and without order batching. The stub adds a fixed latency
+to every response and rejects requests above its rate limit.
+
+Run with:
+    poetry run python -m benchmarks.bench_order_execution
+"""
+import asyncio
+import contextlib
+import io
+import time
+from datetime import datetime, timezone
+from typing import List
+
+from src.core.config import config
+from src.core.events import PortfolioDecisionEvent
+from src.exchange.http_client import AsyncHTTPClient
+from src.exchange.rest_api import ExchangeRestAPI
+from src.exchange.stub_exchange import StubExchange
+from src.executor.order_executor import OrderExecutor
+
+SYMBOLS = [f"C{i:03d}/USDT" for i in range(50)]
+LATENCY = 0.02  # seconds per response
+VENUE_RATE = 100.0  # order requests per second
+N_ORDERS = 200
+
+
+def decisions() -> List[PortfolioDecisionEvent]:
+    """A rebalance with one buy per symbol, repeated to N_ORDERS orders."""
+    timestamp = datetime.now(timezone.utc)
+    return [
+        PortfolioDecisionEvent(timestamp=timestamp, symbol=SYMBOLS[i % len(SYMBOLS)], action='buy', quantity=0.1)
+        for i in range(N_ORDERS)
+    ]
+
+
+async def serial(stub: StubExchange) -> float:
+    """One blocking-style request per order over one connection; returns seconds."""
+    async with AsyncHTTPClient(stub.url, max_connections=1) as client:
+        api = ExchangeRestAPI(client)
+        start = time.perf_counter()
+        for i, event in enumerate(decisions()):
+            while True:
+                try:
+                    await api.create_order({
+                        'symbol': event.symbol, 'side': event.action,
+                        'quantity': event.quantity, 'client_order_id': f"serial-{i}",
+                    })
+                    break
+                except Exception:
+                    await asyncio.sleep(0.01)
+        return time.perf_counter() - start
+
+
+async def concurrent(stub: StubExchange, batch_size: int) -> float:
+    """The async OrderExecutor; returns seconds."""
+    config.load_dict({'executor': {
+        'requests_per_second': VENUE_RATE, 'burst': 10.0, 'max_batch_size': batch_size,
+    }})
+    async with AsyncHTTPClient(stub.url, max_connections=8) as client:
+        with contextlib.redirect_stdout(io.StringIO()):
+            executor = OrderExecutor('live', ExchangeRestAPI(client))
+            start = time.perf_counter()
+            fills = [event async for event in executor.execute_orders_async(decisions(), {})]
+            elapsed = time.perf_counter() - start
+        assert sum(event.status != 'failed' for event in fills) == N_ORDERS
+        return elapsed
+
+
+async def main():
+    """Prints orders per second for each execution strategy."""
+    results = {}
+    for name, run in (
+        ('serial, 1 connection', serial),
+        ('concurrent, 8 connections', lambda stub: concurrent(stub, 1)),
+        ('concurrent + batches of 5', lambda stub: concurrent(stub, 5)),
+    ):
+        with contextlib.redirect_stdout(io.StringIO()):
+            stub = StubExchange(
+                SYMBOLS, '1m', seed=0, latency=LATENCY, history=10,
+                order_rate=VENUE_RATE, partial_fill_ratio=0.1
+            )
+            await stub.start()
+        try:
+            results[name] = (await run(stub), stub.rate_limited)
+        finally:
+            await stub.stop()
+
+    print(f"{N_ORDERS} market orders, {LATENCY * 1000:.0f} ms latency, venue limit {VENUE_RATE:.0f} requests/s")
+    print(f"{'strategy':<28}{'seconds':>10}{'orders/s':>12}{'429s':>8}")
+    baseline = results['serial, 1 connection'][0]
+    for name, (seconds, rejected) in results.items():
+        print(f"{name:<28}{seconds:>10.2f}{N_ORDERS / seconds:>12.0f}{rejected:>8}   x{baseline / seconds:.1f}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+# benchmarks/bench_startup.py
+"""
+Measures cold-start time: how long a fresh process takes to get ready.
+
+Each case runs in a new interpreter, as a sweep worker or a short run
+would, and reports the median wall time over several launches. The bare
+interpreter is measured too, so the cost of the application's own
+imports and setup can be read off against it.
+
+Run with:
+    poetry run python -m benchmarks.bench_startup
+"""
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+ROOT = Path(__file__).parent.parent
+
+CASES = {
+    'interpreter': 'pass',
+    # Entry point only; the mode's modules are imported once it is chosen
+    'import_main': 'import src.main',
+    'load_config': (
+        "from pathlib import Path\n"
+        "from src.core.config import Settings\n"
+        "Settings.from_yaml(Path('src/core/config.yaml'))"
+    ),
+    'backtester_ready': (
+        "from pathlib import Path\n"
+        "from src.core.config import Settings\n"
+        "from src.backtester.backtester import Backtester\n"
+        "Backtester(settings=Settings.from_yaml(Path('src/core/config.yaml')))"
+    ),
+    # What a spawned sweep worker imports before its first run
+    'sweep_worker': 'import src.backtester.parameter_sweep',
+}
+
+
+def startup_ms(code: str, repeat: int) -> float:
+    """Median milliseconds to run `code` in a fresh interpreter."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True, capture_output=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1e3
+
+
+def run_startup(repeat: int = 15) -> Dict[str, float]:
+    """Median cold-start milliseconds of every case."""
+    return {name: startup_ms(code, repeat) for name, code in CASES.items()}
+
+
+def print_startup(results: Dict[str, float]):
+    """Prints one line per case, with the time on top of the bare interpreter."""
+    base = results.get('interpreter', 0.0)
+    print(f"{'startup':<24}{'ms':>10}{'+interp ms':>12}")
+    for name, ms in results.items():
+        print(f"{name:<24}{ms:>10.1f}{ms - base:>12.1f}")
+
+
+if __name__ == '__main__':
+    print_startup(run_startup())
@@ -0,0 +1,131 @@
+# benchmarks/suite.py
+"""
+Runs the benchmark suite and checks it against a saved baseline.
+
+The backtest universes (bench_backtest), the microbenchmarks
+(bench_micro) and the cold-start times (bench_startup) are flattened into named metrics, each with the direction
+that counts as better. A metric more than --threshold worse than the
+baseline is reported as a regression and the suite exits with status 1.
+
+Run with:
+    poetry run python -m benchmarks.suite [--quick] [--save-baseline]
+
+Baselines depend on the machine, so benchmarks/baseline.json is not
+checked in: create it with --save-baseline before a change and compare
+after it on the same host.
+"""
+import argparse
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.bench_backtest import QUICK_UNIVERSES, UNIVERSES, print_table, run_universes
+from benchmarks.bench_micro import print_micro, run_micro
+from benchmarks.bench_startup import print_startup, run_startup
+
+BENCH_DIR = Path(__file__).parent
+DEFAULT_BASELINE = BENCH_DIR / 'baseline.json'
+DEFAULT_OUTPUT = BENCH_DIR / 'results' / 'latest.json'
+DEFAULT_THRESHOLD = 0.2
+
+
+def flatten(
+    backtests: List[Dict[str, Any]],
+    micro: Dict[str, Dict[str, float]],
+    startup: Dict[str, float]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Names every compared measurement.
+
+    Returns:
+        {name: {'value': ..., 'better': 'higher' | 'lower'}}
+    """
+    metrics = {}
+    for result in backtests:
+        name = f"backtest.{result['engine']}.{result['symbols']}x{result['years']:g}y"
+        metrics[f"{name}.bars_per_sec"] = {'value': result['bars_per_sec'], 'better': 'higher'}
+        metrics[f"{name}.peak_rss_mb"] = {'value': result['peak_rss_mb'], 'better': 'lower'}
+    for group, cases in micro.items():
+        for case, ns in cases.items():
+            metrics[f"micro.{group}.{case}"] = {'value': ns, 'better': 'lower'}
+    for case, ms in startup.items():
+        metrics[f"startup.{case}_ms"] = {'value': ms, 'better': 'lower'}
+    return metrics
+
+
+def compare(metrics: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], threshold: float) -> List[str]:
+    """
+    Prints each metric's change against the baseline.
+
+    Returns:
+        The names of the metrics that regressed by more than threshold.
+    """
+    regressions = []
+    print(f"\n{'metric':<58}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, metric in metrics.items():
+        if name not in baseline:
+            print(f"{name:<58}{'-':>12}{metric['value']:>12.1f}{'new':>9}")
+            continue
+        before, after = baseline[name]['value'], metric['value']
+        change = (after - before) / before if before else 0.0
+        # Positive `worse` means the metric moved in the wrong direction
+        worse = -change if metric['better'] == 'higher' else change
+        flag = '  REGRESSION' if worse > threshold else ''
+        if flag:
+            regressions.append(name)
+        print(f"{name:<58}{before:>12.1f}{after:>12.1f}{change:>+9.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--quick', action='store_true', help='Small universes only')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE, help='Baseline JSON to compare with')
+    parser.add_argument('--save-baseline', action='store_true', help='Write the results as the new baseline')
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT, help='Where to write the results')
+    parser.add_argument('--threshold', type=float, default=None,
+                        help=f"Allowed relative slowdown (default: the baseline's, else {DEFAULT_THRESHOLD})")
+    args = parser.parse_args()
+
+    backtests = run_universes(QUICK_UNIVERSES if args.quick else UNIVERSES)
+    print_table(backtests)
+    print()
+    micro = run_micro()
+    print_micro(micro)
+    print()
+    startup = run_startup(5 if args.quick else 15)
+    print_startup(startup)
+
+    results = {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'machine': {'python': platform.python_version(), 'platform': platform.platform(), 'cpu': platform.processor()},
+        'threshold': args.threshold if args.threshold is not None else DEFAULT_THRESHOLD,
+        'metrics': flatten(backtests, micro, startup),
+        'backtests': backtests,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2))
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"Baseline saved to {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    threshold = args.threshold if args.threshold is not None else baseline.get('threshold', DEFAULT_THRESHOLD)
+    regressions = compare(results['metrics'], baseline['metrics'], threshold)
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {threshold:.0%}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {threshold:.0%}")
+
+
+if __name__ == '__main__':
+    main()
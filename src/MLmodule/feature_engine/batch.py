@@ -0,0 +1,123 @@
+# src/MLmodule/feature_engine/batch.py
+"""
+Batch (whole-history) indicator computation for training, with pandas-ta.
+
+Each function calls the pandas-ta indicator on its pandas code path
+(talib=False), which the streaming indicators in `indicators.py`
+reproduce bar by bar, and names the output like the streaming engine.
+pandas-ta is imported on first use, so the streaming engine does not
+load it.
+"""
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+
+
+def _ta():
+    """Imports pandas-ta (it pulls in numba, so only when batch features are built)."""
+    import pandas_ta
+    return pandas_ta
+
+
+def _series(result: Optional[pd.Series], index: pd.Index, name: str) -> pd.Series:
+    """Names a pandas-ta result; pandas-ta returns None for a history shorter than the window."""
+    if result is None:
+        return pd.Series(np.nan, index=index, name=name)
+    return result.rename(name)
+
+
+def _frame(result: Optional[pd.DataFrame], index: pd.Index, names: List[str]) -> pd.DataFrame:
+    """Keeps the first len(names) columns of a pandas-ta result under the given names."""
+    if result is None:
+        return pd.DataFrame(np.nan, index=index, columns=names)
+    result = result.iloc[:, :len(names)].copy()
+    result.columns = names
+    return result
+
+
+def sma(close: pd.Series, length: int = 10) -> pd.Series:
+    """Simple moving average."""
+    return _series(_ta().sma(close, length=length, talib=False), close.index, f'SMA_{length}')
+
+
+def ema(close: pd.Series, length: int = 10) -> pd.Series:
+    """Exponential moving average, seeded with the SMA of the first `length` values."""
+    return _series(_ta().ema(close, length=length, presma=True, talib=False), close.index, f'EMA_{length}')
+
+
+def rsi(close: pd.Series, length: int = 14, scalar: float = 100.0) -> pd.Series:
+    """Relative strength index."""
+    return _series(_ta().rsi(close, length=length, scalar=scalar, talib=False), close.index, f'RSI_{length}')
+
+
+def atr(high: pd.Series, low: pd.Series, close: pd.Series, length: int = 14) -> pd.Series:
+    """Average true range with Wilder (RMA) smoothing."""
+    result = _ta().atr(high, low, close, length=length, mamode='rma', talib=False)
+    return _series(result, close.index, f'ATRr_{length}')
+
+
+def volatility(close: pd.Series, length: int = 20) -> pd.Series:
+    """Rolling standard deviation (ddof=1) of log returns."""
+    ta = _ta()
+    result = ta.stdev(ta.log_return(close, length=1), length=length, ddof=1, talib=False)
+    return _series(result, close.index, f'VOL_{length}')
+
+
+def vwap(high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series) -> pd.Series:
+    """Volume-weighted average price, anchored to each day of the index."""
+    return _series(_ta().vwap(high, low, close, volume, anchor='D'), close.index, 'VWAP_D')
+
+
+def bbands(close: pd.Series, length: int = 5, std: float = 2.0, ddof: int = 0) -> pd.DataFrame:
+    """Bollinger bands (lower, middle, upper)."""
+    std = float(std)
+    result = _ta().bbands(close, length=length, lower_std=std, upper_std=std, ddof=ddof, mamode='sma', talib=False)
+    suffix = f'{length}_{std}'
+    return _frame(result, close.index, [f'BBL_{suffix}', f'BBM_{suffix}', f'BBU_{suffix}'])
+
+
+def macd(close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.DataFrame:
+    """MACD line, histogram and signal line."""
+    result = _ta().macd(close, fast=fast, slow=slow, signal=signal, talib=False)
+    suffix = f'{fast}_{slow}_{signal}'
+    return _frame(result, close.index, [f'MACD_{suffix}', f'MACDh_{suffix}', f'MACDs_{suffix}'])
+
+
+def compute_features(frame: pd.DataFrame, spec: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Computes a feature specification over a full OHLCV history.
+
+    Args:
+        frame: One symbol's candles with a DatetimeIndex and
+            open/high/low/close/volume columns.
+        spec: Indicator entries such as {'kind': 'rsi', 'length': 14}.
+
+    Returns:
+        A DataFrame of features, one column per indicator output.
+
+    Raises:
+        ImportError: If pandas-ta is not installed.
+    """
+    columns = []
+    for entry in spec:
+        params = {key: value for key, value in entry.items() if key != 'kind'}
+        kind = entry['kind']
+        if kind == 'sma':
+            columns.append(sma(frame['close'], **params))
+        elif kind == 'ema':
+            columns.append(ema(frame['close'], **params))
+        elif kind == 'rsi':
+            columns.append(rsi(frame['close'], **params))
+        elif kind == 'atr':
+            columns.append(atr(frame['high'], frame['low'], frame['close'], **params))
+        elif kind == 'volatility':
+            columns.append(volatility(frame['close'], **params))
+        elif kind == 'vwap':
+            columns.append(vwap(frame['high'], frame['low'], frame['close'], frame['volume']))
+        elif kind == 'bbands':
+            columns.append(bbands(frame['close'], **params))
+        elif kind == 'macd':
+            columns.append(macd(frame['close'], **params))
+        else:
+            raise ValueError(f"Unknown indicator kind '{kind}'")
+    return pd.concat(columns, axis=1)
@@ -0,0 +1,262 @@
+# src/MLmodule/feature_engine/feature_cache.py
+"""
+Content-addressed on-disk cache of computed features.
+
+An entry holds the features and closes of a universe streamed from one
+start date. It is keyed by a hash of everything that determines them: the
+data source, symbols, timeframe, start date and feature specification.
+The end date is not part of the key. A request ending inside an entry
+reads a prefix of it. A request ending later extends the entry: only the
+new bars are streamed, continuing from the saved indicator and data
+stream state, so the features equal a fresh computation's.
+
+Layout: <root>/<hash>/<BASE-QUOTE>/{features,close}.bin, timestamps.bin,
+state-<rows>.pkl and meta.json. The arrays are raw float64 files,
+memory-mapped on read. meta.json is replaced atomically once the arrays
+and state are written, so an interrupted update leaves the previous rows
+readable.
+
+The cache is bounded in bytes: after every request the least recently
+used entries are evicted until it fits. Hits, extensions, misses and
+evictions are counted in `stats`.
+
+Usage:
+    cache = FeatureCache(Path('data/features'), max_bytes=1 << 30)
+    path, rows = cache.get(collector, spec, {'source': 'mock', 'seed': 42})
+    meta, arrays = open_features(path, rows)
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from src.data_fetcher.data_collector import DataCollector
+from src.MLmodule.feature_engine.feature_engine import FeatureEngine
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the same key would produce different cached arrays
+FEATURE_CACHE_VERSION = 2
+
+
+def spec_hash(spec: List[Dict[str, Any]]) -> str:
+    """A stable hash of a feature specification."""
+    return hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _symbol_dir(path: Path, symbol: str) -> Path:
+    return path / symbol.replace('/', '-')
+
+
+def _read_meta(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path / 'meta.json', 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def open_features(path: Path, rows: Optional[int] = None) -> Tuple[Dict[str, Any], List[Tuple[np.ndarray, np.ndarray]]]:
+    """
+    Memory-maps the cached (features, close) arrays of every symbol.
+
+    Args:
+        path: An entry directory returned by FeatureCache.get.
+        rows: Rows to map, e.g. the rows of the requested range; defaults to all.
+
+    Returns:
+        The entry's meta and one (features (rows, F), close (rows,)) pair per symbol.
+    """
+    path = Path(path)
+    meta = _read_meta(path)
+    rows = meta['rows'] if rows is None else rows
+    n_features = len(meta['feature_names'])
+    arrays = []
+    for symbol in meta['symbols']:
+        symbol_dir = _symbol_dir(path, symbol)
+        features = np.memmap(symbol_dir / 'features.bin', dtype=np.float64, mode='r', shape=(rows, n_features))
+        close = np.memmap(symbol_dir / 'close.bin', dtype=np.float64, mode='r', shape=(rows,))
+        arrays.append((features, close))
+    return meta, arrays
+
+
+class FeatureCache:
+    """
+    Computes features through the cache, reusing and extending earlier entries.
+    """
+
+    def __init__(self, root: Path, max_bytes: Optional[int] = None):
+        """
+        Initializes the cache.
+
+        Args:
+            root: Directory holding the entries.
+            max_bytes: Size bound of all entries together; None for unbounded.
+                The entry just used is kept even if it alone exceeds it.
+        """
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'extensions': 0, 'misses': 0, 'evictions': 0, 'rows_reused': 0, 'rows_computed': 0}
+
+    def entry_path(self, collector: DataCollector, spec: List[Dict[str, Any]], data_key: Dict[str, Any]) -> Path:
+        """The entry directory for a collector's stream and a feature specification."""
+        key = {
+            'version': FEATURE_CACHE_VERSION,
+            'data': data_key,
+            'symbols': list(collector.symbols),
+            'timeframe': collector.timeframe,
+            'start': collector.start_dt.isoformat(),
+            'spec': spec_hash(spec),
+        }
+        return self.root / hashlib.sha1(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+    def get(
+        self,
+        collector: DataCollector,
+        spec: List[Dict[str, Any]],
+        data_key: Dict[str, Any]
+    ) -> Tuple[Path, int]:
+        """
+        Features for the collector's range, computed only where not cached.
+
+        Args:
+            collector: Source of the bars, not yet streamed.
+            spec: The FeatureEngine specification.
+            data_key: Everything else that determines the bars (source, seed, ...).
+
+        Returns:
+            A tuple (entry path, rows): the entry's first `rows` rows cover
+            the collector's range; read them with open_features.
+        """
+        path = self.entry_path(collector, spec, data_key)
+        end_ns = collector.end_dt.value
+        meta = _read_meta(path)
+        if meta is not None and meta['next_ns'] > end_ns:
+            timestamps = np.memmap(path / 'timestamps.bin', dtype=np.int64, mode='r', shape=(meta['rows'],))
+            rows = int(np.searchsorted(timestamps, end_ns, side='right'))
+            self.stats['hits'] += 1
+            self.stats['rows_reused'] += rows
+            logger.info("FeatureCache: Hit, %d rows from %s", rows, path)
+        else:
+            rows, added = self._update(path, meta, collector, spec, data_key)
+            if meta is None:
+                self.stats['misses'] += 1
+            elif added:
+                self.stats['extensions'] += 1
+            else:
+                self.stats['hits'] += 1
+            self.stats['rows_reused'] += rows - added
+            self.stats['rows_computed'] += added
+            logger.info("FeatureCache: %s, %d of %d rows computed in %s",
+                        'Miss' if meta is None else 'Extended', added, rows, path)
+        # meta.json's modification time orders entries for eviction
+        os.utime(path / 'meta.json')
+        self.evict(keep=path)
+        return path, rows
+
+    def _update(
+        self,
+        path: Path,
+        meta: Optional[Dict[str, Any]],
+        collector: DataCollector,
+        spec: List[Dict[str, Any]],
+        data_key: Dict[str, Any]
+    ) -> Tuple[int, int]:
+        """Streams the bars an entry is missing into it; returns (rows, rows added)."""
+        engine = FeatureEngine(collector.symbols, spec)
+        rows = 0
+        if meta is not None:
+            rows = meta['rows']
+            with open(path / meta['state'], 'rb') as f:
+                state = pickle.load(f)
+            engine.indicators = state['indicators']
+            collector.set_state(state['collector'])
+
+        symbol_dirs = [_symbol_dir(path, symbol) for symbol in collector.symbols]
+        for symbol_dir in symbol_dirs:
+            symbol_dir.mkdir(parents=True, exist_ok=True)
+        n_features = len(engine.feature_names)
+        item = np.dtype(np.float64).itemsize
+        # Past the last committed row: drop whatever an interrupted update left
+        files = [open(path / 'timestamps.bin', 'ab')]
+        files[0].truncate(rows * item)
+        for symbol_dir in symbol_dirs:
+            for name, width in (('features.bin', n_features), ('close.bin', 1)):
+                f = open(symbol_dir / name, 'ab')
+                f.truncate(rows * width * item)
+                files.append(f)
+
+        added = 0
+        try:
+            for chunk in collector.get_bar_chunks():
+                features = engine.update_chunk(chunk)
+                chunk.timestamps.astype('datetime64[ns]').astype(np.int64).tofile(files[0])
+                for j in range(len(symbol_dirs)):
+                    np.ascontiguousarray(features[:, j, :]).tofile(files[1 + 2 * j])
+                    np.ascontiguousarray(chunk.close[:, j]).tofile(files[2 + 2 * j])
+                added += len(chunk.timestamps)
+        finally:
+            for f in files:
+                f.close()
+
+        rows += added
+        state_name = f'state-{rows}.pkl'
+        with open(path / state_name, 'wb') as f:
+            pickle.dump({
+                'indicators': engine.indicators,
+                'collector': collector.get_state(collector.current_dt),
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path = path / 'meta.json.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'rows': rows,
+                'next_ns': collector.current_dt.value,
+                'symbols': list(collector.symbols),
+                'feature_names': engine.feature_names,
+                'state': state_name,
+                'key': data_key,
+            }, f, default=str)
+        os.replace(tmp_path, path / 'meta.json')
+        if meta is not None and meta['state'] != state_name:
+            (path / meta['state']).unlink(missing_ok=True)
+        return rows, added
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        """
+        Removes least recently used entries until the cache fits max_bytes.
+
+        Args:
+            keep: An entry never to evict (the one in use).
+
+        Returns:
+            The number of entries removed.
+        """
+        if self.max_bytes is None or not self.root.exists():
+            return 0
+        entries = []
+        for entry in self.root.iterdir():
+            if not entry.is_dir():
+                continue
+            meta_path = entry / 'meta.json'
+            # Entries without meta.json were never completed
+            used = meta_path.stat().st_mtime if meta_path.exists() else 0.0
+            size = sum(f.stat().st_size for f in entry.rglob('*') if f.is_file())
+            entries.append((used, size, entry))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            if keep is not None and entry == keep:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+        if removed:
+            self.stats['evictions'] += removed
+            logger.info("FeatureCache: Evicted %d entries; %d bytes remain.", removed, total)
+        return removed
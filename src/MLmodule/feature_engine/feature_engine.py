@@ -0,0 +1,149 @@
+# src/MLmodule/feature_engine/feature_engine.py
+"""
+Streaming feature engine for the signal agent.
+
+Keeps O(1)-update indicator state per symbol and turns each new bar into
+a feature vector. The same specification can be computed over a whole
+history with pandas-ta through `batch_features`, for training.
+"""
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+from src.core.events import MarketDataEvent
+from src.data_fetcher.data_collector import OHLCVPanel
+from src.MLmodule.feature_engine.batch import compute_features
+from src.MLmodule.feature_engine.indicators import INDICATORS, BarRows
+
+DEFAULT_FEATURES: List[Dict[str, Any]] = [
+    {'kind': 'ema', 'length': 10},
+    {'kind': 'sma', 'length': 20},
+    {'kind': 'rsi', 'length': 14},
+    {'kind': 'atr', 'length': 14},
+    {'kind': 'volatility', 'length': 20},
+    {'kind': 'vwap'},
+    {'kind': 'bbands', 'length': 20, 'std': 2.0},
+    {'kind': 'macd', 'fast': 12, 'slow': 26, 'signal': 9},
+]
+
+
+class FeatureEngine:
+    """
+    Computes indicator features incrementally for a fixed set of symbols.
+    """
+
+    def __init__(self, symbols: List[str], spec: Optional[List[Dict[str, Any]]] = None):
+        """
+        Initializes the feature engine.
+
+        Args:
+            symbols: The symbols to track; feature rows follow this order.
+            spec: Indicator entries such as {'kind': 'rsi', 'length': 14}.
+                Defaults to DEFAULT_FEATURES.
+        """
+        self.symbols = list(symbols)
+        self.spec = list(spec or DEFAULT_FEATURES)
+        self.symbol_index = {symbol: j for j, symbol in enumerate(self.symbols)}
+        self.indicators = []
+        for entry in self.spec:
+            params = {key: value for key, value in entry.items() if key != 'kind'}
+            if entry['kind'] not in INDICATORS:
+                raise ValueError(f"Unknown indicator kind '{entry['kind']}'")
+            self.indicators.append(INDICATORS[entry['kind']](len(self.symbols), **params))
+        self.feature_names = [name for indicator in self.indicators for name in indicator.names]
+        self._all_rows = np.arange(len(self.symbols))
+
+    def _update_rows(self, rows: np.ndarray, bar: BarRows) -> np.ndarray:
+        """Advances every indicator for the given rows; returns (len(rows), F)."""
+        return np.concatenate([indicator.update(rows, bar) for indicator in self.indicators], axis=1)
+
+    def update_bar(
+        self,
+        timestamp: np.datetime64,
+        open_: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        rows: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Feeds one bar for every symbol (or for the symbols in `rows`).
+
+        Args:
+            timestamp: The bar's timestamp (UTC).
+            open_, high, low, close, volume: Arrays of shape (N,), or
+                aligned with `rows` when it is given.
+            rows: Indices of the symbols that received the bar.
+
+        Returns:
+            The feature matrix, shape (N, F) or (len(rows), F).
+        """
+        rows = self._all_rows if rows is None else np.asarray(rows)
+        day = np.full(len(rows), self._to_day(timestamp))
+        bar = BarRows(
+            day,
+            np.asarray(open_, dtype=float), np.asarray(high, dtype=float), np.asarray(low, dtype=float),
+            np.asarray(close, dtype=float), np.asarray(volume, dtype=float)
+        )
+        return self._update_rows(rows, bar)
+
+    @staticmethod
+    def _to_day(timestamp) -> np.datetime64:
+        """Returns the UTC calendar day of a datetime or datetime64."""
+        if isinstance(timestamp, np.datetime64):
+            return timestamp.astype('datetime64[D]')
+        timestamp = pd.Timestamp(timestamp)
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.tz_convert(None)
+        return timestamp.to_datetime64().astype('datetime64[D]')
+
+    def update_event(self, market_event: MarketDataEvent) -> np.ndarray:
+        """
+        Feeds one symbol's bar.
+
+        Args:
+            market_event: The market data event to process.
+
+        Returns:
+            The symbol's feature vector, shape (F,).
+        """
+        rows = np.array([self.symbol_index[market_event.symbol]])
+        bar = BarRows(
+            np.array([self._to_day(market_event.timestamp)]),
+            np.array([market_event.open]), np.array([market_event.high]), np.array([market_event.low]),
+            np.array([market_event.close]), np.array([market_event.volume])
+        )
+        return self._update_rows(rows, bar)[0]
+
+    def update_chunk(self, chunk: OHLCVPanel) -> np.ndarray:
+        """
+        Feeds a block of bars, one timestamp at a time.
+
+        Args:
+            chunk: Bars for all symbols, in the engine's symbol order.
+
+        Returns:
+            The features, shape (chunk_len, N, F).
+        """
+        features = np.empty((len(chunk.timestamps), len(self.symbols), len(self.feature_names)))
+        for t, timestamp in enumerate(chunk.timestamps):
+            features[t] = self.update_bar(
+                timestamp, chunk.open[t], chunk.high[t], chunk.low[t], chunk.close[t], chunk.volume[t]
+            )
+        return features
+
+    def batch_features(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Computes this engine's features over a full history with pandas-ta (training mode).
+
+        Args:
+            frame: One symbol's candles with a DatetimeIndex and
+                open/high/low/close/volume columns.
+
+        Returns:
+            A DataFrame with one column per feature name.
+
+        Raises:
+            ImportError: If pandas-ta is not installed.
+        """
+        return compute_features(frame, self.spec)[self.feature_names]
@@ -0,0 +1,370 @@
+# src/MLmodule/feature_engine/indicators.py
+"""
+Incremental technical indicators with O(1) state updates.
+
+Every indicator keeps one state slot per symbol in NumPy arrays and is
+updated with the rows (symbol indices) that received a new bar, so one
+call can advance a single symbol or the whole universe.
+
+The recursions mirror the pandas operations that pandas-ta builds its
+indicators from (ewm, rolling windows, cumulative sums), which keeps the
+streaming values in line with the batch functions in `batch.py`.
+"""
+import abc
+import numpy as np
+from typing import Dict, List, NamedTuple
+
+
+class BarRows(NamedTuple):
+    """The new bar for a subset of symbols; arrays are aligned with `rows`."""
+    day: np.ndarray  # datetime64[D] of each bar
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+
+def _ewm_alpha(alpha: float) -> float:
+    """Returns alpha as pandas uses it internally (via the center of mass)."""
+    return 1.0 / (1.0 + (1.0 / alpha - 1.0))
+
+
+def _span_alpha(span: int) -> float:
+    """Returns the smoothing factor pandas derives from `span`."""
+    return 1.0 / (1.0 + (span - 1) / 2.0)
+
+
+class EWMState:
+    """
+    Exponentially weighted mean, one state per symbol.
+
+    Follows the recursion of pandas' ewm(...).mean() with ignore_na=False,
+    including its handling of leading NaNs and `min_periods`.
+    """
+
+    def __init__(self, n_symbols: int, alpha: float, adjust: bool, min_periods: int = 0):
+        self.alpha = alpha
+        self.adjust = adjust
+        self.min_periods = max(min_periods, 1)
+        self.weighted = np.full(n_symbols, np.nan)
+        self.old_wt = np.ones(n_symbols)
+        self.nobs = np.zeros(n_symbols, dtype=np.int64)
+
+    def update(self, rows: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """Adds one observation (NaN for none) per row and returns the means."""
+        weighted = self.weighted[rows]
+        old_wt = self.old_wt[rows]
+        new_wt = 1.0 if self.adjust else self.alpha
+        observed = ~np.isnan(x)
+        started = ~np.isnan(weighted)
+
+        old_wt = np.where(started, old_wt * (1.0 - self.alpha), old_wt)
+        blend = started & observed & (weighted != x)
+        with np.errstate(invalid='ignore'):
+            blended = (old_wt * weighted + new_wt * x) / (old_wt + new_wt)
+        weighted = np.where(blend, blended, weighted)
+        weighted = np.where(~started & observed, x, weighted)
+        if self.adjust:
+            old_wt = np.where(started & observed, old_wt + new_wt, old_wt)
+        else:
+            old_wt = np.where(started & observed, 1.0, old_wt)
+
+        self.weighted[rows] = weighted
+        self.old_wt[rows] = old_wt
+        self.nobs[rows] += observed
+        return np.where(self.nobs[rows] >= self.min_periods, weighted, np.nan)
+
+
+class RollingState:
+    """
+    Rolling mean and variance over a fixed window, one state per symbol.
+
+    A ring buffer holds the window; mean and sum of squared deviations are
+    updated Welford-style as values enter and leave. Sliding updates
+    accumulate rounding error, so each time the buffer wraps around both
+    are recomputed from it; the error never spans more than one window.
+    """
+
+    def __init__(self, n_symbols: int, length: int):
+        self.length = length
+        self.buffer = np.zeros((n_symbols, length))
+        self.count = np.zeros(n_symbols, dtype=np.int64)
+        self.mean = np.zeros(n_symbols)
+        self.m2 = np.zeros(n_symbols)
+
+    def update(self, rows: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """Adds one value per row; returns a mask of rows with a full window."""
+        count = self.count[rows]
+        slot = count % self.length
+        full = count >= self.length
+        leaving = np.where(full, self.buffer[rows, slot], 0.0)
+        mean = self.mean[rows]
+        m2 = self.m2[rows]
+
+        # Growing window: plain Welford step
+        n = np.minimum(count + 1, self.length)
+        grow_mean = mean + (x - mean) / n
+        grow_m2 = m2 + (x - mean) * (x - grow_mean)
+        # Full window: replace the oldest value
+        slide_mean = mean + (x - leaving) / self.length
+        slide_m2 = m2 + (x - leaving) * (x - slide_mean + leaving - mean)
+
+        self.mean[rows] = np.where(full, slide_mean, grow_mean)
+        self.m2[rows] = np.maximum(np.where(full, slide_m2, grow_m2), 0.0)
+        self.buffer[rows, slot] = x
+        self.count[rows] = count + 1
+
+        # Every `length` values, drop the drift: O(length) once per window
+        wrapped = rows[slot == self.length - 1]
+        if len(wrapped):
+            window = self.buffer[wrapped]
+            mean = window.mean(axis=1)
+            self.mean[wrapped] = mean
+            self.m2[wrapped] = ((window - mean[:, None]) ** 2).sum(axis=1)
+        return count + 1 >= self.length
+
+    def variance(self, rows: np.ndarray, ddof: int) -> np.ndarray:
+        """Returns the window variance for each row."""
+        return self.m2[rows] / (self.length - ddof)
+
+
+class EMAState:
+    """
+    pandas-ta style EMA: seeded with the SMA of the first `length` values,
+    then ewm(span=length, adjust=False).
+    """
+
+    def __init__(self, n_symbols: int, length: int):
+        self.length = length
+        self.seed = np.zeros((n_symbols, length))
+        self.count = np.zeros(n_symbols, dtype=np.int64)
+        self.ewm = EWMState(n_symbols, _span_alpha(length), adjust=False)
+
+    def update(self, rows: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """Adds one value per row and returns the EMA (NaN while seeding)."""
+        count = self.count[rows]
+        seeding = count < self.length
+        self.seed[rows[seeding], count[seeding]] = x[seeding]
+        self.count[rows] = count + 1
+
+        value = np.where(seeding, np.nan, x)
+        seeded = seeding & (count + 1 == self.length)
+        # The seed mean is summed the same way pandas sums a Series
+        value[seeded] = self.seed[rows[seeded]].sum(axis=1) / self.length
+        return self.ewm.update(rows, value)
+
+
+class Indicator(abc.ABC):
+    """Base class for streaming indicators."""
+
+    def __init__(self, n_symbols: int):
+        self.n_symbols = n_symbols
+
+    @property
+    @abc.abstractmethod
+    def names(self) -> List[str]:
+        """Output column names, in pandas-ta naming."""
+
+    @abc.abstractmethod
+    def update(self, rows: np.ndarray, bar: BarRows) -> np.ndarray:
+        """
+        Advances the indicator for the given rows.
+
+        Returns:
+            An array of shape (len(rows), len(self.names)).
+        """
+
+
+class SMA(Indicator):
+    """Simple moving average of the close."""
+
+    def __init__(self, n_symbols: int, length: int = 10):
+        super().__init__(n_symbols)
+        self.length = length
+        self.window = RollingState(n_symbols, length)
+
+    @property
+    def names(self) -> List[str]:
+        return [f'SMA_{self.length}']
+
+    def update(self, rows: np.ndarray, bar: BarRows) -> np.ndarray:
+        full = self.window.update(rows, bar.close)
+        return np.where(full, self.window.mean[rows], np.nan)[:, None]
+
+
+class EMA(Indicator):
+    """Exponential moving average of the close."""
+
+    def __init__(self, n_symbols: int, length: int = 10):
+        super().__init__(n_symbols)
+        self.length = length
+        self.ema = EMAState(n_symbols, length)
+
+    @property
+    def names(self) -> List[str]:
+        return [f'EMA_{self.length}']
+
+    def update(self, rows: np.ndarray, bar: BarRows) -> np.ndarray:
+        return self.ema.update(rows, bar.close)[:, None]
+
+
+class RSI(Indicator):
+    """Relative strength index with Wilder (RMA) smoothing."""
+
+    def __init__(self, n_symbols: int, length: int = 14, scalar: float = 100.0):
+        super().__init__(n_symbols)
+        self.length = length
+        self.scalar = scalar
+        self.prev_close = np.full(n_symbols, np.nan)
+        alpha = _ewm_alpha(1.0 / length)
+        self.gain = EWMState(n_symbols, alpha, adjust=True, min_periods=length)
+        self.loss = EWMState(n_symbols, alpha, adjust=True, min_periods=length)
+
+    @property
+    def names(self) -> List[str]:
+        return [f'RSI_{self.length}']
+
+    def update(self, rows: np.ndarray, bar: BarRows) -> np.ndarray:
+        change = bar.close - self.prev_close[rows]
+        self.prev_close[rows] = bar.close
+        gain = self.gain.update(rows, np.where(change < 0, 0.0, change))
+        loss = self.loss.update(rows, np.where(change > 0, 0.0, change))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (self.scalar * gain / (gain + np.abs(loss)))[:, None]
+
+
+class ATR(Indicator):
+    """Average true range with Wilder (RMA) smoothing."""
+
+    def __init__(self, n_symbols: int, length: int = 14):
+        super().__init__(n_symbols)
+        self.length = length
+        self.prev_close = np.full(n_symbols, np.nan)
+        self.rma = EWMState(n_symbols, _ewm_alpha(1.0 / length), adjust=True, min_periods=length)
+
+    @property
+    def names(self) -> List[str]:
+        return [f'ATRr_{self.length}']
+
+    def update(self, rows: np.ndarray, bar: BarRows) -> np.ndarray:
+        prev_close = self.prev_close[rows]
+        self.prev_close[rows] = bar.close
+        true_range = np.maximum.reduce([
+            np.abs(bar.high - bar.low),
+            np.abs(bar.high - prev_close),
+            np.abs(prev_close - bar.low),
+        ])
+        # No true range on a symbol's first bar
+        true_range = np.where(np.isnan(prev_close), np.nan, true_range)
+        return self.rma.update(rows, true_range)[:, None]
+
+
+class Volatility(Indicator):
+    """Rolling standard deviation (ddof=1) of log returns."""
+
+    def __init__(self, n_symbols: int, length: int = 20):
+        super().__init__(n_symbols)
+        self.length = length
+        self.prev_close = np.full(n_symbols, np.nan)
+        self.window = RollingState(n_symbols, length)
+
+    @property
+    def names(self) -> List[str]:
+        return [f'VOL_{self.length}']
+
+    def update(self, rows: np.ndarray, bar: BarRows) -> np.ndarray:
+        prev_close = self.prev_close[rows]
+        self.prev_close[rows] = bar.close
+        has_return = ~np.isnan(prev_close)
+        out = np.full(len(rows), np.nan)
+        if has_return.any():
+            active = rows[has_return]
+            log_return = np.log(bar.close[has_return]) - np.log(prev_close[has_return])
+            full = self.window.update(active, log_return)
+            out[has_return] = np.where(full, np.sqrt(self.window.variance(active, ddof=1)), np.nan)
+        return out[:, None]
+
+
+class VWAP(Indicator):
+    """Volume-weighted average (HLC3) price, anchored to each UTC day."""
+
+    def __init__(self, n_symbols: int):
+        super().__init__(n_symbols)
+        self.day = np.full(n_symbols, np.datetime64('NaT'), dtype='datetime64[D]')
+        self.price_volume = np.zeros(n_symbols)
+        self.volume = np.zeros(n_symbols)
+
+    @property
+    def names(self) -> List[str]:
+        return ['VWAP_D']
+
+    def update(self, rows: np.ndarray, bar: BarRows) -> np.ndarray:
+        new_day = self.day[rows] != bar.day
+        typical = (bar.high + bar.low + bar.close) / 3.0
+        price_volume = np.where(new_day, 0.0, self.price_volume[rows]) + typical * bar.volume
+        volume = np.where(new_day, 0.0, self.volume[rows]) + bar.volume
+        self.day[rows] = bar.day
+        self.price_volume[rows] = price_volume
+        self.volume[rows] = volume
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (price_volume / volume)[:, None]
+
+
+class BollingerBands(Indicator):
+    """Bollinger bands: SMA middle band +/- `std` population deviations."""
+
+    def __init__(self, n_symbols: int, length: int = 5, std: float = 2.0, ddof: int = 0):
+        super().__init__(n_symbols)
+        self.length = length
+        self.std = float(std)
+        self.ddof = ddof
+        self.window = RollingState(n_symbols, length)
+
+    @property
+    def names(self) -> List[str]:
+        suffix = f'{self.length}_{self.std}'
+        return [f'BBL_{suffix}', f'BBM_{suffix}', f'BBU_{suffix}']
+
+    def update(self, rows: np.ndarray, bar: BarRows) -> np.ndarray:
+        full = self.window.update(rows, bar.close)
+        mid = np.where(full, self.window.mean[rows], np.nan)
+        deviation = np.sqrt(self.window.variance(rows, self.ddof)) * self.std
+        return np.column_stack([mid - deviation, mid, mid + deviation])
+
+
+class MACD(Indicator):
+    """MACD line, histogram and signal line."""
+
+    def __init__(self, n_symbols: int, fast: int = 12, slow: int = 26, signal: int = 9):
+        super().__init__(n_symbols)
+        self.fast, self.slow, self.signal = fast, slow, signal
+        self.fast_ema = EMAState(n_symbols, fast)
+        self.slow_ema = EMAState(n_symbols, slow)
+        # The signal EMA starts at the first valid MACD value
+        self.signal_ema = EMAState(n_symbols, signal)
+
+    @property
+    def names(self) -> List[str]:
+        suffix = f'{self.fast}_{self.slow}_{self.signal}'
+        return [f'MACD_{suffix}', f'MACDh_{suffix}', f'MACDs_{suffix}']
+
+    def update(self, rows: np.ndarray, bar: BarRows) -> np.ndarray:
+        macd = self.fast_ema.update(rows, bar.close) - self.slow_ema.update(rows, bar.close)
+        signal = np.full(len(rows), np.nan)
+        valid = ~np.isnan(macd)
+        if valid.any():
+            signal[valid] = self.signal_ema.update(rows[valid], macd[valid])
+        return np.column_stack([macd, macd - signal, signal])
+
+
+INDICATORS: Dict[str, type] = {
+    'sma': SMA,
+    'ema': EMA,
+    'rsi': RSI,
+    'atr': ATR,
+    'volatility': Volatility,
+    'vwap': VWAP,
+    'bbands': BollingerBands,
+    'macd': MACD,
+}
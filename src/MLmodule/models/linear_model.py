@@ -0,0 +1,101 @@
+# src/MLmodule/models/linear_model.py
+"""
+A ridge-regression signal model that can be fitted from chunks of data.
+"""
+import numpy as np
+from typing import Any, Dict, List, Optional
+
+
+class LinearSignalModel:
+    """
+    Predicts the standardized forward return from standardized features.
+
+    Fitting only accumulates sufficient statistics (sums and cross
+    products), so training data can be streamed in row blocks of any size
+    and memory stays at O(F^2). Predictions are squashed with tanh into
+    scores in [-1, 1], as SignalAgent expects.
+    """
+
+    def __init__(self, feature_spec: List[Dict[str, Any]], feature_names: List[str], alpha: float = 1.0):
+        """
+        Initializes an unfitted model.
+
+        Args:
+            feature_spec: The FeatureEngine specification the model is trained on.
+            feature_names: Names of the feature columns, in order.
+            alpha: Ridge penalty on the standardized coefficients.
+        """
+        self.feature_spec = feature_spec
+        self.feature_names = list(feature_names)
+        self.alpha = alpha
+        n_features = len(self.feature_names)
+        self.n_samples = 0
+        self._shift: Optional[np.ndarray] = None
+        self._sum_x = np.zeros(n_features)
+        self._sum_y = 0.0
+        self._sum_xx = np.zeros((n_features, n_features))
+        self._sum_xy = np.zeros(n_features)
+        self._sum_yy = 0.0
+        self.mean_ = np.zeros(n_features)
+        self.scale_ = np.ones(n_features)
+        self.coef_ = np.zeros(n_features)
+        self.intercept_ = 0.0
+
+    def partial_fit(self, X: np.ndarray, y: np.ndarray) -> 'LinearSignalModel':
+        """
+        Adds a block of training rows; rows with any NaN are skipped.
+
+        Args:
+            X: Features, shape (n, F).
+            y: Targets (forward returns), shape (n,).
+        """
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        valid = ~(np.isnan(X).any(axis=1) | np.isnan(y))
+        X, y = X[valid], y[valid]
+        if not len(y):
+            return self
+        if self._shift is None:
+            # Accumulate around the first block's mean to limit cancellation
+            self._shift = X.mean(axis=0)
+        Xc = X - self._shift
+        self.n_samples += len(y)
+        self._sum_x += Xc.sum(axis=0)
+        self._sum_y += y.sum()
+        self._sum_xx += Xc.T @ Xc
+        self._sum_xy += Xc.T @ y
+        self._sum_yy += y @ y
+        return self
+
+    def finalize(self) -> 'LinearSignalModel':
+        """
+        Solves the ridge regression from the accumulated statistics.
+
+        Raises:
+            ValueError: If no valid training rows were added.
+        """
+        n = self.n_samples
+        if n == 0:
+            raise ValueError("LinearSignalModel: No valid training rows.")
+        mean_c = self._sum_x / n
+        cov = self._sum_xx / n - np.outer(mean_c, mean_c)
+        scale = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+        scale[scale == 0] = 1.0
+        y_mean = self._sum_y / n
+        y_std = np.sqrt(max(self._sum_yy / n - y_mean ** 2, 0.0)) or 1.0
+
+        corr = cov / np.outer(scale, scale)
+        xy = (self._sum_xy / n - mean_c * y_mean) / scale / y_std
+        self.coef_ = np.linalg.solve(corr + self.alpha * np.eye(len(xy)), xy)
+        self.mean_ = mean_c + self._shift
+        self.scale_ = scale
+        self.intercept_ = y_mean / y_std
+        return self
+
+    def raw_predict(self, X: np.ndarray) -> np.ndarray:
+        """Returns the predicted forward return in standard deviations."""
+        return ((np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_) @ self.coef_ + self.intercept_
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Returns signal scores in [-1, 1]."""
+        return np.tanh(self.raw_predict(X))
@@ -0,0 +1,52 @@
+# src/MLmodule/models/loader.py
+"""
+Loads trained model artifacts for inference.
+"""
+import logging
+from functools import lru_cache
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def load_model(path: Path):
+    """
+    Loads a joblib model artifact once per process.
+
+    The model's NumPy arrays are memory-mapped read-only, so backtest
+    worker processes loading the same artifact share one copy of the
+    weights through the OS page cache.
+
+    Args:
+        path: Path to the .joblib artifact, or a model directory written
+            by the training pipeline (its LATEST version is loaded).
+
+    Returns:
+        The model object. It must provide predict(X) -> scores, one score
+        per row in [-1, 1] (sign gives the direction, magnitude the strength).
+    """
+    # joblib is imported only when a model is actually used
+    import joblib
+    path = resolve_artifact(Path(path))
+    model = joblib.load(path, mmap_mode='r')
+    logger.info("ModelLoader: Loaded %s from %s", type(model).__name__, path)
+    return model
+
+
+def resolve_artifact(path: Path) -> Path:
+    """
+    Maps a model directory to the artifact of its latest version.
+
+    Args:
+        path: A .joblib file, a version directory, or a model directory
+            containing a LATEST file.
+
+    Returns:
+        The path of the model.joblib file to load.
+    """
+    if (path / 'LATEST').is_file():
+        path = path / (path / 'LATEST').read_text().strip()
+    if path.is_dir():
+        path = path / 'model.joblib'
+    return path
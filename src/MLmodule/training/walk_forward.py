@@ -0,0 +1,360 @@
+# src/MLmodule/training/walk_forward.py
+"""
+Walk-forward and purged k-fold training of the signal model.
+
+The pipeline:
+    1. Gets per-symbol features and closes for the training range from the
+       on-disk FeatureCache (memory-mapped), streaming through the
+       FeatureEngine only the bars no earlier run has computed.
+    2. Splits the rows into folds, purging training rows whose label window
+       overlaps the test rows (plus an optional embargo after them).
+    3. Fits and scores every fold in parallel with joblib; each fold reads
+       the cached arrays in row blocks, so peak memory does not grow with
+       the length of the training span.
+    4. Fits the final model on all rows and writes a versioned artifact
+       that SignalAgent can load through `signal.model_path`.
+
+Run with:
+    poetry run python -m src.MLmodule.training.walk_forward
+"""
+import json
+import joblib
+import logging
+import numpy as np
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from src.core.config import Settings, config
+from src.core.logger import setup_logging
+from src.data_fetcher.data_collector import DataCollector
+from src.data_fetcher.history_store import OHLCVStore
+from src.MLmodule.feature_engine.feature_cache import FeatureCache, open_features
+from src.MLmodule.feature_engine.feature_engine import DEFAULT_FEATURES
+from src.MLmodule.models.linear_model import LinearSignalModel
+
+# Named explicitly: run as a script, __name__ is '__main__', outside the 'src' loggers
+logger = logging.getLogger('src.MLmodule.training.walk_forward')
+
+RowRange = Tuple[int, int]  # [start, stop)
+
+
+class FoldSplit(NamedTuple):
+    """Row ranges of one fold; test is None for the final full-data fit."""
+    train: List[RowRange]
+    test: Optional[RowRange]
+
+
+def walk_forward_splits(
+    n_rows: int,
+    n_folds: int,
+    horizon: int,
+    train_size: Optional[int] = None
+) -> List[FoldSplit]:
+    """
+    Splits rows into consecutive test blocks, each trained on the past only.
+
+    Args:
+        n_rows: Number of rows (timestamps).
+        n_folds: Number of test blocks.
+        horizon: Label horizon in bars; the last `horizon` rows before each
+            test block are purged because their labels look into it.
+        train_size: Rolling training window in rows; None for expanding.
+
+    Returns:
+        One FoldSplit per test block.
+    """
+    test_size = n_rows // (n_folds + 1)
+    splits = []
+    for k in range(n_folds):
+        test_start = (k + 1) * test_size
+        test_stop = n_rows if k == n_folds - 1 else test_start + test_size
+        train_stop = max(test_start - horizon, 0)
+        train_start = 0 if train_size is None else max(train_stop - train_size, 0)
+        splits.append(FoldSplit([(train_start, train_stop)], (test_start, test_stop)))
+    return splits
+
+
+def purged_kfold_splits(n_rows: int, n_folds: int, horizon: int, embargo: int = 0) -> List[FoldSplit]:
+    """
+    Splits rows into k contiguous test blocks trained on everything else.
+
+    Training rows whose labels overlap the test block are purged, and
+    `embargo` rows right after the block are dropped to limit leakage
+    through serial correlation.
+
+    Args:
+        n_rows: Number of rows (timestamps).
+        n_folds: Number of folds.
+        horizon: Label horizon in bars.
+        embargo: Rows skipped after each test block.
+
+    Returns:
+        One FoldSplit per fold.
+    """
+    bounds = np.linspace(0, n_rows, n_folds + 1).astype(int)
+    splits = []
+    for test_start, test_stop in zip(bounds[:-1], bounds[1:]):
+        train = []
+        if test_start - horizon > 0:
+            train.append((0, int(test_start - horizon)))
+        if test_stop + embargo < n_rows:
+            train.append((int(test_stop + embargo), n_rows))
+        splits.append(FoldSplit(train, (int(test_start), int(test_stop))))
+    return splits
+
+
+def _row_blocks(row_range: RowRange, block_rows: int):
+    """Yields [start, stop) sub-ranges of at most block_rows rows."""
+    start, stop = row_range
+    for block_start in range(start, stop, block_rows):
+        yield block_start, min(block_start + block_rows, stop)
+
+
+def _labels(close: np.ndarray, start: int, stop: int, horizon: int) -> np.ndarray:
+    """Forward log returns over `horizon` bars for rows [start, stop)."""
+    n_rows = len(close)
+    future = np.full(stop - start, np.nan)
+    available = max(min(stop, n_rows - horizon) - start, 0)
+    if available:
+        future[:available] = np.log(close[start + horizon:start + horizon + available])
+    return future - np.log(close[start:stop])
+
+
+def fit_fold(
+    cache_path: Path,
+    n_rows: int,
+    spec: List[Dict[str, Any]],
+    split: FoldSplit,
+    horizon: int,
+    alpha: float,
+    block_rows: int
+) -> Tuple[LinearSignalModel, Dict[str, float]]:
+    """
+    Fits one fold on the cached features and scores it on its test rows.
+
+    Runs inside a joblib worker: it opens the cache itself, so only paths
+    and row ranges cross the process boundary. Only the first n_rows cached
+    rows (the training range) are read, labels included.
+
+    Returns:
+        The fitted model and its test metrics (information coefficient,
+        hit rate, row counts).
+    """
+    meta, arrays = open_features(cache_path, n_rows)
+    model = LinearSignalModel(spec, meta['feature_names'], alpha=alpha)
+    for features, close in arrays:
+        for row_range in split.train:
+            for start, stop in _row_blocks(row_range, block_rows):
+                model.partial_fit(features[start:stop], _labels(close, start, stop, horizon))
+    model.finalize()
+
+    metrics = {'n_train': model.n_samples}
+    if split.test is None:
+        return model, metrics
+
+    # Streaming correlation and hit rate on the test rows
+    n = sum_p = sum_y = sum_pp = sum_yy = sum_py = hits = 0.0
+    for features, close in arrays:
+        for start, stop in _row_blocks(split.test, block_rows):
+            X = np.asarray(features[start:stop])
+            y = _labels(close, start, stop, horizon)
+            valid = ~(np.isnan(X).any(axis=1) | np.isnan(y))
+            if not valid.any():
+                continue
+            p, y = model.raw_predict(X[valid]), y[valid]
+            n += len(y)
+            sum_p += p.sum()
+            sum_y += y.sum()
+            sum_pp += p @ p
+            sum_yy += y @ y
+            sum_py += p @ y
+            hits += np.count_nonzero(np.sign(p) == np.sign(y))
+    if n:
+        cov = sum_py / n - sum_p / n * sum_y / n
+        var_p = sum_pp / n - (sum_p / n) ** 2
+        var_y = sum_yy / n - (sum_y / n) ** 2
+        metrics['ic'] = float(cov / np.sqrt(var_p * var_y)) if var_p > 0 and var_y > 0 else float('nan')
+        metrics['hit_rate'] = hits / n
+    metrics['n_test'] = int(n)
+    return model, metrics
+
+
+def write_artifact(model: LinearSignalModel, models_dir: Path, name: str, metadata: Dict[str, Any]) -> Path:
+    """
+    Saves a model as a new version and marks it as the latest.
+
+    Layout: <models_dir>/<name>/<version>/{model.joblib,metadata.json}
+    and <models_dir>/<name>/LATEST holding the newest version.
+
+    Returns:
+        Path of the written model.joblib.
+    """
+    version = datetime.now(timezone.utc).strftime('v%Y%m%dT%H%M%S')
+    version_dir = Path(models_dir) / name / version
+    suffix = 1
+    while version_dir.exists():
+        version_dir = Path(models_dir) / name / f"{version}-{suffix}"
+        suffix += 1
+    version = version_dir.name
+    version_dir.mkdir(parents=True)
+    artifact = version_dir / 'model.joblib'
+    joblib.dump(model, artifact)
+    with open(version_dir / 'metadata.json', 'w') as f:
+        json.dump({'version': version, **metadata}, f, indent=2, default=str)
+    (Path(models_dir) / name / 'LATEST').write_text(version)
+    logger.info("WalkForward: Saved model %s %s to %s", name, version, artifact)
+    return artifact
+
+
+class WalkForwardTrainer:
+    """
+    Runs the training pipeline configured in the `training` config section.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        """
+        Initializes the trainer.
+
+        Args:
+            settings: Configuration to use; defaults to the active config.
+        """
+        if settings is None:
+            settings = config.settings
+        self.settings = settings
+        self.symbols = settings.get('trading.pairs')
+        self.start_date = settings.get('training.start_date', settings.get('backtester.start_date'))
+        self.end_date = settings.get('training.end_date', settings.get('backtester.end_date'))
+        features = settings.get('training.features')
+        # Plain dicts: the spec is hashed into cache keys and saved with the model
+        self.spec = [dict(entry) for entry in features] if features else DEFAULT_FEATURES
+        self.scheme = settings.get('training.scheme', 'walk_forward')
+        self.n_folds = settings.get('training.n_folds', 5)
+        self.horizon = settings.get('training.horizon', 1)
+        self.embargo = settings.get('training.embargo', 0)
+        self.train_size = settings.get('training.train_size')
+        self.alpha = settings.get('training.ridge_alpha', 1.0)
+        self.n_jobs = settings.get('training.n_jobs', -1)
+        self.block_rows = settings.get('training.block_rows', 100_000)
+        max_mb = settings.get('training.cache_max_mb')
+        self.feature_cache = FeatureCache(
+            Path(settings.get('training.cache_dir', 'data/features')),
+            max_bytes=None if max_mb is None else int(max_mb * 2 ** 20),
+        )
+        self.models_dir = Path(settings.get('training.models_dir', 'models'))
+        self.model_name = settings.get('training.model_name', 'linear_signal')
+
+    def _collector(self) -> DataCollector:
+        """Builds the data source for the training range."""
+        store = panel = None
+        seed = self.settings.get('training.seed', self.settings.get('backtester.seed'))
+        if self.settings.get('data.source', 'mock') == 'store':
+            store = OHLCVStore(Path(self.settings.get('data.store_path')))
+        elif self.settings.get('data.source') == 'scenario':
+            from src.data_fetcher.scenario import ScenarioGenerator
+            panel = ScenarioGenerator(
+                self.symbols, self.start_date, self.end_date, self.settings.get('data.timeframe', '1h'), seed=seed,
+                settings=self.settings,
+            ).load()
+        return DataCollector(
+            self.symbols,
+            self.start_date,
+            self.end_date,
+            seed=seed,
+            store=store,
+            panel=panel,
+            exchange=self.settings.get('trading.exchange'),
+            timeframe=self.settings.get('data.timeframe', '1h'),
+            base_timeframe=self.settings.get('data.base_timeframe'),
+            settings=self.settings,
+        )
+
+    @staticmethod
+    def _store_contents(collector: DataCollector) -> Dict[str, List[Optional[int]]]:
+        """
+        Marks the stored candles a collector's range is built from.
+
+        The store is append-only, but a series can be rebuilt or backfilled
+        in place; the candle count and last timestamp per symbol change
+        then, and with them the feature cache key.
+
+        Returns:
+            [candle count, last timestamp in ms or None] keyed by symbol.
+        """
+        timeframe = collector.base_timeframe or collector.timeframe
+        start_ms, end_ms = collector.start_dt.value // 1_000_000, collector.end_dt.value // 1_000_000
+        contents = {}
+        for symbol in collector.symbols:
+            timestamps = collector.store.read(collector.exchange, symbol, timeframe, start_ms, end_ms).timestamp
+            contents[symbol] = [len(timestamps), int(timestamps[-1]) if len(timestamps) else None]
+        return contents
+
+    def run(self) -> Path:
+        """
+        Trains, evaluates and saves the model.
+
+        Returns:
+            Path of the new model artifact.
+        """
+        collector = self._collector()
+        # What determines the bars besides symbols, timeframe and range, which the cache adds
+        data_key = {
+            'source': self.settings.get('data.source', 'mock'),
+            'base_timeframe': collector.base_timeframe,
+            'seed': self.settings.get('training.seed', self.settings.get('backtester.seed')),
+        }
+        if data_key['source'] == 'scenario':
+            data_key['scenario'] = self.settings.get('scenario', Settings()).to_dict()
+        elif data_key['source'] == 'store':
+            data_key.update(
+                store_path=str(Path(self.settings.get('data.store_path')).resolve()),
+                exchange=collector.exchange,
+                candles=self._store_contents(collector),
+            )
+        cache_path, n_rows = self.feature_cache.get(collector, self.spec, data_key)
+
+        if self.scheme == 'purged_kfold':
+            splits = purged_kfold_splits(n_rows, self.n_folds, self.horizon, self.embargo)
+        elif self.scheme == 'walk_forward':
+            splits = walk_forward_splits(n_rows, self.n_folds, self.horizon, self.train_size)
+        else:
+            raise ValueError(f"Unknown training scheme '{self.scheme}'")
+        # The final model uses every row whose label is known
+        splits.append(FoldSplit([(0, n_rows)], None))
+
+        logger.info("WalkForward: Training %d %s folds and the final model...", len(splits) - 1, self.scheme)
+        results = joblib.Parallel(n_jobs=self.n_jobs)(
+            joblib.delayed(fit_fold)(cache_path, n_rows, self.spec, split, self.horizon, self.alpha, self.block_rows)
+            for split in splits
+        )
+        fold_metrics = [metrics for _, metrics in results[:-1]]
+        for k, metrics in enumerate(fold_metrics):
+            logger.info("WalkForward: Fold %d: IC %.4f, hit rate %.3f, %d train / %d test rows",
+                        k, metrics.get('ic', float('nan')), metrics.get('hit_rate', float('nan')),
+                        metrics['n_train'], metrics['n_test'])
+
+        final_model, final_metrics = results[-1]
+        return write_artifact(final_model, self.models_dir, self.model_name, {
+            'symbols': self.symbols,
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+            'scheme': self.scheme,
+            'horizon': self.horizon,
+            'feature_spec': self.spec,
+            'feature_names': final_model.feature_names,
+            'n_train': final_metrics['n_train'],
+            'folds': fold_metrics,
+        })
+
+
+def main():
+    """Trains a model using the default configuration file."""
+    config_path = Path(__file__).parents[2] / 'core' / 'config.yaml'
+    settings = config.load_config(config_path)
+    setup_logging()
+    # load_config logged before there was a handler to show it
+    logger.info("Configuration loaded from %s", config_path)
+    WalkForwardTrainer(settings).run()
+
+
+if __name__ == '__main__':
+    main()
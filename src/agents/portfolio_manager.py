@@ -2,41 +2,224 @@
 """
 Manages the portfolio, making final decisions on trades.
 """
-from typing import Dict, Optional
-from src.core.events import RiskAdjustedSignalEvent, PortfolioDecisionEvent
+import logging
+import numpy as np
+from typing import Any, Dict, List, Optional
+from src.core.config import Settings, config
+from src.core.events import MarketDataEvent, OrderExecutionEvent, RiskAdjustedSignalEvent, PortfolioDecisionEvent
+
+logger = logging.getLogger(__name__)
+
+
+def rebalance_quantities(
+    direction: np.ndarray,
+    size: np.ndarray,
+    positions: np.ndarray,
+    prices: np.ndarray,
+    cash: float,
+    commission_rate: float
+) -> np.ndarray:
+    """
+    Turns one timestamp's sized signals into order quantities.
+
+    Sell signals close the whole position. Buy signals raise a position to
+    `size` of the marked-to-market portfolio value; if the buys cost more
+    than the cash available after the sells, they are scaled down together.
+    The budget assumes the sells fill in full at `prices`; simulated
+    executions cap each buy at the cash actually left (see
+    OrderExecutor.execute_batch).
+
+    Args:
+        direction: Signal directions (+1 buy, -1 sell, 0 hold), shape (N,).
+        size: Target weights as a fraction of portfolio, shape (N,).
+        positions: Current asset quantities, shape (N,).
+        prices: Current prices, shape (N,); NaN where unknown.
+        cash: Cash in base currency.
+        commission_rate: Commission as a fraction of the traded notional.
+
+    Returns:
+        Signed quantities to trade, shape (N,): positive to buy, negative to sell.
+    """
+    marks = np.nan_to_num(prices)
+    total_value = cash + positions @ marks
+
+    sells = (direction < 0) & (positions > 0)
+    quantities = np.where(sells, -positions, 0.0)
+
+    buys = (direction > 0) & (marks > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        target = np.where(buys, total_value * size / marks, 0.0)
+    buy_quantities = np.where(buys, np.maximum(target - positions, 0.0), 0.0)
+
+    budget = cash + (positions[sells] @ marks[sells]) * (1 - commission_rate)
+    cost = (buy_quantities @ marks) * (1 + commission_rate)
+    if cost > budget:
+        buy_quantities *= max(budget, 0.0) / cost
+    return quantities + buy_quantities
+
 
 class PortfolioManager:
     """
     Constructs the target portfolio based on risk-adjusted signals
     and generates orders to align the current portfolio with the target.
+
+    Positions and last prices are kept in arrays indexed by symbol, so
+    marking the portfolio to market and rebalancing a whole target-weight
+    vector are single vectorized steps.
     """
 
-    def __init__(self, initial_capital: float, base_currency: str = 'USDT'):
+    def __init__(
+        self,
+        symbols: List[str],
+        initial_capital: float,
+        base_currency: str = 'USDT',
+        settings: Optional[Settings] = None
+    ):
         """
         Initializes the PortfolioManager.
 
         Args:
+            symbols: The traded symbols; ledger arrays follow this order.
             initial_capital: The starting capital in base currency.
             base_currency: The base currency of the portfolio.
+            settings: Configuration to use; defaults to the active config.
         """
+        if settings is None:
+            settings = config.settings
+        self.symbols = list(symbols)
+        self.symbol_index = {symbol: j for j, symbol in enumerate(self.symbols)}
+        self.assets = [symbol.split('/')[0] for symbol in self.symbols]
         self.base_currency = base_currency
-        self.current_holdings = {base_currency: initial_capital}
-        self.total_value = initial_capital
-        print(f"PortfolioManager: Initialized with {initial_capital} {base_currency}.")
+        self.commission_rate = settings.get('executor.commission_rate', 0.001)
+        self.cash = float(initial_capital)
+        self.positions = np.zeros(len(self.symbols))
+        self.prices = np.full(len(self.symbols), np.nan)
+        logger.info("PortfolioManager: Initialized with %s %s.", initial_capital, base_currency)
+
+    @property
+    def total_value(self) -> float:
+        """Cash plus every position marked at its last known price."""
+        return float(self.cash + self.positions @ np.nan_to_num(self.prices))
+
+    @property
+    def current_holdings(self) -> Dict[str, float]:
+        """Cash and asset quantities keyed by currency."""
+        holdings = {self.base_currency: self.cash}
+        holdings.update(zip(self.assets, self.positions.tolist()))
+        return holdings
+
+    def get_state(self) -> Dict[str, Any]:
+        """The ledger (cash, positions and last prices), for checkpoints."""
+        return {'cash': self.cash, 'positions': self.positions.copy(), 'prices': self.prices.copy()}
+
+    def set_state(self, state: Dict[str, Any]):
+        """Restores a ledger captured by get_state."""
+        self.cash = state['cash']
+        self.positions = state['positions'].copy()
+        self.prices = state['prices'].copy()
+
+    def set_balances(self, balances: Dict[str, float]):
+        """
+        Replaces cash and positions with an account's balances.
+
+        Args:
+            balances: Quantities keyed by currency, e.g. from
+                ExchangeRestAPI.fetch_balances; missing ones count as 0.
+        """
+        self.cash = float(balances.get(self.base_currency, 0.0))
+        self.positions = np.array([float(balances.get(asset, 0.0)) for asset in self.assets])
+
+    def mark_to_market(self, close: np.ndarray):
+        """
+        Updates the last known prices.
+
+        Args:
+            close: Close prices in symbol order, shape (N,); NaN keeps the
+                previous price of a symbol without a bar.
+        """
+        self.prices = np.where(np.isnan(close), self.prices, close)
+
+    def update_market_batch(self, market_events: List[MarketDataEvent]):
+        """
+        Marks the portfolio with the market data events of one timestamp.
+
+        Args:
+            market_events: One event per symbol, all for the same timestamp.
+        """
+        close = np.full(len(self.symbols), np.nan)
+        for event in market_events:
+            close[self.symbol_index[event.symbol]] = event.close
+        self.mark_to_market(close)
 
     def update_holdings_from_fill(self, symbol: str, action: str, quantity: float, fill_price: float, commission: float):
         """
         Updates portfolio holdings after an order is filled.
         """
-        asset, quote = symbol.split('/')
+        j = self.symbol_index[symbol]
         cost = quantity * fill_price
 
         if action == 'buy':
-            self.current_holdings[self.base_currency] -= (cost + commission)
-            self.current_holdings[asset] = self.current_holdings.get(asset, 0) + quantity
+            self.cash -= (cost + commission)
+            self.positions[j] += quantity
         elif action == 'sell':
-            self.current_holdings[self.base_currency] += (cost - commission)
-            self.current_holdings[asset] = self.current_holdings.get(asset, 0) - quantity
+            self.cash += (cost - commission)
+            self.positions[j] -= quantity
+
+    def update_from_executions(self, execution_events: List[OrderExecutionEvent]):
+        """
+        Books the fills among execution results; failed orders are ignored.
+
+        Args:
+            execution_events: Results from the OrderExecutor, in execution order.
+        """
+        for event in execution_events:
+            if event.status not in ('filled', 'partially_filled'):
+                continue
+            self.update_holdings_from_fill(
+                symbol=event.symbol,
+                action=event.action,
+                quantity=event.quantity,
+                fill_price=event.fill_price,
+                commission=event.commission
+            )
+
+    def rebalance(self, risk_events: List[RiskAdjustedSignalEvent]) -> List[PortfolioDecisionEvent]:
+        """
+        Generates the trade decisions for one timestamp's risk-adjusted signals.
+
+        Args:
+            risk_events: The sized signals, all for the same timestamp; the
+                portfolio must already be marked to that timestamp.
+
+        Returns:
+            PortfolioDecisionEvents to execute: sells first, then buys, each
+            in symbol order.
+        """
+        if not risk_events:
+            return []
+        direction = np.zeros(len(self.symbols))
+        size = np.zeros(len(self.symbols))
+        for event in risk_events:
+            j = self.symbol_index[event.symbol]
+            direction[j] = 1 if event.signal_type == 'buy' else -1
+            size[j] = event.adjusted_size
+        quantities = rebalance_quantities(direction, size, self.positions, self.prices, self.cash, self.commission_rate)
+
+        timestamp = risk_events[0].timestamp
+        debug = logger.isEnabledFor(logging.DEBUG)
+        decisions = []
+        for j in np.concatenate([np.flatnonzero(quantities < 0), np.flatnonzero(quantities > 0)]).tolist():
+            action = 'buy' if quantities[j] > 0 else 'sell'
+            quantity = abs(float(quantities[j]))
+            if debug:
+                logger.debug("PortfolioManager: DECISION - %s %.4f %s", action.upper(), quantity, self.assets[j])
+            decisions.append(PortfolioDecisionEvent(
+                timestamp=timestamp,
+                symbol=self.symbols[j],
+                action=action,
+                quantity=quantity
+            ))
+        return decisions
 
     def make_decision(
         self,
@@ -53,39 +236,6 @@ class PortfolioManager:
         Returns:
             A PortfolioDecisionEvent to be executed, or None.
         """
-        asset, quote = risk_event.symbol.split('/')
-        current_asset_holding = self.current_holdings.get(asset, 0)
-        
-        # This is a simplified calculation of total portfolio value
-        # A real implementation would update prices for all assets
-        self.total_value = self.current_holdings[self.base_currency] + current_asset_holding * market_price
-
-        target_value = self.total_value * risk_event.adjusted_size
-        target_quantity = target_value / market_price
-        
-        current_value = current_asset_holding * market_price
-        
-        decision = None
-        if risk_event.signal_type == 'buy' and current_value < target_value:
-            quantity_to_buy = target_quantity - current_asset_holding
-            if quantity_to_buy * market_price <= self.current_holdings[self.base_currency]:
-                decision = PortfolioDecisionEvent(
-                    timestamp=risk_event.timestamp,
-                    symbol=risk_event.symbol,
-                    action='buy',
-                    quantity=quantity_to_buy
-                )
-                print(f"PortfolioManager: DECISION - BUY {quantity_to_buy:.4f} {asset}")
-
-        elif risk_event.signal_type == 'sell' and current_asset_holding > 0:
-            # Simple logic: sell the entire position on a sell signal.
-            # A more complex strategy would sell a portion.
-            decision = PortfolioDecisionEvent(
-                timestamp=risk_event.timestamp,
-                symbol=risk_event.symbol,
-                action='sell',
-                quantity=current_asset_holding
-            )
-            print(f"PortfolioManager: DECISION - SELL {current_asset_holding:.4f} {asset}")
-
-        return decision
\ No newline at end of file
+        self.prices[self.symbol_index[risk_event.symbol]] = market_price
+        decisions = self.rebalance([risk_event])
+        return decisions[0] if decisions else None
@@ -2,18 +2,267 @@
 """
 Adjusts trading signals based on portfolio risk metrics.
 """
-from typing import Optional
-from src.core.events import SignalEvent, RiskAdjustedSignalEvent
-from src.core.config import config
+import logging
+import numpy as np
+import pandas as pd
+from statistics import NormalDist
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from src.core.events import MarketDataEvent, SignalEvent, RiskAdjustedSignalEvent
+from src.core.config import Settings, config
+
+if TYPE_CHECKING:
+    from src.agents.portfolio_manager import PortfolioManager
+
+logger = logging.getLogger(__name__)
 
 class RiskManager:
     """
     Applies risk management rules to raw trading signals.
+
+    Keeps an exponentially weighted covariance matrix of bar log returns
+    across all symbols, updated in O(N^2) per bar. Once it has warmed up,
+    the buy sizes of each timestamp are scaled together: per-asset and
+    portfolio volatility targets, a cap on correlation-weighted exposure,
+    and a parametric VaR limit. The portfolio limits cover the positions
+    kept after the timestamp's trades plus the buys, so repeated buys
+    cannot build up past them. Sells close positions and are never scaled.
     """
-    def __init__(self):
-        """Initializes the RiskManager."""
-        self.max_position_allocation = config.get('risk.max_position_allocation', 0.25)
-        print(f"RiskManager: Initialized with max position allocation: {self.max_position_allocation}")
+    def __init__(
+        self,
+        symbols: List[str],
+        timeframe: Optional[str] = None,
+        settings: Optional[Settings] = None,
+        portfolio: Optional['PortfolioManager'] = None
+    ):
+        """
+        Initializes the RiskManager.
+
+        Args:
+            symbols: The traded symbols; price and size vectors follow this order.
+            timeframe: Bar interval, for annualizing volatility; defaults
+                to data.timeframe.
+            settings: Configuration to use; defaults to the active config.
+            portfolio: Portfolio whose cash and positions assess_batch sizes
+                against; None to size as if nothing were held.
+        """
+        if settings is None:
+            settings = config.settings
+        self.symbols = list(symbols)
+        self.portfolio = portfolio
+        self.symbol_index = {symbol: j for j, symbol in enumerate(self.symbols)}
+        self.max_position_allocation = settings.get('risk.max_position_allocation', 0.25)
+        self.risk_tolerance = settings.get('risk.risk_tolerance', 0.05)
+        self.ewma_lambda = settings.get('risk.ewma_lambda', 0.94)
+        self.min_periods = settings.get('risk.min_periods', 20)
+        self.max_correlated_allocation = settings.get('risk.max_correlated_allocation')
+        self.var_z = NormalDist().inv_cdf(settings.get('risk.var_confidence', 0.99))
+
+        # Annual volatility target converted to a per-bar one
+        vol_target = settings.get('risk.vol_target')
+        bars_per_year = pd.Timedelta('365D') / pd.Timedelta(timeframe or settings.get('data.timeframe', '1h'))
+        self.bar_vol_target = vol_target / np.sqrt(bars_per_year) if vol_target else None
+
+        n_symbols = len(self.symbols)
+        self._sum_cov = np.zeros((n_symbols, n_symbols))
+        # Total EWMA weight per pair, for bias correction and missing bars
+        self._weight = np.zeros((n_symbols, n_symbols))
+        self._last_close = np.full(n_symbols, np.nan)
+        self.n_updates = 0
+        self.last_var = 0.0
+        logger.info("RiskManager: Initialized with max position allocation: %s", self.max_position_allocation)
+
+    @property
+    def covariance(self) -> np.ndarray:
+        """The bias-corrected EWMA covariance of bar log returns, shape (N, N)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self._weight > 0, self._sum_cov / self._weight, 0.0)
+
+    def get_state(self) -> Dict[str, Any]:
+        """The covariance accumulators and last prices, for checkpoints."""
+        return {
+            'sum_cov': self._sum_cov.copy(),
+            'weight': self._weight.copy(),
+            'last_close': self._last_close.copy(),
+            'n_updates': self.n_updates,
+            'last_var': self.last_var,
+        }
+
+    def set_state(self, state: Dict[str, Any]):
+        """Restores accumulators captured by get_state."""
+        self._sum_cov = state['sum_cov'].copy()
+        self._weight = state['weight'].copy()
+        self._last_close = state['last_close'].copy()
+        self.n_updates = state['n_updates']
+        self.last_var = state['last_var']
+
+    def update_prices(self, close: np.ndarray):
+        """
+        Folds one bar of close prices into the covariance estimate.
+
+        Args:
+            close: Close prices in symbol order, shape (N,); NaN for
+                symbols without a bar at this timestamp.
+        """
+        close = np.asarray(close, dtype=float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            returns = np.log(close / self._last_close)
+        valid = np.isfinite(returns)
+        self._last_close = np.where(np.isnan(close), self._last_close, close)
+        if not valid.any():
+            return
+
+        decay = self.ewma_lambda
+        if valid.all():
+            self._sum_cov *= decay
+            self._sum_cov += (1 - decay) * np.outer(returns, returns)
+            self._weight *= decay
+            self._weight += 1 - decay
+        else:
+            pairs = np.ix_(valid, valid)
+            returns = returns[valid]
+            self._sum_cov[pairs] = decay * self._sum_cov[pairs] + (1 - decay) * np.outer(returns, returns)
+            self._weight[pairs] = decay * self._weight[pairs] + (1 - decay)
+        self.n_updates += 1
+
+    def update_market_batch(self, market_events: List[MarketDataEvent]):
+        """
+        Folds the market data events of one timestamp into the covariance.
+
+        Args:
+            market_events: One event per symbol, all for the same timestamp.
+        """
+        close = np.full(len(self.symbols), np.nan)
+        for event in market_events:
+            close[self.symbol_index[event.symbol]] = event.close
+        self.update_prices(close)
+
+    def position_weights(self, cash: float, positions: np.ndarray, marks: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Each position's share of the portfolio.
+
+        Args:
+            cash: Cash in base currency.
+            positions: Asset quantities in symbol order, shape (N,).
+            marks: Prices to value them at; defaults to the last closes.
+
+        Returns:
+            Position value over portfolio value, shape (N,).
+        """
+        values = positions * np.nan_to_num(self._last_close if marks is None else marks)
+        total_value = cash + values.sum()
+        return values / total_value if total_value > 0 else np.zeros(len(values))
+
+    @staticmethod
+    def _scale_within(held: np.ndarray, weights: np.ndarray, cov: np.ndarray, limit: float) -> float:
+        """
+        Largest k in [0, 1] with the volatility of held + k * weights within limit.
+
+        Solves the quadratic (w'Cw) k^2 + 2 (h'Cw) k + h'Ch = limit^2.
+        """
+        a = weights @ cov @ weights
+        b = held @ cov @ weights
+        c = held @ cov @ held - limit * limit
+        if a + 2 * b + c <= 0:
+            return 1.0
+        if c >= 0 or a <= 0:
+            # The kept positions alone are at the limit
+            return 0.0
+        return float(min(max((-b + np.sqrt(b * b - a * c)) / a, 0.0), 1.0))
+
+    def _base_size(self, direction: np.ndarray, strength: np.ndarray) -> np.ndarray:
+        """Sizes before the covariance-based limits."""
+        proposed_size = self.max_position_allocation * strength
+        return np.where(direction != 0, np.minimum(proposed_size, self.max_position_allocation), 0.0)
+
+    def _limit(self, direction: np.ndarray, size: np.ndarray, held: Optional[np.ndarray], cov: np.ndarray) -> np.ndarray:
+        """Scales the buys of one timestamp so the resulting portfolio meets the limits."""
+        buys = direction > 0
+        if not buys.any():
+            return size
+        vol = np.sqrt(np.diag(cov))
+        weights = np.where(buys, size, 0.0)
+        # Positions the timestamp's trades leave alone; sells close theirs,
+        # buys raise theirs to the new weight
+        held = np.zeros(len(weights)) if held is None else np.where(direction != 0, 0.0, held)
+
+        if self.bar_vol_target is not None:
+            # Each asset alone, then the kept positions plus the buys, within the target
+            with np.errstate(divide='ignore'):
+                weights = weights * np.minimum(1.0, self.bar_vol_target / vol)
+            weights *= self._scale_within(held, weights, cov, self.bar_vol_target)
+
+        if self.max_correlated_allocation is not None:
+            # Exposure of each asset including what its correlated peers add
+            with np.errstate(invalid='ignore', divide='ignore'):
+                corr = np.nan_to_num(cov / np.outer(vol, vol))
+            np.fill_diagonal(corr, 1.0)
+            exposure = corr @ (held + weights)
+            # A buy's own weight adds one for one to its exposure
+            weights = np.maximum(weights - np.maximum(exposure - self.max_correlated_allocation, 0.0), 0.0)
+
+        # Parametric (normal) one-bar VaR as a fraction of portfolio value
+        weights *= self._scale_within(held, weights, cov, self.risk_tolerance / self.var_z)
+        total = held + weights
+        self.last_var = self.var_z * np.sqrt(total @ cov @ total)
+
+        return np.where(buys, weights, size)
+
+    def size_vector(self, direction: np.ndarray, strength: np.ndarray, held: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Sizes the signals of one timestamp together.
+
+        Args:
+            direction: Signal directions (+1 buy, -1 sell, 0 hold), shape (N,).
+            strength: Signal strengths, shape (N,).
+            held: Current position weights (see position_weights), shape
+                (N,); None for no positions.
+
+        Returns:
+            Adjusted position sizes as a fraction of portfolio (0 for holds).
+        """
+        size = self._base_size(direction, strength)
+        if self.n_updates < self.min_periods:
+            return size
+        return self._limit(direction, size, held, self.covariance)
+
+    def assess_batch(self, signal_events: List[SignalEvent]) -> List[RiskAdjustedSignalEvent]:
+        """
+        Assesses the signals of one timestamp and sizes them together.
+
+        Args:
+            signal_events: Raw signal events from the SignalAgent, all for
+                the same timestamp.
+
+        Returns:
+            RiskAdjustedSignalEvents for the buy and sell signals, in input order.
+        """
+        signal_events = [event for event in signal_events if event.signal_type != 'hold']
+        if not signal_events:
+            return []
+
+        direction = np.zeros(len(self.symbols))
+        strength = np.zeros(len(self.symbols))
+        rows = [self.symbol_index[event.symbol] for event in signal_events]
+        for row, event in zip(rows, signal_events):
+            direction[row] = 1 if event.signal_type == 'buy' else -1
+            strength[row] = event.strength
+        portfolio = self.portfolio
+        held = self.position_weights(portfolio.cash, portfolio.positions) if portfolio is not None else None
+        sizes = self.size_vector(direction, strength, held)
+
+        debug = logger.isEnabledFor(logging.DEBUG)
+        risk_events = []
+        for row, event in zip(rows, signal_events):
+            adjusted_size = float(sizes[row])
+            if debug:
+                logger.debug("RiskManager: Adjusted %s size to %.2f of portfolio", event.symbol, adjusted_size)
+            risk_events.append(RiskAdjustedSignalEvent(
+                timestamp=event.timestamp,
+                symbol=event.symbol,
+                signal_type=event.signal_type,
+                adjusted_size=adjusted_size
+            ))
+        return risk_events
 
     def assess_risk(self, signal_event: SignalEvent) -> Optional[RiskAdjustedSignalEvent]:
         """
@@ -25,25 +274,72 @@ class RiskManager:
         Returns:
             A RiskAdjustedSignalEvent with a calculated position size.
         """
-        # --- Dummy Logic ---
-        # This logic determines position size based on signal strength
-        # and a hard-coded maximum allocation.
-        # A real system would use VaR, correlation matrices, etc.
+        risk_events = self.assess_batch([signal_event])
+        return risk_events[0] if risk_events else None
 
-        if signal_event.signal_type == 'hold':
-            return None
+    def size_signals(
+        self,
+        direction: np.ndarray,
+        strength: np.ndarray,
+        close: np.ndarray
+    ) -> 'SignalSizer':
+        """
+        Vectorized counterpart of update_market_batch and assess_batch for a panel.
 
-        # Scale position size by signal strength
-        proposed_size = self.max_position_allocation * signal_event.strength
+        Sizes depend on the positions held at each signal bar, which only
+        the portfolio scan knows, so they are computed when it asks for
+        them; the covariance is advanced up to each bar it asks about.
 
-        # Ensure the size does not exceed the maximum limit
-        adjusted_size = min(proposed_size, self.max_position_allocation)
+        Args:
+            direction: Signal directions (+1 buy, -1 sell, 0 hold), shape (T, N).
+            strength: Signal strengths, same shape as direction.
+            close: Close prices, same shape as direction.
 
-        print(f"RiskManager: Adjusted {signal_event.symbol} size to {adjusted_size:.2f} of portfolio")
+        Returns:
+            A SignalSizer: sizer(t, cash, positions) returns bar t's adjusted
+            sizes for the ledger before its trades, matching assess_batch
+            on that timestamp. Call sizer.finish() after the scan.
+        """
+        return SignalSizer(self, direction, strength, close)
+
+
+class SignalSizer:
+    """
+    Sizes one panel's signals while walking its bars in order.
+
+    Each call folds the bars up to the one asked about into the risk
+    manager's covariance, so only the current matrix is kept, however
+    many bars carry signals.
+    """
+
+    def __init__(self, risk_manager: RiskManager, direction: np.ndarray, strength: np.ndarray, close: np.ndarray):
+        self.risk_manager = risk_manager
+        self.direction = direction
+        self.strength = strength
+        self.close = close
+        # First bar not yet folded into the covariance
+        self.next_bar = 0
+
+    def _advance(self, stop: int):
+        """Folds the bars before `stop` into the covariance."""
+        for t in range(self.next_bar, stop):
+            self.risk_manager.update_prices(self.close[t])
+        self.next_bar = max(self.next_bar, stop)
+
+    def __call__(self, t: int, cash: float, positions: np.ndarray) -> np.ndarray:
+        """
+        Sizes bar t's signals given the ledger before its trades.
+
+        Raises:
+            ValueError: If t was already passed; bars are sized in order.
+        """
+        if t < self.next_bar:
+            raise ValueError(f"Bar {t} was already passed; signals are sized in bar order")
+        self._advance(t + 1)
+        risk_manager = self.risk_manager
+        held = risk_manager.position_weights(cash, positions)
+        return risk_manager.size_vector(self.direction[t], self.strength[t], held)
 
-        return RiskAdjustedSignalEvent(
-            timestamp=signal_event.timestamp,
-            symbol=signal_event.symbol,
-            signal_type=signal_event.signal_type,
-            adjusted_size=adjusted_size
-        )
\ No newline at end of file
+    def finish(self):
+        """Folds the bars after the last sized one into the covariance."""
+        self._advance(len(self.close))
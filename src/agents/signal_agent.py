@@ -2,19 +2,131 @@
 """
 Generates trading signals based on market data and ML models.
 """
-import random
-from typing import Optional
+import copy
+import logging
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from src.core.config import Settings, config
 from src.core.events import MarketDataEvent, SignalEvent
+from src.data_fetcher.data_collector import OHLCVPanel
+from src.MLmodule.feature_engine.feature_engine import FeatureEngine
+from src.MLmodule.models.loader import load_model
+
+logger = logging.getLogger(__name__)
 
 class SignalAgent:
     """
     Applies an ML model to market data to generate trading signals.
+
+    All symbols' bars for a timestamp are scored with a single batched
+    predict call; the results are split back into per-symbol SignalEvents.
     """
-    def __init__(self):
-        """Initializes the SignalAgent."""
-        # In a real system, a pre-trained model would be loaded here.
-        # self.model = load_model('path/to/model.pkl')
-        print("SignalAgent: Initialized. (Using a dummy prediction model).")
+    def __init__(self, symbols: List[str], seed=None, settings: Optional[Settings] = None):
+        """
+        Initializes the SignalAgent.
+
+        Args:
+            symbols: The traded symbols; feature and score rows follow this order.
+            seed: Seed (or SeedSequence) for the dummy model's randomness.
+            settings: Configuration to use; defaults to the active config.
+        """
+        if settings is None:
+            settings = config.settings
+        self.symbols = list(symbols)
+        self.symbol_index = {symbol: j for j, symbol in enumerate(self.symbols)}
+        self.threshold = settings.get('signal.threshold', 0.1)
+        self.rng = np.random.default_rng(seed)
+
+        model_path = settings.get('signal.model_path')
+        if model_path:
+            self.model = load_model(Path(model_path))
+            # The artifact records the features it was trained on
+            self.feature_engine = FeatureEngine(self.symbols, getattr(self.model, 'feature_spec', None))
+            logger.info("SignalAgent: Initialized with model from %s.", model_path)
+        else:
+            self.model = None
+            self.feature_engine = None
+            logger.info("SignalAgent: Initialized. (Using a dummy prediction model).")
+
+    def get_state(self) -> Dict[str, Any]:
+        """The dummy model's RNG and the indicators' streaming state, for checkpoints."""
+        return {
+            'rng': self.rng.bit_generator.state,
+            'indicators': copy.deepcopy(self.feature_engine.indicators) if self.feature_engine is not None else None,
+        }
+
+    def set_state(self, state: Dict[str, Any]):
+        """Restores a state captured by get_state."""
+        self.rng.bit_generator.state = state['rng']
+        if self.feature_engine is not None:
+            self.feature_engine.indicators = copy.deepcopy(state['indicators'])
+
+    def _scores_to_signals(self, scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Converts model scores to (direction, strength); NaN scores are holds."""
+        scores = np.nan_to_num(scores, nan=0.0)
+        direction = np.where(np.abs(scores) >= self.threshold, np.sign(scores), 0).astype(np.int8)
+        strength = np.minimum(np.abs(scores), 1.0)
+        return direction, strength
+
+    def _predict(self, features: np.ndarray) -> np.ndarray:
+        """Runs one batched predict over feature rows; rows still warming up score NaN."""
+        scores = np.full(len(features), np.nan)
+        ready = ~np.isnan(features).any(axis=1)
+        if ready.any():
+            scores[ready] = np.asarray(self.model.predict(features[ready]), dtype=float).ravel()
+        return scores
+
+    def process_market_batch(self, market_events: List[MarketDataEvent]) -> List[SignalEvent]:
+        """
+        Processes the market data events of one timestamp together.
+
+        Args:
+            market_events: One event per symbol, all for the same timestamp.
+
+        Returns:
+            SignalEvents for the symbols with a buy or sell signal, in input order.
+        """
+        if not market_events:
+            return []
+        open_ = np.array([event.open for event in market_events])
+        close = np.array([event.close for event in market_events])
+
+        if self.model is not None:
+            rows = np.array([self.symbol_index[event.symbol] for event in market_events])
+            features = self.feature_engine.update_bar(
+                market_events[0].timestamp,
+                open_,
+                np.array([event.high for event in market_events]),
+                np.array([event.low for event in market_events]),
+                close,
+                np.array([event.volume for event in market_events]),
+                rows=rows,
+            )
+            direction, strength = self._scores_to_signals(self._predict(features))
+        else:
+            # --- Dummy Logic ---
+            # Simulate a simple momentum strategy for demonstration.
+            # One uniform draw per bar keeps the random stream aligned with
+            # generate_signals, which draws the same numbers for a whole panel.
+            direction, strength = self._momentum_signals(open_, close, self.rng.random(len(market_events)))
+
+        debug = logger.isEnabledFor(logging.DEBUG)
+        signals = []
+        for event, side, event_strength in zip(market_events, direction.tolist(), strength.tolist()):
+            if side == 0:
+                continue
+            signal_type = 'buy' if side > 0 else 'sell'
+            if debug:
+                logger.debug("SignalAgent: Generated %s signal for %s with strength %.2f",
+                             signal_type.upper(), event.symbol, event_strength)
+            signals.append(SignalEvent(
+                timestamp=event.timestamp,
+                symbol=event.symbol,
+                signal_type=signal_type,
+                strength=event_strength
+            ))
+        return signals
 
     def process_market_data(self, market_event: MarketDataEvent) -> Optional[SignalEvent]:
         """
@@ -26,28 +138,32 @@ class SignalAgent:
         Returns:
             A SignalEvent if a signal is generated, otherwise None.
         """
-        # In a real system, we would generate features from the market_event
-        # features = self.feature_engine.transform(market_event)
-        # prediction = self.model.predict(features)
-        
-        # --- Dummy Logic ---
-        # Simulate a simple momentum strategy for demonstration
-        if market_event.close > market_event.open:
-            signal_type = 'buy'
-            strength = random.uniform(0.6, 1.0)
-        elif market_event.close < market_event.open:
-            signal_type = 'sell'
-            strength = random.uniform(0.6, 1.0)
-        else:
-            signal_type = 'hold'
-            strength = random.uniform(0.0, 0.4)
-        
-        if signal_type != 'hold':
-            print(f"SignalAgent: Generated {signal_type.upper()} signal for {market_event.symbol} with strength {strength:.2f}")
-            return SignalEvent(
-                timestamp=market_event.timestamp,
-                symbol=market_event.symbol,
-                signal_type=signal_type,
-                strength=strength
-            )
-        return None
\ No newline at end of file
+        signals = self.process_market_batch([market_event])
+        return signals[0] if signals else None
+
+    @staticmethod
+    def _momentum_signals(open_: np.ndarray, close: np.ndarray, draws: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """The dummy model: follow the bar's direction with a random strength."""
+        direction = np.sign(close - open_).astype(np.int8)
+        strength = np.where(direction != 0, 0.6 + 0.4 * draws, 0.4 * draws)
+        return direction, strength
+
+    def generate_signals(self, chunk: OHLCVPanel) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Applies the model to a whole (time x symbol) chunk at once.
+
+        Produces the same signals, bar for bar, as calling
+        process_market_batch on the equivalent events in time order.
+
+        Args:
+            chunk: Bars for all symbols, in the agent's symbol order.
+
+        Returns:
+            A tuple (direction, strength) of shape (T, N): direction is +1
+            for buy, -1 for sell and 0 for hold; strength is the signal strength.
+        """
+        if self.model is not None:
+            features = self.feature_engine.update_chunk(chunk)
+            scores = self._predict(features.reshape(-1, features.shape[-1]))
+            return self._scores_to_signals(scores.reshape(chunk.close.shape))
+        return self._momentum_signals(chunk.open, chunk.close, self.rng.random(chunk.close.shape))
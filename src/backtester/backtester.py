@@ -2,89 +2,380 @@
 """
 Orchestrates the backtesting process using historical data.
 """
+import logging
+import numpy as np
+import pandas as pd
+from itertools import groupby
 from pathlib import Path
-from src.core.config import config
-from src.data_fetcher.data_collector import DataCollector
+from typing import Any, Dict, List, Optional
+from src.backtester.checkpoint import load_checkpoint, save_checkpoint
+from src.backtester.performance import EquityRecorder, performance_report
+from src.core.config import Settings, config
+from src.core.event_bus import EventBus
+from src.core.instrumentation import PipelineMetrics
+from src.core.journal import TradeJournal
+from src.core.events import (
+    MarketDataEvent, SignalEvent, RiskAdjustedSignalEvent, PortfolioDecisionEvent,
+    OrderExecutionEvent, set_event_validation
+)
+from src.data_fetcher.data_collector import DataCollector, OHLCVPanel
+from src.data_fetcher.history_store import OHLCVStore
 from src.agents.signal_agent import SignalAgent
 from src.agents.risk_manager import RiskManager
 from src.agents.portfolio_manager import PortfolioManager
+from src.executor.fill_simulator import FillSimulator, IntrabarBook
 from src.executor.order_executor import OrderExecutor
 
+logger = logging.getLogger(__name__)
+
 class Backtester:
     """
     A class to run a backtest of the trading strategy.
     """
-    def __init__(self, config_path: Path):
-        """Initializes the backtesting environment."""
-        config.load_config(config_path)
+    def __init__(
+        self,
+        config_path: Optional[Path] = None,
+        panel: Optional[OHLCVPanel] = None,
+        settings: Optional[Settings] = None,
+        intrabar: Optional[IntrabarBook] = None
+    ):
+        """
+        Initializes the backtesting environment.
+
+        Args:
+            config_path: Configuration file to load and make active.
+            panel: Market data to replay instead of the configured source.
+            settings: Configuration for this run, handed to every component;
+                defaults to the active config.
+            intrabar: Fine candles for intrabar fills, already loaded (e.g.
+                by a sweep worker); read from the store when needed otherwise.
+        """
+        if config_path is not None:
+            config.load_config(config_path)
+        if settings is None:
+            settings = config.settings
+        self.settings = settings
+        if settings.get('debug.validate_events', False):
+            set_event_validation(True)
         
         # Load settings
-        self.symbols = config.get('trading.pairs')
-        start_date = config.get('backtester.start_date')
-        end_date = config.get('backtester.end_date')
-        initial_capital = config.get('backtester.initial_capital')
-        base_currency = config.get('backtester.base_currency')
+        self.symbols = settings.get('trading.pairs')
+        start_date = settings.get('backtester.start_date')
+        end_date = settings.get('backtester.end_date')
+        initial_capital = settings.get('backtester.initial_capital')
+        base_currency = settings.get('backtester.base_currency')
+        # Independent random streams for market data and the signal model
+        data_seed, signal_seed = np.random.SeedSequence(settings.get('backtester.seed')).spawn(2)
         
         # Initialize components
-        self.data_collector = DataCollector(self.symbols, start_date, end_date)
-        self.signal_agent = SignalAgent()
-        self.risk_manager = RiskManager()
-        self.portfolio_manager = PortfolioManager(initial_capital, base_currency)
-        self.order_executor = OrderExecutor(mode='backtest')
+        source = settings.get('data.source', 'mock')
+        if panel is None and source == 'scenario':
+            # Imported here: only stress-test runs need the scenario generator
+            from src.data_fetcher.scenario import ScenarioGenerator
+            panel = ScenarioGenerator(
+                self.symbols, start_date, end_date, settings.get('data.timeframe', '1h'),
+                seed=settings.get('backtester.seed'), settings=settings,
+            ).load()
+        replay_store = source == 'store'
+        store = None
+        # Intrabar fills read finer candles from the store with either source
+        if replay_store or settings.get('executor.fill_timeframe'):
+            store = OHLCVStore(Path(settings.get('data.store_path')))
+        self.data_collector = DataCollector(
+            self.symbols,
+            start_date,
+            end_date,
+            seed=data_seed,
+            store=store if replay_store else None,
+            exchange=settings.get('trading.exchange'),
+            timeframe=settings.get('data.timeframe', '1h'),
+            panel=panel,
+            settings=settings,
+            base_timeframe=settings.get('data.base_timeframe'),
+        )
+        self.signal_agent = SignalAgent(self.symbols, seed=signal_seed, settings=settings)
+        self.portfolio_manager = PortfolioManager(self.symbols, initial_capital, base_currency, settings=settings)
+        self.risk_manager = RiskManager(self.symbols, settings=settings, portfolio=self.portfolio_manager)
+        self.order_executor = OrderExecutor(
+            mode='backtest', settings=settings, fill_simulator=self._build_fill_simulator(store, intrabar)
+        )
+        self.n_trades = 0
+        self.total_commission = 0.0
+        # Per-timestamp equity and per-fill records for the performance report
+        if panel is not None:
+            expected_bars = len(panel.timestamps)
+        else:
+            collector = self.data_collector
+            expected_bars = (collector.end_dt - collector.start_dt) // collector.bar_interval + 1
+        self.recorder = EquityRecorder(self.symbols, capacity=expected_bars)
+        # Per-stage timings and drop counts; None unless metrics.enabled
+        self.metrics = PipelineMetrics.from_config(settings)
+        # Append-only record of decisions, fills and equity; None unless journal.path is set
+        journal_path = settings.get('journal.path')
+        self.journal = TradeJournal(journal_path, settings.get('journal.buffer_rows', 4096)) if journal_path else None
+        # Periodic snapshots to resume or extend the run from; None unless checkpoint.path is set
+        self.checkpoint_path = settings.get('checkpoint.path')
+        self.checkpoint_every = settings.get('checkpoint.every_bars', 1000)
+        # Synchronous dispatch keeps the backtest deterministic
+        self.bus = EventBus(mode='sync', metrics=self.metrics)
+        self._subscribe_stages()
         
-        print("\n--- Backtester Initialized ---")
+        logger.info("\n--- Backtester Initialized ---")
+
+    def _build_fill_simulator(
+        self,
+        store: Optional[OHLCVStore],
+        book: Optional[IntrabarBook]
+    ) -> Optional[FillSimulator]:
+        """Intrabar fills on executor.fill_timeframe candles; None fills at the bar close."""
+        settings = self.settings
+        fill_timeframe = settings.get('executor.fill_timeframe')
+        if not fill_timeframe:
+            return None
+        bar_interval_ns = self.data_collector.bar_interval.value
+        latency_ns = int(settings.get('executor.latency_ms', 0) * 1_000_000)
+        if book is None:
+            # The last bar's orders trade during the bar after it
+            book = IntrabarBook.from_store(
+                store,
+                settings.get('trading.exchange'),
+                self.symbols,
+                fill_timeframe,
+                self.data_collector.start_dt.value,
+                self.data_collector.end_dt.value + 2 * bar_interval_ns + latency_ns,
+            )
+        return FillSimulator(
+            book,
+            bar_interval_ns,
+            latency_ns=latency_ns,
+            max_participation=settings.get('executor.max_participation', 0.1),
+            impact=settings.get('executor.impact', 0.1),
+        )
 
     def run(self):
         """Runs the backtest simulation."""
-        print("\n--- Starting Backtest Run ---")
+        logger.info("\n--- Starting Backtest Run ---")
         
+        self.resume()
+        if self.metrics is not None:
+            self.metrics.start()
         data_stream = self.data_collector.get_data_stream()
+        batches = (list(events) for _, events in groupby(data_stream, key=lambda event: event.timestamp))
+        if self.metrics is not None:
+            batches = self.metrics.timed_batches('data', batches)
 
-        for market_event in data_stream:
-            # 1. Signal Generation
-            signal_event = self.signal_agent.process_market_data(market_event)
-            if not signal_event:
-                continue
-
-            # 2. Risk Assessment
-            risk_event = self.risk_manager.assess_risk(signal_event)
-            if not risk_event:
-                continue
-
-            # 3. Portfolio Decision
-            decision_event = self.portfolio_manager.make_decision(risk_event, market_event.close)
-            if not decision_event:
-                continue
-
-            # 4. Order Execution
-            execution_event = self.order_executor.execute_order(decision_event, market_event.close)
-            if not execution_event or execution_event.status != 'filled':
-                continue
-                
-            # 5. Update Portfolio
-            self.portfolio_manager.update_holdings_from_fill(
-                symbol=execution_event.symbol,
-                action=execution_event.action,
-                quantity=execution_event.quantity,
-                fill_price=execution_event.fill_price,
-                commission=execution_event.commission
-            )
-        
+        # Each timestamp's bars go through every stage before the next timestamp
+        for n_bars, market_events in enumerate(batches, start=1):
+            self.bus.publish(market_events)
+            # Sync dispatch has run every stage, so these are end-of-bar values
+            self._record_equity(market_events)
+            if self.checkpoint_path and n_bars % self.checkpoint_every == 0:
+                self.save_checkpoint(market_events[0].timestamp + self.data_collector.bar_interval)
+
+        if self.checkpoint_path:
+            self.save_checkpoint(self.data_collector.current_dt)
         self.print_results()
+        self.dump_metrics()
+        self.close_journal()
+
+    def get_state(self, next_dt: pd.Timestamp) -> Dict[str, Any]:
+        """
+        Captures the run's state between two timestamps.
+
+        Args:
+            next_dt: The first bar not processed yet.
+
+        Returns:
+            A picklable state for set_state.
+        """
+        return {
+            'data': self.data_collector.get_state(next_dt),
+            'signal': self.signal_agent.get_state(),
+            'risk': self.risk_manager.get_state(),
+            'portfolio': self.portfolio_manager.get_state(),
+            'executor': self.order_executor.get_state(),
+            'n_trades': self.n_trades,
+            'total_commission': self.total_commission,
+            'recorder': self.recorder.get_state(),
+            'journal_size': self.journal.sync() if self.journal is not None else None,
+        }
+
+    def set_state(self, state: Dict[str, Any]):
+        """Continues the run from a state captured by get_state."""
+        self.data_collector.set_state(state['data'])
+        self.signal_agent.set_state(state['signal'])
+        self.risk_manager.set_state(state['risk'])
+        self.portfolio_manager.set_state(state['portfolio'])
+        self.order_executor.set_state(state['executor'])
+        self.n_trades = state['n_trades']
+        self.total_commission = state['total_commission']
+        self.recorder.set_state(state['recorder'])
+        if self.journal is not None and state['journal_size'] is not None:
+            # Rows journaled after the snapshot are produced again
+            self.journal.truncate(state['journal_size'])
+
+    def save_checkpoint(self, next_dt: pd.Timestamp):
+        """Snapshots the run to checkpoint.path."""
+        save_checkpoint(self.checkpoint_path, self.get_state(next_dt), self.settings)
+        logger.debug("Checkpoint before %s written to %s", next_dt, self.checkpoint_path)
+
+    def resume(self) -> bool:
+        """
+        Restores the last checkpoint if checkpoint.resume is set and one exists.
+
+        Returns:
+            True if the run continues from a checkpoint.
+
+        Raises:
+            ValueError: If the checkpoint was taken with different settings.
+        """
+        if not (self.checkpoint_path and self.settings.get('checkpoint.resume', False)):
+            return False
+        if not Path(self.checkpoint_path).exists():
+            logger.info("No checkpoint at %s; starting from %s", self.checkpoint_path, self.data_collector.start_dt)
+            return False
+        state = load_checkpoint(self.checkpoint_path, self.settings)
+        self.set_state(state)
+        logger.info("Resuming from checkpoint %s at %s", self.checkpoint_path, self.data_collector.current_dt)
+        return True
+
+    def _subscribe_stages(self):
+        """Wires the agents into the event bus, upstream stages first."""
+        bus = self.bus
+        # 1. Signal Generation, batched across the symbols of one timestamp
+        bus.subscribe(MarketDataEvent, self.signal_agent.process_market_batch, stage='signal')
+        # 2. Risk Assessment, sizing the timestamp's signals together
+        bus.subscribe(MarketDataEvent, self.risk_manager.update_market_batch, stage='risk')
+        bus.subscribe(SignalEvent, self.risk_manager.assess_batch, stage='risk')
+        # 3. Portfolio Decision, marking every position to market first
+        bus.subscribe(MarketDataEvent, self.portfolio_manager.update_market_batch, stage='portfolio')
+        bus.subscribe(RiskAdjustedSignalEvent, self.portfolio_manager.rebalance, stage='portfolio')
+        # 5. Update Portfolio
+        bus.subscribe(OrderExecutionEvent, self.portfolio_manager.update_from_executions, stage='portfolio')
+        # 4. Order Execution
+        bus.subscribe(MarketDataEvent, self.order_executor.update_market_batch, stage='executor')
+        bus.subscribe(PortfolioDecisionEvent, self._execute_decisions, stage='executor')
+        bus.subscribe(OrderExecutionEvent, self._record_executions, stage='recorder')
+        if self.journal is not None:
+            bus.subscribe(PortfolioDecisionEvent, self.journal.record_decisions, stage='journal')
+            bus.subscribe(OrderExecutionEvent, self.journal.record_fills, stage='journal')
+        if self.metrics is not None:
+            # Bars without a buy/sell signal, and signals that need no trade
+            self.metrics.track_drops('hold_signals', 'signal', MarketDataEvent)
+            self.metrics.track_drops('no_decision', 'portfolio', RiskAdjustedSignalEvent)
+
+    def _execute_decisions(self, decision_events: List[PortfolioDecisionEvent]) -> List[OrderExecutionEvent]:
+        """Executes a rebalance; simulated buys spend no more than the cash there is."""
+        # The rebalance's fills are not booked yet, so this is the cash before it
+        return self.order_executor.execute_batch(decision_events, cash=self.portfolio_manager.cash)
+
+    def _record_executions(self, execution_events: List[OrderExecutionEvent]):
+        """Counts and records the run's fills and commissions."""
+        portfolio = self.portfolio_manager
+        for event in execution_events:
+            if event.status in ('filled', 'partially_filled'):
+                self.n_trades += 1
+                self.total_commission += event.commission
+                j = portfolio.symbol_index[event.symbol]
+                quantity = event.quantity if event.action == 'buy' else -event.quantity
+                self.recorder.record_fill(j, quantity * event.fill_price, event.commission, float(portfolio.positions[j]))
+            elif self.metrics is not None:
+                self.metrics.count('unfilled')
+
+    def _record_equity(self, market_events: List[MarketDataEvent]):
+        """Records (and journals) the portfolio's end-of-bar cash, equity and exposure."""
+        portfolio = self.portfolio_manager
+        # The arithmetic of EquityRecorder.record_panel, so both engines record the same values
+        values = portfolio.positions * portfolio.prices
+        market_value = values.sum()
+        if market_value != market_value:
+            # A symbol has no price yet
+            values = portfolio.positions * np.nan_to_num(portfolio.prices)
+            market_value = values.sum()
+        equity = portfolio.cash + market_value
+        self.recorder.record_bar(market_events[0].timestamp.value, portfolio.cash, equity, np.abs(values).sum())
+        if self.journal is not None:
+            # After the timestamp's decisions and fills, as the vectorized engine journals it
+            self.journal.record_equity(market_events[0].timestamp, portfolio.cash, equity)
+
+    def close_journal(self):
+        """Writes out the trade journal, if enabled."""
+        if self.journal is None:
+            return
+        self.journal.close()
+        logger.info("Trade journal written to %s", self.journal.path)
+
+    def dump_metrics(self):
+        """Writes the run's pipeline metrics and results to metrics.path, if enabled."""
+        if self.metrics is None:
+            return
+        path = self.metrics.dump(self.settings.get('metrics.path', 'reports/metrics.json'), results=self.summary())
+        logger.info("Pipeline metrics written to %s", path)
+
+    def performance(self) -> Dict[str, Any]:
+        """
+        Computes the run's performance metrics from its records.
+
+        Returns:
+            The report of performance_report.
+        """
+        portfolio = self.portfolio_manager
+        return performance_report(
+            self.recorder,
+            self.settings.get('backtester.initial_capital'),
+            self.data_collector.bar_interval,
+            portfolio.positions,
+            portfolio.prices,
+        )
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Summarizes the finished run.
+
+        Returns:
+            Final value, PnL, number of trades, commissions paid and the
+            headline performance metrics.
+        """
+        initial_capital = self.settings.get('backtester.initial_capital')
+        final_value = self.portfolio_manager.total_value
+        pnl = final_value - initial_capital
+        report = self.performance()
+        return {
+            'final_value': final_value,
+            'pnl': pnl,
+            'pnl_percent': (pnl / initial_capital) * 100,
+            'n_trades': self.n_trades,
+            'total_commission': self.total_commission,
+            'sharpe': report['sharpe'],
+            'sortino': report['sortino'],
+            'max_drawdown': report['max_drawdown'],
+            'hit_rate': report['hit_rate'],
+        }
 
     def print_results(self):
         """Prints the final results of the backtest."""
-        print("\n--- Backtest Finished ---")
-        initial_capital = config.get('backtester.initial_capital')
+        logger.info("\n--- Backtest Finished ---")
+        initial_capital = self.settings.get('backtester.initial_capital')
         final_holdings = self.portfolio_manager.current_holdings
-        # In a real scenario, we would need final prices to calculate the total value
+        # Every position is marked at its last close
         final_value = self.portfolio_manager.total_value
 
         pnl = final_value - initial_capital
         pnl_percent = (pnl / initial_capital) * 100
 
-        print(f"Initial Capital: {initial_capital:.2f}")
-        print(f"Final Portfolio Value: {final_value:.2f}")
-        print(f"Final Holdings: {final_holdings}")
-        print(f"Profit and Loss: {pnl:.2f} ({pnl_percent:.2f}%)")
-        # Here you would add more metrics: Sharpe Ratio, Max Drawdown, etc.
\ No newline at end of file
+        logger.info("Initial Capital: %.2f", initial_capital)
+        logger.info("Final Portfolio Value: %.2f", final_value)
+        logger.info("Final Holdings: %s", final_holdings)
+        logger.info("Profit and Loss: %.2f (%.2f%%)", pnl, pnl_percent)
+
+        report = self.performance()
+        logger.info("Sharpe Ratio: %.2f, Sortino Ratio: %.2f", report['sharpe'], report['sortino'])
+        logger.info("Max Drawdown: %.2f%% (longest under water: %s)",
+                    report['max_drawdown'] * 100, report['max_drawdown_duration'])
+        logger.info("Hit Rate: %.2f%% of %d round trips", report['hit_rate'] * 100, report['n_round_trips'])
+        logger.info("Average Exposure: %.2f%%, Turnover: %.2f, Fees: %.2f",
+                    report['exposure'] * 100, report['turnover'], report['fees'])
+        logger.info("PnL Attribution:")
+        for symbol, attribution in report['attribution'].items():
+            logger.info("  %-12s PnL %12.2f  Fees %10.2f  Turnover %14.2f",
+                        symbol, attribution['pnl'], attribution['fees'], attribution['turnover'])
\ No newline at end of file
@@ -0,0 +1,94 @@
+# src/backtester/checkpoint.py
+"""
+Snapshots of a backtest's state, for resuming or extending a run.
+
+A checkpoint holds everything the rest of the run depends on: the data
+stream position (and mock generator RNG state), the portfolio ledger, the
+agents' streaming state and RNGs, and the run's counters. Restoring one
+and streaming the remaining bars gives exactly the results of an
+uninterrupted run, so a run can be resumed after a crash, or a finished
+run extended to a later `backtester.end_date` by processing only the new
+bars.
+
+Checkpoints are pickles written atomically, and are tied to the settings
+that shape the run (everything but the end date).
+"""
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+from src.core.config import Settings, config
+
+CHECKPOINT_VERSION = 2
+
+# Config sections a checkpoint is only valid for; backtester.end_date may change,
+# and so may where scenarios are stored and how many workers generate them
+FINGERPRINT_SECTIONS = ('trading', 'data', 'signal', 'risk', 'backtester', 'executor', 'scenario')
+
+
+def config_fingerprint(settings: Optional[Settings] = None) -> str:
+    """Hashes the settings that shape a run (defaults to the active config), apart from its end date."""
+    if settings is None:
+        settings = config.settings
+    sections = {name: settings.get(name, Settings()).to_dict() for name in FINGERPRINT_SECTIONS}
+    sections['backtester'].pop('end_date', None)
+    sections['scenario'].pop('path', None)
+    sections['scenario'].pop('n_workers', None)
+    return hashlib.sha256(json.dumps(sections, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def save_checkpoint(path, state: Dict[str, Any], settings: Optional[Settings] = None) -> Path:
+    """
+    Writes a checkpoint, replacing the previous one atomically.
+
+    Args:
+        path: Checkpoint file.
+        state: The run's state, picklable.
+        settings: The run's configuration; defaults to the active config.
+
+    Returns:
+        The checkpoint path.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A unique temporary file, so concurrent writers never rename each other's
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name + '.', suffix='.tmp', delete=False) as f:
+        tmp_path = f.name
+        try:
+            pickle.dump({'version': CHECKPOINT_VERSION, 'fingerprint': config_fingerprint(settings), 'state': state},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        except BaseException:
+            f.close()
+            os.unlink(tmp_path)
+            raise
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_checkpoint(path, settings: Optional[Settings] = None) -> Dict[str, Any]:
+    """
+    Reads a checkpoint written by save_checkpoint.
+
+    Args:
+        path: Checkpoint file.
+        settings: The resuming run's configuration; defaults to the active config.
+
+    Returns:
+        The saved state.
+
+    Raises:
+        ValueError: If the checkpoint is from another version or was taken
+            with different settings.
+    """
+    with open(path, 'rb') as f:
+        checkpoint = pickle.load(f)
+    if checkpoint.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"{path} is not a version {CHECKPOINT_VERSION} checkpoint")
+    if checkpoint['fingerprint'] != config_fingerprint(settings):
+        raise ValueError(f"{path} was taken with different settings; only backtester.end_date may change on resume")
+    return checkpoint['state']
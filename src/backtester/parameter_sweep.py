@@ -0,0 +1,248 @@
+# src/backtester/parameter_sweep.py
+"""
+Runs many backtests with different parameters in parallel.
+
+Market data is produced once in the parent process and placed in shared
+memory; every worker process maps it instead of regenerating or reloading
+it. Each worker builds the base settings once; a run derives its own
+frozen settings with the run's parameters applied and hands them to the
+backtester explicitly. Checkpoint, journal and metrics files get a per-run
+suffix (e.g. 'ck.run3.pkl'), since runs execute concurrently. Where
+workers start from a fork server, the server imports this module once
+and every worker forks from it ready to run.
+
+Usage:
+    runs = grid_search({'risk.max_position_allocation': [0.1, 0.25],
+                        'executor.commission_rate': [0.0005, 0.001]})
+    results = ParameterSweep(Path('src/core/config.yaml'), runs).run()
+"""
+import itertools
+import logging
+import multiprocessing
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from src.backtester.backtester import Backtester
+from src.backtester.vectorized_backtester import VectorizedBacktester
+from src.core.config import Settings
+from src.core.logger import setup_worker_logging
+from src.data_fetcher.data_collector import OHLCVPanel
+from src.executor.fill_simulator import IntrabarBook
+
+logger = logging.getLogger(__name__)
+
+# Settings that define the shared market data and so cannot vary per run
+DATA_KEYS = (
+    'trading.pairs',
+    'backtester.start_date',
+    'backtester.end_date',
+    'backtester.seed',
+    'data.source',
+    'data.store_path',
+    'data.timeframe',
+    'data.base_timeframe',
+    'executor.fill_timeframe',
+    'scenario.path',
+    'scenario.block_bars',
+    'scenario.volatility',
+    'scenario.vol_persistence',
+    'scenario.vol_of_vol',
+    'scenario.regimes',
+    'scenario.crashes_per_year',
+    'scenario.crash_depth',
+    'scenario.crash_recovery',
+    'scenario.recovery_bars',
+)
+
+# Per-run output files; each run of a sweep writes its own copy
+OUTPUT_KEYS = ('checkpoint.path', 'journal.path', 'metrics.path')
+
+# Worker process state, set once by _init_worker
+_worker_settings: Optional[Settings] = None
+_worker_panel: Optional[OHLCVPanel] = None
+_worker_shared_memory: List[shared_memory.SharedMemory] = []
+# Fine candles for intrabar fills, loaded by a worker's first run; their
+# range depends on the latency, so they are kept per executor.latency_ms
+_worker_intrabar: Dict[Any, IntrabarBook] = {}
+
+
+def grid_search(grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Expands a parameter grid into the list of runs.
+
+    Args:
+        grid: Dotted config keys mapped to the values to try.
+
+    Returns:
+        One parameter dict per combination.
+    """
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def random_search(
+    space: Dict[str, Union[Tuple[float, float], Sequence[Any]]],
+    n_runs: int,
+    seed: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Samples runs from a parameter space.
+
+    Args:
+        space: Dotted config keys mapped to either a (low, high) tuple,
+            sampled uniformly, or a list of values to choose from.
+        n_runs: Number of runs to draw.
+        seed: Seed for reproducible sampling.
+
+    Returns:
+        One parameter dict per run.
+    """
+    rng = np.random.default_rng(seed)
+    runs = []
+    for _ in range(n_runs):
+        params = {}
+        for key, values in space.items():
+            if isinstance(values, tuple):
+                params[key] = float(rng.uniform(*values))
+            else:
+                params[key] = values[int(rng.integers(len(values)))]
+        runs.append(params)
+    return runs
+
+
+def _init_worker(
+    base_settings: Settings,
+    symbols: List[str],
+    shape: Tuple[int, int],
+    timestamps_name: str,
+    bars_name: str
+) -> None:
+    """Maps the shared market data into a worker process."""
+    global _worker_settings, _worker_panel, _worker_shared_memory
+    # Runs report through their summaries; only problems are logged
+    setup_worker_logging('WARNING')
+    # Workers share the parent's resource tracker; the parent unlinks the blocks
+    timestamps_block = shared_memory.SharedMemory(name=timestamps_name)
+    bars_block = shared_memory.SharedMemory(name=bars_name)
+    _worker_shared_memory = [timestamps_block, bars_block]
+
+    timestamps = np.ndarray((shape[0],), dtype='datetime64[ns]', buffer=timestamps_block.buf)
+    bars = np.ndarray((5, *shape), dtype=np.float64, buffer=bars_block.buf)
+    bars.flags.writeable = False
+    _worker_settings = base_settings
+    _worker_panel = OHLCVPanel(timestamps, symbols, *bars)
+
+
+def _run_output_paths(settings: Settings, index: int) -> Dict[str, str]:
+    """The run's own output files: e.g. 'ck.pkl' becomes 'ck.run3.pkl' for run 3."""
+    paths = {}
+    for key in OUTPUT_KEYS:
+        value = settings.get(key)
+        if value:
+            path = Path(value)
+            paths[key] = str(path.with_name(f"{path.stem}.run{index}{path.suffix}"))
+    return paths
+
+
+def _run_backtest(task: Tuple[int, Dict[str, Any]]) -> Dict[str, Any]:
+    """Runs one backtest in a worker with an isolated configuration."""
+    index, params = task
+    settings = _worker_settings.replace(params)
+    # Outputs are suffixed per run, so concurrent runs never share a file
+    outputs = _run_output_paths(settings, index)
+    if outputs:
+        settings = settings.replace(outputs)
+    engine = settings.get('trading.engine', 'event')
+    backtester_cls = VectorizedBacktester if engine == 'vectorized' else Backtester
+    latency = settings.get('executor.latency_ms', 0)
+    backtester = backtester_cls(panel=_worker_panel, settings=settings, intrabar=_worker_intrabar.get(latency))
+    if backtester.order_executor.fill_simulator is not None:
+        _worker_intrabar[latency] = backtester.order_executor.fill_simulator.book
+    backtester.run()
+    return {**params, **backtester.summary()}
+
+
+class ParameterSweep:
+    """
+    Fans backtest runs out over a process pool and collects their metrics.
+    """
+
+    def __init__(
+        self,
+        config_path: Path,
+        runs: List[Dict[str, Any]],
+        max_workers: Optional[int] = None
+    ):
+        """
+        Initializes the sweep.
+
+        Args:
+            config_path: The base configuration file.
+            runs: Parameter dicts (dotted config keys), e.g. from grid_search.
+            max_workers: Worker processes; defaults to the CPU count.
+
+        Raises:
+            ValueError: If a run tries to change the shared market data, or
+                the configuration (with a run's parameters) is invalid.
+        """
+        self.settings = Settings.from_yaml(config_path)
+        for params in runs:
+            fixed = [key for key in params if key in DATA_KEYS]
+            if fixed:
+                raise ValueError(f"Parameters {fixed} define the shared market data and cannot vary per run")
+            # Fail before any worker starts
+            self.settings.replace(params)
+        self.runs = runs
+        self.max_workers = max_workers or os.cpu_count()
+
+    def _load_panel(self) -> OHLCVPanel:
+        """Produces the market data every run will replay."""
+        # Only the data collector is used; the loading backtester writes no outputs
+        settings = self.settings.replace({'checkpoint.path': None, 'journal.path': None, 'metrics.enabled': False})
+        return Backtester(settings=settings).data_collector.get_ohlcv_panel()
+
+    def run(self) -> pd.DataFrame:
+        """
+        Runs all backtests.
+
+        Returns:
+            A DataFrame with one row per run: its parameters and summary metrics.
+        """
+        panel = self._load_panel()
+        n_steps, n_symbols = panel.close.shape
+        logger.info("ParameterSweep: %d runs over %d bars x %d symbols on %s workers.",
+                    len(self.runs), n_steps, n_symbols, self.max_workers)
+
+        timestamps_block = shared_memory.SharedMemory(create=True, size=max(panel.timestamps.nbytes, 1))
+        bars_block = shared_memory.SharedMemory(create=True, size=max(5 * panel.close.nbytes, 1))
+        try:
+            np.ndarray(panel.timestamps.shape, dtype='datetime64[ns]', buffer=timestamps_block.buf)[:] = panel.timestamps
+            bars = np.ndarray((5, n_steps, n_symbols), dtype=np.float64, buffer=bars_block.buf)
+            for i, field in enumerate(panel[2:]):
+                bars[i] = field
+            del bars
+
+            context = multiprocessing.get_context()
+            if context.get_start_method() == 'forkserver':
+                # Pay the numpy/pandas imports once, not once per worker
+                context.set_forkserver_preload(['src.backtester.parameter_sweep'])
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self.settings, panel.symbols, (n_steps, n_symbols),
+                          timestamps_block.name, bars_block.name),
+            ) as pool:
+                results = list(pool.map(_run_backtest, enumerate(self.runs)))
+        finally:
+            timestamps_block.close()
+            timestamps_block.unlink()
+            bars_block.close()
+            bars_block.unlink()
+
+        logger.info("ParameterSweep: Finished.")
+        return pd.DataFrame(results)
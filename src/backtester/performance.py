@@ -0,0 +1,256 @@
+# src/backtester/performance.py
+"""
+Records a backtest's equity and fills, and computes its performance metrics.
+
+During the run, EquityRecorder writes one row per timestamp (cash, equity
+and gross exposure) and one row per fill into preallocated arrays that
+double when full, so recording is a few array assignments. After the run,
+`performance_report` derives every metric in vectorized passes: Sharpe
+and Sortino ratios, max drawdown and its duration, hit rate over round
+trips, exposure, turnover, fees and per-symbol PnL attribution.
+
+Both backtest engines record the same values with the same arithmetic,
+so their reports agree exactly.
+"""
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Sequence
+
+# A position smaller than this (in units of the asset) counts as flat
+FLAT_QUANTITY = 1e-12
+
+
+class EquityRecorder:
+    """
+    Per-timestamp equity and per-fill records of one run.
+
+    Usage:
+        recorder = EquityRecorder(symbols, capacity=n_bars)
+        recorder.record_fill(j, signed_notional, commission, position)
+        recorder.record_bar(timestamp_ns, cash, equity, exposure)
+    """
+
+    BAR_FIELDS = (('timestamp', np.int64), ('cash', np.float64), ('equity', np.float64), ('exposure', np.float64))
+    FILL_FIELDS = (('bar', np.int64), ('symbol', np.int32), ('notional', np.float64),
+                   ('commission', np.float64), ('position', np.float64))
+
+    def __init__(self, symbols: Sequence[str], capacity: int = 1024):
+        """
+        Initializes the recorder.
+
+        Args:
+            symbols: The traded symbols; fills refer to them by index.
+            capacity: Expected number of timestamps; the arrays grow past it.
+        """
+        self.symbols = list(symbols)
+        capacity = max(int(capacity), 1)
+        self._bars = {name: np.zeros(capacity, dtype=dtype) for name, dtype in self.BAR_FIELDS}
+        self._fills = {name: np.zeros(capacity, dtype=dtype) for name, dtype in self.FILL_FIELDS}
+        self.n_bars = 0
+        self.n_fills = 0
+
+    @staticmethod
+    def _reserve(arrays: Dict[str, np.ndarray], used: int, needed: int):
+        """Doubles the arrays until `needed` rows fit."""
+        capacity = len(next(iter(arrays.values())))
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name, values in arrays.items():
+            grown = np.zeros(capacity, dtype=values.dtype)
+            grown[:used] = values[:used]
+            arrays[name] = grown
+
+    def record_fill(self, j: int, notional: float, commission: float, position: float):
+        """
+        Records a fill of the timestamp being processed.
+
+        Args:
+            j: Symbol index.
+            notional: Signed traded value, quantity times price (negative for sells).
+            commission: Commission paid.
+            position: The symbol's position after the fill.
+        """
+        n = self.n_fills
+        fills = self._fills
+        if n == len(fills['bar']):
+            self._reserve(fills, n, n + 1)
+        fills['bar'][n] = self.n_bars
+        fills['symbol'][n] = j
+        fills['notional'][n] = notional
+        fills['commission'][n] = commission
+        fills['position'][n] = position
+        self.n_fills = n + 1
+
+    def record_bar(self, timestamp_ns: int, cash: float, equity: float, exposure: float):
+        """
+        Closes a timestamp with the portfolio's end-of-bar values.
+
+        Args:
+            timestamp_ns: Bar time, ns since epoch.
+            cash: Cash after the bar's fills.
+            equity: Cash plus positions marked to market.
+            exposure: Gross value of the positions.
+        """
+        n = self.n_bars
+        bars = self._bars
+        if n == len(bars['timestamp']):
+            self._reserve(bars, n, n + 1)
+        bars['timestamp'][n] = timestamp_ns
+        bars['cash'][n] = cash
+        bars['equity'][n] = equity
+        bars['exposure'][n] = exposure
+        self.n_bars = n + 1
+
+    def record_panel(
+        self,
+        timestamps: np.ndarray,
+        cash: np.ndarray,
+        positions: np.ndarray,
+        marks: np.ndarray,
+        fills: np.ndarray,
+        prices: np.ndarray,
+        commissions: np.ndarray
+    ):
+        """
+        Records a (time x symbol) panel at once, e.g. from the vectorized engine.
+
+        Args:
+            timestamps: Bar times, shape (T,), datetime64.
+            cash: Cash after each bar, shape (T,).
+            positions: Positions after each bar, shape (T, N).
+            marks: Prices the positions are marked at, shape (T, N).
+            fills: Signed filled quantities, shape (T, N).
+            prices: Fill prices, shape (T, N).
+            commissions: Commissions paid, shape (T, N).
+        """
+        values = positions * marks
+        n, length = self.n_bars, len(timestamps)
+        self._reserve(self._bars, n, n + length)
+        rows = slice(n, n + length)
+        self._bars['timestamp'][rows] = timestamps.astype('datetime64[ns]').astype(np.int64)
+        self._bars['cash'][rows] = cash
+        self._bars['equity'][rows] = cash + values.sum(axis=1)
+        self._bars['exposure'][rows] = np.abs(values).sum(axis=1)
+
+        # Execution order: by bar, sells before buys, then by symbol
+        t, j = np.nonzero(fills)
+        order = np.lexsort((j, fills[t, j] > 0, t))
+        t, j = t[order], j[order]
+        m = self.n_fills
+        self._reserve(self._fills, m, m + len(t))
+        rows = slice(m, m + len(t))
+        self._fills['bar'][rows] = n + t
+        self._fills['symbol'][rows] = j
+        self._fills['notional'][rows] = fills[t, j] * prices[t, j]
+        self._fills['commission'][rows] = commissions[t, j]
+        self._fills['position'][rows] = positions[t, j]
+        self.n_bars += length
+        self.n_fills += len(t)
+
+    @property
+    def bars(self) -> Dict[str, np.ndarray]:
+        """The recorded timestamps as views: timestamp, cash, equity, exposure."""
+        return {name: values[:self.n_bars] for name, values in self._bars.items()}
+
+    @property
+    def fills(self) -> Dict[str, np.ndarray]:
+        """The recorded fills as views: bar, symbol, notional, commission, position."""
+        return {name: values[:self.n_fills] for name, values in self._fills.items()}
+
+    def get_state(self) -> Dict[str, Any]:
+        """The records so far, for checkpoints."""
+        return {'bars': {name: values.copy() for name, values in self.bars.items()},
+                'fills': {name: values.copy() for name, values in self.fills.items()}}
+
+    def set_state(self, state: Dict[str, Any]):
+        """Continues from records captured by get_state."""
+        self.n_bars = len(state['bars']['timestamp'])
+        self.n_fills = len(state['fills']['bar'])
+        self._reserve(self._bars, 0, self.n_bars)
+        self._reserve(self._fills, 0, self.n_fills)
+        for name, values in state['bars'].items():
+            self._bars[name][:self.n_bars] = values
+        for name, values in state['fills'].items():
+            self._fills[name][:self.n_fills] = values
+
+
+def performance_report(
+    recorder: EquityRecorder,
+    initial_capital: float,
+    bar_interval: pd.Timedelta,
+    positions: np.ndarray,
+    marks: np.ndarray
+) -> Dict[str, Any]:
+    """
+    Computes a run's performance metrics from its records.
+
+    Returns are per bar, against the previous bar's equity (the first bar
+    against initial_capital), and annualized over 365 days; the risk-free
+    rate is taken as zero. A round trip runs from opening a position on a
+    flat symbol until it is flat again; its PnL includes commissions.
+
+    Args:
+        recorder: The run's records.
+        initial_capital: Equity before the first bar.
+        bar_interval: Length of a bar.
+        positions: Final positions, shape (N,).
+        marks: Final prices the positions are marked at, shape (N,).
+
+    Returns:
+        Scalar metrics, plus 'attribution': {symbol: {'pnl', 'fees', 'turnover'}}.
+    """
+    bars, fills = recorder.bars, recorder.fills
+    equity = np.concatenate([[float(initial_capital)], bars['equity']])
+    n_bars = len(equity) - 1
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = equity[1:] / equity[:-1] - 1
+        scale = np.sqrt(pd.Timedelta('365D') / bar_interval)
+        mean = returns.mean() if n_bars else np.nan
+        volatility = returns.std() if n_bars else np.nan
+        downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2)) if n_bars else np.nan
+        sharpe = mean / volatility * scale
+        sortino = mean / downside * scale
+
+        peak = np.maximum.accumulate(equity)
+        drawdown = 1 - equity / peak
+        exposure = np.mean(bars['exposure'] / bars['equity']) if n_bars else np.nan
+    # Bars under water between consecutive peaks, and after the last one
+    at_peak = np.flatnonzero(equity >= peak)
+    underwater = np.diff(np.append(at_peak, n_bars + 1)) - 1
+
+    symbol, notional, commission = fills['symbol'], fills['notional'], fills['commission']
+    cash_flow = -notional - commission
+    n_symbols = len(recorder.symbols)
+    fees = np.bincount(symbol, weights=commission, minlength=n_symbols)
+    turnover = np.bincount(symbol, weights=np.abs(notional), minlength=n_symbols)
+    # A symbol's PnL: its net cash flows plus what its final position is worth
+    flows = np.bincount(symbol, weights=cash_flow, minlength=n_symbols)
+    final_value = np.asarray(positions) * np.nan_to_num(np.asarray(marks, dtype=float))
+
+    trip_pnls = []
+    for j in range(n_symbols):
+        mine = symbol == j
+        closes = np.flatnonzero(np.abs(fills['position'][mine]) < FLAT_QUANTITY)
+        cumulative = np.cumsum(cash_flow[mine])
+        trip_pnls.append(np.diff(np.concatenate([[0.0], cumulative[closes]])))
+    trip_pnls = np.concatenate(trip_pnls) if trip_pnls else np.empty(0)
+
+    return {
+        'total_return': float(equity[-1] / equity[0] - 1),
+        'sharpe': float(sharpe),
+        'sortino': float(sortino),
+        'max_drawdown': float(drawdown.max()),
+        'max_drawdown_duration': bar_interval * int(underwater.max()),
+        'hit_rate': float(np.mean(trip_pnls > 0)) if len(trip_pnls) else np.nan,
+        'n_round_trips': len(trip_pnls),
+        'exposure': float(exposure),
+        'turnover': float(turnover.sum()),
+        'fees': float(fees.sum()),
+        'attribution': {
+            name: {'pnl': float(flows[j] + final_value[j]), 'fees': float(fees[j]), 'turnover': float(turnover[j])}
+            for j, name in enumerate(recorder.symbols)
+        },
+    }
@@ -0,0 +1,227 @@
+# src/backtester/vectorized_backtester.py
+"""
+Runs the whole backtest over (time x symbol) arrays instead of events.
+
+Intended for fast research: it reproduces the event-driven Backtester's
+trades on the same data, without building an event per bar and stage.
+
+Signal generation is vectorized across time. The risk covariance is a
+recursion advanced bar by bar (over all symbols at once), and the
+portfolio is a scan over the bars with signals, because every decision
+depends on the cash and positions the previous fills left. Within a bar
+the scan works on whole symbol vectors: rebalancing, fills, commissions
+and the cash and position updates are array operations, and the ledger
+between signal bars is carried forward without a loop. Only intrabar
+fills, where each buy is capped by the cash the fills before it left,
+go order by order. The results reproduce the event engine's arithmetic
+exactly.
+"""
+import logging
+import numpy as np
+import pandas as pd
+from contextlib import nullcontext
+from typing import Callable, Optional, Tuple
+from src.agents.portfolio_manager import rebalance_quantities
+from src.backtester.backtester import Backtester
+from src.executor.fill_simulator import FillSimulator
+
+logger = logging.getLogger(__name__)
+
+
+def _apply_fills(
+    t: int,
+    columns: np.ndarray,
+    quantities: np.ndarray,
+    fill_prices: np.ndarray,
+    cash: float,
+    positions: np.ndarray,
+    commission_rate: float,
+    fills: np.ndarray,
+    prices: np.ndarray,
+    commissions: np.ndarray
+) -> float:
+    """
+    Books bar t's fills into the ledger arrays in place and returns the cash left.
+
+    Cash changes are accumulated in execution order with np.add.accumulate,
+    which adds strictly left to right, so the result equals the event
+    engine's fill-by-fill updates bit for bit.
+    """
+    cost = np.abs(quantities) * fill_prices
+    commission = cost * commission_rate
+    cash_change = np.where(quantities > 0, -(cost + commission), cost - commission)
+    positions[columns] += quantities
+    fills[t, columns] = quantities
+    prices[t, columns] = fill_prices
+    commissions[t, columns] = commission
+    return float(np.add.accumulate(np.concatenate([[cash], cash_change]))[-1])
+
+
+def simulate_portfolio(
+    direction: np.ndarray,
+    size: Callable[[int, float, np.ndarray], np.ndarray],
+    close: np.ndarray,
+    cash: float,
+    positions: np.ndarray,
+    commission_rate: float,
+    timestamps: Optional[np.ndarray] = None,
+    fill_simulator: Optional[FillSimulator] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Applies PortfolioManager's rebalancing rules and simulated fills to a panel.
+
+    Cash is shared by all symbols and every decision depends on the fills
+    before it, so the bars are scanned in order. Only bars that carry a
+    buy or sell signal are visited; each one's target-weight vector is
+    rebalanced and its fills booked as array operations, in the order and
+    with the arithmetic of the event-driven components. With a fill
+    simulator the fills go one by one, since each buy's cap depends on
+    the cash left by the fills before it. The ledger between signal bars
+    is filled in with array operations.
+
+    Args:
+        direction: Signal directions (+1 buy, -1 sell, 0 hold), shape (T, N).
+        size: Returns bar t's risk-adjusted position sizes, shape (N,), given
+            the cash and positions before its trades; see
+            RiskManager.size_signals. Called once per bar with signals.
+        close: Close prices used as marks (and fill prices), shape (T, N).
+        cash: Starting cash in base currency.
+        positions: Starting asset quantities, shape (N,).
+        commission_rate: Commission as a fraction of the traded notional.
+        timestamps: Bar times, shape (T,), datetime64[ns]; needed with a
+            fill simulator.
+        fill_simulator: Intrabar fill model, symbols in column order; None
+            fills every order in full at the close.
+
+    Returns:
+        A tuple (orders, fills, prices, commissions, cash_path,
+        position_path) where orders holds the signed decided quantities
+        per bar and symbol, fills the signed filled quantities, prices
+        their fill prices, commissions the fees paid, and the paths the
+        cash (T,) and positions (T, N) after each bar.
+    """
+    orders = np.zeros(close.shape)
+    fills = np.zeros(close.shape)
+    prices = np.zeros(close.shape)
+    commissions = np.zeros(close.shape)
+    if fill_simulator is not None:
+        decision_ns = timestamps.astype('datetime64[ns]').astype(np.int64)
+    positions = np.array(positions, dtype=float)
+    signal_bars = np.flatnonzero(direction.any(axis=1))
+    # Ledger before the panel, then after each signal bar
+    cash_after = np.empty(len(signal_bars) + 1)
+    positions_after = np.empty((len(signal_bars) + 1, len(positions)))
+    cash_after[0], positions_after[0] = cash, positions
+
+    for i, t in enumerate(signal_bars.tolist(), start=1):
+        quantities = rebalance_quantities(direction[t], size(t, cash, positions), positions, close[t], cash, commission_rate)
+        orders[t] = quantities
+        # Sells first, then buys, as PortfolioManager.rebalance orders them
+        order = np.concatenate([np.flatnonzero(quantities < 0), np.flatnonzero(quantities > 0)])
+        if fill_simulator is None:
+            # Every order fills in full at the close: apply the bar's fills at once
+            cash = _apply_fills(t, order, quantities[order], close[t, order], cash, positions,
+                                commission_rate, fills, prices, commissions)
+        else:
+            for j in order.tolist():
+                action = 'buy' if quantities[j] > 0 else 'sell'
+                # Buys spend at most the cash left, as OrderExecutor.execute_batch allows them
+                quantity, price = fill_simulator.fill(
+                    j, int(decision_ns[t]), action, abs(float(quantities[j])), cash / (1 + commission_rate)
+                )
+                if quantity > 0:
+                    signed = np.array([quantity if action == 'buy' else -quantity])
+                    cash = _apply_fills(t, np.array([j]), signed, np.array([price]), cash, positions,
+                                        commission_rate, fills, prices, commissions)
+        cash_after[i], positions_after[i] = cash, positions
+
+    # Carry the ledger forward over the bars without signals
+    last = np.searchsorted(signal_bars, np.arange(len(close)), side='right')
+    return orders, fills, prices, commissions, cash_after[last], positions_after[last]
+
+
+class VectorizedBacktester(Backtester):
+    """
+    A backtest engine that processes the run in (time x symbol) array chunks.
+
+    Shares configuration and components with the event-driven Backtester,
+    so both engines start from the same data, model and portfolio.
+    """
+
+    def run(self):
+        """Runs the backtest simulation chunk by chunk over the OHLCV panel."""
+        logger.info("\n--- Starting Vectorized Backtest Run ---")
+
+        self.resume()
+        portfolio = self.portfolio_manager
+        cash, positions = portfolio.cash, portfolio.positions
+
+        metrics = self.metrics
+        chunks = self.data_collector.get_bar_chunks()
+        if metrics is not None:
+            metrics.start()
+            chunks = metrics.timed_batches('data', chunks, size=lambda chunk: chunk.close.size)
+        measure = metrics.measure if metrics is not None else lambda *args: nullcontext()
+
+        bars_since_checkpoint = 0
+        for chunk in chunks:
+            # 1-2. Signal generation for every bar at once; the risk limits
+            # depend on the positions held, so sizes, and the covariance
+            # updates behind them, come from the scan below
+            with measure('signal', chunk.close.size):
+                direction, strength = self.signal_agent.generate_signals(chunk)
+            with measure('risk', chunk.close.size):
+                size = self.risk_manager.size_signals(direction, strength, chunk.close)
+
+            # 3-4. Portfolio decisions and simulated fills
+            with measure('portfolio', chunk.close.size):
+                orders, fills, prices, commissions, cash_path, position_path = simulate_portfolio(
+                    direction,
+                    size,
+                    chunk.close,
+                    cash,
+                    positions,
+                    self.order_executor.commission_rate,
+                    chunk.timestamps,
+                    self.order_executor.fill_simulator,
+                )
+                size.finish()
+            cash, positions = float(cash_path[-1]), position_path[-1].copy()
+            portfolio.mark_to_market(chunk.close[-1])
+            if metrics is not None:
+                n_signals = int(np.count_nonzero(direction))
+                metrics.count('hold_signals', direction.size - n_signals)
+                metrics.count('no_decision', n_signals - int(np.count_nonzero(orders)))
+                unfilled = int(np.count_nonzero(orders[fills == 0]))
+                if unfilled:
+                    metrics.count('unfilled', unfilled)
+
+            # 5. Equity curve, marking every position to market on each bar
+            recorder = self.recorder
+            recorder.record_panel(chunk.timestamps, cash_path, position_path, chunk.close, fills, prices, commissions)
+            if self.journal is not None:
+                self.journal.record_panel(
+                    chunk.timestamps, chunk.symbols, orders, fills, prices, commissions, cash_path,
+                    recorder.bars['equity'][recorder.n_bars - len(chunk.timestamps):]
+                )
+            # Added fill by fill in execution order (per bar sells, then buys),
+            # so the total matches the event engine whatever the chunking
+            t, j = np.nonzero(fills)
+            order = np.lexsort((j, fills[t, j] > 0, t))
+            for commission in commissions[t[order], j[order]].tolist():
+                self.total_commission += commission
+            self.n_trades += int(np.count_nonzero(fills))
+
+            portfolio.cash, portfolio.positions = cash, positions
+            bars_since_checkpoint += len(chunk.timestamps)
+            if self.checkpoint_path and bars_since_checkpoint >= self.checkpoint_every:
+                self.save_checkpoint(pd.Timestamp(chunk.timestamps[-1], tz='UTC') + self.data_collector.bar_interval)
+                bars_since_checkpoint = 0
+
+        if self.checkpoint_path:
+            self.save_checkpoint(self.data_collector.current_dt)
+        self.equity_curve = self.recorder.bars['equity'].copy()
+
+        self.print_results()
+        self.dump_metrics()
+        self.close_journal()
@@ -2,40 +2,243 @@
 """
 Centralized configuration management for the CMF application.
 
-Loads settings from a YAML file and provides them as a singleton object.
+Settings are loaded from YAML into a `Settings` object that is validated
+once, frozen, and compiled into a flat table of every dotted key, so
+`get('risk.ewma_lambda')` is a single dict lookup. Sections can also be
+read as attributes (`settings.risk.ewma_lambda`).
+
+Settings can be passed explicitly, e.g. built once per sweep worker and
+derived per run with `replace`. The module-level `config` holds the
+process-wide active settings, read by code that is not handed any.
 """
-import yaml
+import logging
+from collections.abc import Mapping
+from datetime import date
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+_NUMBER = (int, float)
+_NONE = type(None)
+
+# Known settings: a tuple of accepted types, or a set of accepted values.
+# Keys not listed here are kept unchecked; missing keys fall back to the
+# defaults of the code reading them.
+SCHEMA: Dict[str, Any] = {
+    'trading.exchange': (str,),
+    'trading.pairs': (tuple,),
+    'trading.mode': {'backtest', 'live'},
+    'trading.engine': {'event', 'vectorized'},
+    'data.source': {'mock', 'store', 'scenario'},
+    'data.timeframe': (str,),
+    'data.base_timeframe': (str, _NONE),
+    'data.store_path': (str,),
+    'signal.model_path': (str, _NONE),
+    'signal.threshold': _NUMBER,
+    'risk.max_position_allocation': _NUMBER,
+    'risk.risk_tolerance': _NUMBER,
+    'risk.var_confidence': _NUMBER,
+    'risk.ewma_lambda': _NUMBER,
+    'risk.min_periods': (int,),
+    'risk.vol_target': (*_NUMBER, _NONE),
+    'risk.max_correlated_allocation': (*_NUMBER, _NONE),
+    'backtester.start_date': (str, date),
+    'backtester.end_date': (str, date),
+    'backtester.initial_capital': _NUMBER,
+    'backtester.base_currency': (str,),
+    'backtester.seed': (int, _NONE),
+    'backtester.chunk_size': (int,),
+    'live.base_url': (str, _NONE),
+    'live.timeframe': (str,),
+    'live.poll_delay': _NUMBER,
+    'live.queue_size': (int,),
+    'live.max_pending': (int,),
+    'live.dispatch': {'async', 'threaded'},
+    'live.max_connections': (int,),
+    'live.request_timeout': _NUMBER,
+    'live.duration': (*_NUMBER, _NONE),
+    'training.scheme': {'walk_forward', 'purged_kfold'},
+    'training.n_folds': (int,),
+    'training.horizon': (int,),
+    'training.embargo': (int,),
+    'training.train_size': (int, _NONE),
+    'training.n_jobs': (int,),
+    'training.block_rows': (int,),
+    'training.cache_max_mb': (*_NUMBER, _NONE),
+    'executor.commission_rate': _NUMBER,
+    'executor.requests_per_second': _NUMBER,
+    'executor.burst': (*_NUMBER, _NONE),
+    'executor.max_batch_size': (int,),
+    'executor.max_connections': (int,),
+    'executor.max_retries': (int,),
+    'executor.fill_timeframe': (str, _NONE),
+    'executor.latency_ms': _NUMBER,
+    'executor.max_participation': _NUMBER,
+    'executor.impact': _NUMBER,
+    'logging.level': (str,),
+    'logging.file': (str, _NONE),
+    'logging.console': (bool,),
+    'journal.path': (str, _NONE),
+    'journal.buffer_rows': (int,),
+    'metrics.enabled': (bool,),
+    'metrics.path': (str,),
+    'metrics.capacity': (int,),
+    'checkpoint.path': (str, _NONE),
+    'checkpoint.every_bars': (int,),
+    'checkpoint.resume': (bool,),
+    'scenario.path': (str,),
+    'scenario.n_workers': (int, _NONE),
+    'scenario.block_bars': (int,),
+    'scenario.volatility': (tuple,),
+    'scenario.vol_persistence': _NUMBER,
+    'scenario.vol_of_vol': _NUMBER,
+    'scenario.regimes': (tuple,),
+    'scenario.crashes_per_year': _NUMBER,
+    'scenario.crash_depth': (tuple,),
+    'scenario.crash_recovery': _NUMBER,
+    'scenario.recovery_bars': (int,),
+    'debug.validate_events': (bool,),
+}
+
+# Inclusive (low, high) bounds of numeric settings; None leaves a side open
+BOUNDS: Dict[str, tuple] = {
+    'risk.max_position_allocation': (0, 1),
+    'risk.risk_tolerance': (0, None),
+    'risk.var_confidence': (0, 1),
+    'risk.ewma_lambda': (0, 1),
+    'risk.min_periods': (1, None),
+    'backtester.initial_capital': (0, None),
+    'backtester.chunk_size': (1, None),
+    'training.cache_max_mb': (0, None),
+    'live.queue_size': (0, None),
+    'live.max_pending': (1, None),
+    'executor.commission_rate': (0, 1),
+    'executor.requests_per_second': (0, None),
+    'executor.max_batch_size': (1, None),
+    'executor.latency_ms': (0, None),
+    'executor.max_participation': (0, 1),
+    'executor.impact': (0, None),
+    'journal.buffer_rows': (1, None),
+    'metrics.capacity': (1, None),
+    'checkpoint.every_bars': (1, None),
+    'scenario.n_workers': (1, None),
+    'scenario.block_bars': (1, None),
+    'scenario.vol_persistence': (0, 0.999),
+    'scenario.vol_of_vol': (0, None),
+    'scenario.crashes_per_year': (0, None),
+    'scenario.crash_recovery': (0, 1),
+    'scenario.recovery_bars': (0, None),
+}
+
+
+def _freeze(value: Any) -> Any:
+    """Turns parsed YAML into read-only values: mappings to Settings, lists to tuples."""
+    if isinstance(value, Mapping):
+        return value if isinstance(value, Settings) else Settings(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Inverse of _freeze: plain dicts and lists."""
+    if isinstance(value, Settings):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
 
-class Config:
-    """A singleton class to hold application configuration."""
-    _instance = None
-    _config_data: Dict[str, Any] = {}
 
-    def __new__(cls, *args, **kwargs):
-        if not cls._instance:
-            cls._instance = super(Config, cls).__new__(cls, *args, **kwargs)
-        return cls._instance
+class Settings(Mapping):
+    """
+    A frozen, validated configuration tree.
 
-    def load_config(self, config_path: Path) -> None:
+    Every dotted key (sections included) is precompiled into one flat
+    dict, and each entry is also stored as an instance attribute, so both
+    lookups are plain dict accesses. Keys that clash with a method name
+    (e.g. 'items') are only reachable through `get` and `[]`. Instances
+    are immutable; `replace` derives a new one.
+
+    Usage:
+        settings = Settings.from_yaml(Path('src/core/config.yaml'))
+        settings.get('risk.ewma_lambda', 0.94)
+        settings.risk.ewma_lambda
+        run_settings = settings.replace({'risk.vol_target': 0.3})
+    """
+    def __init__(self, data: Optional[Mapping] = None):
         """
-        Loads configuration from a YAML file.
+        Freezes a (sub)tree of settings without validating it.
 
         Args:
-            config_path: The path to the configuration file.
+            data: Nested mappings as parsed from YAML.
         """
-        if not self._config_data:
-            try:
-                with open(config_path, 'r') as f:
-                    self._config_data = yaml.safe_load(f)
-                print(f"Configuration loaded successfully from {config_path}")
-            except FileNotFoundError:
-                print(f"Error: Configuration file not found at {config_path}")
-                raise
-            except yaml.YAMLError as e:
-                print(f"Error parsing YAML file: {e}")
-                raise
+        items = {key: _freeze(value) for key, value in (data or {}).items()}
+        flat = dict(items)
+        for key, value in items.items():
+            if isinstance(value, Settings):
+                flat.update((f'{key}.{sub_key}', leaf) for sub_key, leaf in value._flat.items())
+        attributes = self.__dict__
+        attributes.update(
+            (key, value) for key, value in items.items()
+            if isinstance(key, str) and key.isidentifier() and not hasattr(Settings, key)
+        )
+        attributes['_data'] = items
+        attributes['_flat'] = flat
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> 'Settings':
+        """
+        Builds validated settings from parsed data.
+
+        Raises:
+            ValueError: If a known setting has the wrong type or value.
+        """
+        settings = cls(data)
+        settings.validate()
+        return settings
+
+    @classmethod
+    def from_yaml(cls, path: Path) -> 'Settings':
+        """
+        Loads and validates a YAML configuration file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            yaml.YAMLError: If the file is not valid YAML.
+            ValueError: If a known setting has the wrong type or value.
+        """
+        import yaml
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        with open(path, 'r') as f:
+            return cls.from_dict(yaml.load(f, Loader=loader) or {})
+
+    def validate(self):
+        """
+        Checks the known settings against SCHEMA and BOUNDS.
+
+        Raises:
+            ValueError: Listing every invalid setting.
+        """
+        problems = []
+        for key, expected in SCHEMA.items():
+            if key not in self._flat:
+                continue
+            value = self._flat[key]
+            if isinstance(expected, set):
+                if value not in expected:
+                    problems.append(f"{key}: expected one of {sorted(expected)}, got {value!r}")
+                continue
+            # bool is an int subclass, but True is not a valid count or rate
+            if not isinstance(value, expected) or (isinstance(value, bool) and bool not in expected):
+                names = ', '.join('null' if kind is _NONE else kind.__name__ for kind in expected)
+                problems.append(f"{key}: expected {names}, got {value!r}")
+                continue
+            low, high = BOUNDS.get(key, (None, None))
+            if value is not None and ((low is not None and value < low) or (high is not None and value > high)):
+                problems.append(f"{key}: {value!r} is outside [{low}, {high}]")
+        if problems:
+            raise ValueError("Invalid configuration:\n  " + "\n  ".join(problems))
 
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -46,16 +249,141 @@ class Config:
             default: The default value to return if the key is not found.
 
         Returns:
-            The configuration value.
+            The configuration value; sections are Settings, lists are tuples.
+        """
+        return self._flat.get(key, default)
+
+    def replace(self, overrides: Mapping[str, Any]) -> 'Settings':
+        """
+        Derives validated settings with some values changed.
+
+        Args:
+            overrides: Dotted keys mapped to their new values.
+
+        Returns:
+            A new Settings; this one is unchanged.
         """
-        keys = key.split('.')
-        value = self._config_data
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-        return value
+        data = self.to_dict()
+        for key, value in overrides.items():
+            section = data
+            *parents, leaf = key.split('.')
+            for part in parents:
+                section = section.setdefault(part, {})
+            section[leaf] = value
+        return Settings.from_dict(data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """A mutable deep copy as plain dicts and lists."""
+        return _thaw(self)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(f"No setting '{name}'") from None
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("Settings are read-only; use replace()")
+
+    def __delattr__(self, name: str):
+        raise AttributeError("Settings are read-only; use replace()")
+
+    def __getitem__(self, key: str) -> Any:
+        return self._flat[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __reduce__(self):
+        return (Settings, (self.to_dict(),))
+
+    def __repr__(self) -> str:
+        return f"Settings({self.to_dict()!r})"
+
+
+class Config:
+    """
+    Holds the process-wide active Settings.
+
+    Loading replaces the active settings as a whole; Settings handed out
+    earlier stay as they were.
+    """
+
+    def __init__(self):
+        self.use(Settings())
+
+    @property
+    def settings(self) -> Settings:
+        """The active settings."""
+        return self._settings
+
+    def use(self, settings: Settings) -> Settings:
+        """
+        Makes already built settings the active ones.
+
+        Args:
+            settings: The settings to activate.
+
+        Returns:
+            The same settings.
+        """
+        self._settings = settings
+        # Bound once, so config.get is the compiled lookup itself
+        self.get = settings.get
+        return settings
+
+    def load_config(self, config_path: Path) -> Settings:
+        """
+        Loads configuration from a YAML file and makes it active.
+
+        Args:
+            config_path: The path to the configuration file.
+
+        Returns:
+            The loaded settings.
+        """
+        import yaml
+        try:
+            settings = Settings.from_yaml(config_path)
+        except FileNotFoundError:
+            logger.error("Error: Configuration file not found at %s", config_path)
+            raise
+        except yaml.YAMLError as e:
+            logger.error("Error parsing YAML file: %s", e)
+            raise
+        except ValueError as e:
+            logger.error("Error in configuration file %s: %s", config_path, e)
+            raise
+        logger.info("Configuration loaded successfully from %s", config_path)
+        return self.use(settings)
+
+    def load_dict(self, config_data: Mapping) -> Settings:
+        """
+        Replaces the configuration with already parsed settings.
+
+        Used where one process runs several isolated configurations in turn,
+        such as benchmarks.
+
+        Args:
+            config_data: The full configuration as nested dicts.
+
+        Returns:
+            The validated settings.
+        """
+        return self.use(Settings.from_dict(config_data))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Retrieves a value of the active settings (see Settings.get)."""
+        return self._settings.get(key, default)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._settings, name)
+
 
 # Create a single instance of the config to be used across the application
 config = Config()
@@ -63,4 +391,5 @@ config = Config()
 # Usage:
 # from src.core.config import config
 # config.load_config(Path('configs/config.yaml'))
-# api_key = config.get('api.binance.api_key')
\ No newline at end of file
+# api_key = config.get('api.binance.api_key')
+# commission_rate = config.executor.commission_rate
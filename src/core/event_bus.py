@@ -0,0 +1,427 @@
+# src/core/event_bus.py
+"""
+Routes events between the pipeline stages.
+
+Agents subscribe handlers for the event types in `events.py` under a
+stage name; every stage has its own queue. Published events are grouped
+into micro-batches of one type and timestamp, and a handler receives a
+whole batch and returns (or yields) the events it produces, which are
+published in turn.
+
+Dispatch modes:
+    'sync'      publish() runs the pipeline to completion before returning,
+                upstream stages first. Deterministic; used by backtests.
+    'threaded'  one worker thread per stage; stages overlap across
+                timestamps. External publishers block while a target
+                queue holds `queue_size` batches (backpressure).
+    'async'     one asyncio task per stage; coroutine and async-generator
+                handlers are awaited on the loop, plain functions run in a
+                worker thread so they do not stall I/O.
+
+With a PipelineMetrics instance the bus times every handler call and
+counts the events it consumes and produces.
+
+Threaded and async dispatch keep each stage's events in publication
+order, but not the relative order of events reaching a stage from
+different publishers. A handler that raises is logged at once; the
+events of its batch go no further down the pipeline, and the error is
+re-raised by join/stop.
+"""
+import inspect
+import logging
+import threading
+import time
+from collections import deque
+from itertools import groupby
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple, Type
+from src.core.events import Event
+from src.core.instrumentation import PipelineMetrics
+
+if TYPE_CHECKING:
+    import asyncio
+
+logger = logging.getLogger(__name__)
+
+# A handler takes one micro-batch and returns None, an event, a list of
+# events, or (async) an awaitable or async generator of those
+Handler = Callable[[List[Event]], Any]
+Batch = Tuple[Type[Event], List[Event]]
+
+DISPATCH_MODES = ('sync', 'threaded', 'async')
+
+
+class Stage:
+    """A pipeline stage: its handlers per event type and its queue of batches."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.handlers: Dict[Type[Event], Handler] = {}
+        self.queue: Deque[Batch] = deque()
+        self.batches_dispatched = 0
+        self.events_dispatched = 0
+
+
+def _as_events(result: Any) -> List[Event]:
+    """Normalizes a handler's return value to a list of events."""
+    if result is None:
+        return []
+    if isinstance(result, Event):
+        return [result]
+    return list(result)
+
+
+class EventBus:
+    """
+    Per-stage event queues with pluggable dispatch.
+
+    Usage (sync):
+        bus = EventBus()
+        bus.subscribe(MarketDataEvent, signal_agent.process_market_batch, stage='signal')
+        bus.subscribe(SignalEvent, risk_manager.assess_batch, stage='risk')
+        bus.publish(market_events)
+    """
+
+    def __init__(
+        self,
+        mode: str = 'sync',
+        queue_size: int = 0,
+        micro_batch: bool = True,
+        metrics: Optional[PipelineMetrics] = None
+    ):
+        """
+        Initializes an empty bus.
+
+        Args:
+            mode: 'sync', 'threaded' or 'async'.
+            queue_size: Batches a stage queue may hold before external
+                publishers wait; 0 is unbounded. Stages publishing to
+                each other never wait, so feedback loops cannot deadlock.
+            micro_batch: Group events of one type and timestamp into a
+                single handler call; otherwise every event is its own batch.
+            metrics: Records handler timings and event counts; None
+                (the default) disables instrumentation.
+        """
+        if mode not in DISPATCH_MODES:
+            raise ValueError(f"Dispatch mode must be one of {DISPATCH_MODES}")
+        self.mode = mode
+        self.queue_size = queue_size
+        self.micro_batch = micro_batch
+        self.metrics = metrics
+        self.stages: Dict[str, Stage] = {}
+        self._routes: Dict[Type[Event], List[Stage]] = {}
+        self._dispatching = False
+        # Threaded dispatch
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        self._threads: List[threading.Thread] = []
+        self._loop: Optional['asyncio.AbstractEventLoop'] = None
+        # Async dispatch
+        self._async_condition: Optional['asyncio.Condition'] = None
+        self._tasks: List['asyncio.Task'] = []
+        # Shared by both concurrent modes
+        self._pending = 0
+        self._stopping = False
+        self._errors: List[BaseException] = []
+
+    def subscribe(self, event_type: Type[Event], handler: Handler, stage: Optional[str] = None):
+        """
+        Registers a handler for an event type.
+
+        Stages are dispatched in the order they were first subscribed, so
+        subscribe upstream stages first.
+
+        Args:
+            event_type: The event class to receive.
+            handler: Called with each micro-batch of that type.
+            stage: Stage (queue) name; defaults to the handler's name.
+
+        Raises:
+            ValueError: If the stage already handles this event type.
+        """
+        name = stage or getattr(handler, '__qualname__', repr(handler))
+        target = self.stages.setdefault(name, Stage(name))
+        if event_type in target.handlers:
+            raise ValueError(f"Stage '{name}' already handles {event_type.__name__}")
+        target.handlers[event_type] = handler
+        self._routes.setdefault(event_type, []).append(target)
+
+    def _batches(self, events: Iterable[Event]) -> Iterable[Batch]:
+        """Splits events into micro-batches of one type and timestamp."""
+        if not self.micro_batch:
+            return ((type(event), [event]) for event in events)
+        return (
+            (key[0], list(group))
+            for key, group in groupby(events, key=lambda event: (type(event), event.timestamp))
+        )
+
+    @staticmethod
+    def _pop_batch(stage: Stage) -> Tuple[Type[Event], List[Event], int]:
+        """Pops the head batch, merged with queued batches of the same type and timestamp."""
+        event_type, batch = stage.queue.popleft()
+        merged = 1
+        while (
+            stage.queue and stage.queue[0][0] is event_type
+            and stage.queue[0][1][0].timestamp == batch[0].timestamp
+        ):
+            batch = batch + stage.queue.popleft()[1]
+            merged += 1
+        stage.batches_dispatched += 1
+        stage.events_dispatched += len(batch)
+        return event_type, batch, merged
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Returns the batches and events each stage has dispatched."""
+        return {
+            name: {'batches': stage.batches_dispatched, 'events': stage.events_dispatched}
+            for name, stage in self.stages.items()
+        }
+
+    # --- Sync and threaded dispatch ---
+
+    def publish(self, events: Iterable[Event]):
+        """
+        Publishes events to the subscribed stages.
+
+        In sync mode this dispatches them, and everything they produce,
+        before returning. In threaded mode it queues them, waiting while a
+        target queue is full.
+
+        Args:
+            events: Events to route, e.g. one timestamp's market data.
+        """
+        if self.mode == 'async':
+            raise RuntimeError("Use publish_async with an async bus")
+        if self.mode == 'sync':
+            for event_type, batch in self._batches(events):
+                for stage in self._routes.get(event_type, ()):
+                    stage.queue.append((event_type, batch))
+            if not self._dispatching:
+                self._drain()
+            return
+
+        external = not getattr(self._local, 'in_worker', False)
+        with self._condition:
+            for event_type, batch in self._batches(events):
+                for stage in self._routes.get(event_type, ()):
+                    while external and self.queue_size and len(stage.queue) >= self.queue_size:
+                        self._condition.wait()
+                    stage.queue.append((event_type, batch))
+                    self._pending += 1
+            self._condition.notify_all()
+
+    def _drain(self):
+        """Sync dispatch: runs the most upstream non-empty stage until all queues are empty."""
+        self._dispatching = True
+        try:
+            stages = list(self.stages.values())
+            while True:
+                stage = next((stage for stage in stages if stage.queue), None)
+                if stage is None:
+                    return
+                event_type, batch, _ = self._pop_batch(stage)
+                start = time.perf_counter() if self.metrics is not None else 0.0
+                result = stage.handlers[event_type](batch)
+                if inspect.isawaitable(result) or inspect.isasyncgen(result):
+                    raise TypeError(f"Stage '{stage.name}' returned a coroutine; use an async bus")
+                events = _as_events(result)
+                if self.metrics is not None:
+                    self.metrics.record(stage.name, event_type, len(batch), len(events), time.perf_counter() - start)
+                self.publish(events)
+        finally:
+            self._dispatching = False
+
+    def start(self, loop: Optional['asyncio.AbstractEventLoop'] = None):
+        """
+        Starts one worker thread per stage (threaded mode).
+
+        Args:
+            loop: Event loop on which coroutine or async-generator handlers
+                are run; required only if there are such handlers.
+        """
+        if self.mode != 'threaded':
+            raise RuntimeError("start() is for threaded buses; use start_async for async ones")
+        self._loop = loop
+        self._stopping = False
+        for stage in self.stages.values():
+            thread = threading.Thread(target=self._worker, args=(stage,), name=f"bus-{stage.name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _worker(self, stage: Stage):
+        """Threaded dispatch loop of one stage."""
+        self._local.in_worker = True
+        while True:
+            with self._condition:
+                while not stage.queue and not self._stopping:
+                    self._condition.wait()
+                if not stage.queue:
+                    return
+                event_type, batch, merged = self._pop_batch(stage)
+                self._condition.notify_all()
+            try:
+                start = time.perf_counter() if self.metrics is not None else 0.0
+                result = stage.handlers[event_type](batch)
+                if inspect.isasyncgen(result):
+                    result = self._run_on_loop(self._collect(result))
+                elif inspect.isawaitable(result):
+                    result = self._run_on_loop(result)
+                events = _as_events(result)
+                if self.metrics is not None:
+                    self.metrics.record(stage.name, event_type, len(batch), len(events), time.perf_counter() - start)
+                self.publish(events)
+            except BaseException as e:
+                # Nothing was published for the batch, so later stages never see it
+                logger.exception("EventBus: Stage '%s' failed on %d %s events; they are dropped.",
+                                 stage.name, len(batch), event_type.__name__)
+                self._errors.append(e)
+            finally:
+                with self._condition:
+                    self._pending -= merged
+                    self._condition.notify_all()
+
+    def _run_on_loop(self, coroutine) -> Any:
+        """Runs a coroutine on the bus's event loop from a worker thread."""
+        if self._loop is None:
+            coroutine.close()
+            raise TypeError("Coroutine handlers on a threaded bus need start(loop=...)")
+        import asyncio
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    @staticmethod
+    async def _collect(generator) -> List[Event]:
+        """Collects an async generator's events."""
+        return [event async for event in generator]
+
+    def join(self):
+        """
+        Waits until every queued batch has been handled (threaded mode).
+
+        Raises:
+            The first exception raised by a handler, if any.
+        """
+        with self._condition:
+            while self._pending and not self._errors:
+                self._condition.wait()
+        if self._errors:
+            raise self._errors[0]
+
+    def stop(self):
+        """Handles the remaining batches, then stops the worker threads."""
+        try:
+            self.join()
+        finally:
+            with self._condition:
+                self._stopping = True
+                self._condition.notify_all()
+            for thread in self._threads:
+                thread.join()
+            self._threads = []
+
+    # --- Async dispatch ---
+
+    async def start_async(self):
+        """Starts one dispatch task per stage (async mode)."""
+        if self.mode != 'async':
+            raise RuntimeError("start_async() is for async buses")
+        # asyncio is imported by the async mode only, keeping sync startup light
+        import asyncio
+        self._async_condition = asyncio.Condition()
+        self._stopping = False
+        self._tasks = [asyncio.create_task(self._async_worker(stage)) for stage in self.stages.values()]
+
+    async def publish_async(self, events: Iterable[Event], external: bool = True):
+        """
+        Queues events for the subscribed stages (async mode).
+
+        Args:
+            events: Events to route.
+            external: Wait while a target queue is full; stage handlers
+                publish with external=False.
+        """
+        async with self._async_condition:
+            for event_type, batch in self._batches(events):
+                for stage in self._routes.get(event_type, ()):
+                    while external and self.queue_size and len(stage.queue) >= self.queue_size:
+                        await self._async_condition.wait()
+                    stage.queue.append((event_type, batch))
+                    self._pending += 1
+            self._async_condition.notify_all()
+
+    async def _async_worker(self, stage: Stage):
+        """Async dispatch loop of one stage."""
+        import asyncio
+        condition = self._async_condition
+        while True:
+            async with condition:
+                while not stage.queue and not self._stopping:
+                    await condition.wait()
+                if not stage.queue:
+                    return
+                event_type, batch, merged = self._pop_batch(stage)
+                condition.notify_all()
+            try:
+                start = time.perf_counter() if self.metrics is not None else 0.0
+                handler = stage.handlers[event_type]
+                if inspect.iscoroutinefunction(handler) or inspect.isasyncgenfunction(handler):
+                    result = handler(batch)
+                else:
+                    result = await asyncio.to_thread(handler, batch)
+                n_out = 0
+                if inspect.isasyncgen(result):
+                    # Publish each result as soon as it arrives
+                    async for event in result:
+                        await self.publish_async([event], external=False)
+                        n_out += 1
+                    result = None
+                elif inspect.isawaitable(result):
+                    result = await result
+                events = _as_events(result)
+                if self.metrics is not None:
+                    self.metrics.record(
+                        stage.name, event_type, len(batch), n_out + len(events), time.perf_counter() - start
+                    )
+                await self.publish_async(events, external=False)
+            except Exception as e:
+                # Nothing more is published for the batch, so later stages never see it
+                logger.exception("EventBus: Stage '%s' failed on %d %s events; they are dropped.",
+                                 stage.name, len(batch), event_type.__name__)
+                self._errors.append(e)
+            finally:
+                async with condition:
+                    self._pending -= merged
+                    condition.notify_all()
+
+    async def join_async(self):
+        """
+        Waits until every queued batch has been handled (async mode).
+
+        Raises:
+            The first exception raised by a handler, if any.
+        """
+        async with self._async_condition:
+            while self._pending and not self._errors:
+                await self._async_condition.wait()
+        if self._errors:
+            raise self._errors[0]
+
+    async def stop_async(self, drain: bool = True):
+        """
+        Stops the dispatch tasks.
+
+        Args:
+            drain: Handle the queued batches first; otherwise cancel them.
+        """
+        import asyncio
+        try:
+            if drain:
+                await self.join_async()
+        finally:
+            if drain:
+                async with self._async_condition:
+                    self._stopping = True
+                    self._async_condition.notify_all()
+            else:
+                for task in self._tasks:
+                    task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
@@ -1,12 +1,18 @@
 # src/core/events.py
 """
-Defines the event-driven architecture's core data structures using Pydantic.
+Defines the event-driven architecture's core data structures.
 
 These events are passed between different components of the system.
+They are slotted dataclasses, so building one on the hot path is cheap.
+Full Pydantic validation runs only where data enters the system (see
+`parse_event`) or on every event when validation is switched on for
+debugging (`set_event_validation` or CMF_VALIDATE_EVENTS=1).
 """
+import os
+from dataclasses import dataclass, fields
 from datetime import datetime
-from pydantic import BaseModel
-from typing import Literal, Dict
+from functools import lru_cache
+from typing import Any, Dict, Literal, Type, TypeVar
 
 # Event Types:
 # 1. MarketDataEvent: Raw market data from the exchange.
@@ -24,7 +30,22 @@ from typing import Literal, Dict
 # 5. OrderExecutionEvent: The result of an executed order.
 #    order_executor -> (logging/portfolio update)
 
-class MarketDataEvent(BaseModel):
+_validate_all = os.environ.get('CMF_VALIDATE_EVENTS', '').lower() in ('1', 'true', 'yes')
+
+EventT = TypeVar('EventT', bound='Event')
+
+
+class Event:
+    """Base class for all events."""
+    __slots__ = ()
+
+    def __post_init__(self):
+        if _validate_all:
+            validate_event(self)
+
+
+@dataclass(slots=True)
+class MarketDataEvent(Event):
     """Event for new market data."""
     timestamp: datetime
     symbol: str  # e.g., 'BTC/USDT'
@@ -34,7 +55,9 @@ class MarketDataEvent(BaseModel):
     close: float
     volume: float
 
-class SignalEvent(BaseModel):
+
+@dataclass(slots=True)
+class SignalEvent(Event):
     """Event for a trading signal from the ML model."""
     timestamp: datetime
     symbol: str
@@ -43,7 +66,9 @@ class SignalEvent(BaseModel):
     # Strength of the signal (e.g., from 0.0 to 1.0)
     strength: float
 
-class RiskAdjustedSignalEvent(BaseModel):
+
+@dataclass(slots=True)
+class RiskAdjustedSignalEvent(Event):
     """
     Event for a signal that has been adjusted by the Risk Manager.
     The strength is now the suggested position size as a fraction of portfolio.
@@ -54,7 +79,9 @@ class RiskAdjustedSignalEvent(BaseModel):
     # e.g., 0.1 for 10% of portfolio
     adjusted_size: float
 
-class PortfolioDecisionEvent(BaseModel):
+
+@dataclass(slots=True)
+class PortfolioDecisionEvent(Event):
     """
     Event representing a final decision to place an order.
     """
@@ -65,7 +92,9 @@ class PortfolioDecisionEvent(BaseModel):
     # Quantity of the asset to trade
     quantity: float
 
-class OrderExecutionEvent(BaseModel):
+
+@dataclass(slots=True)
+class OrderExecutionEvent(Event):
     """Event representing the result of an order execution."""
     timestamp: datetime
     symbol: str
@@ -76,4 +105,61 @@ class OrderExecutionEvent(BaseModel):
     # Commission paid
     commission: float
     # 'filled', 'partially_filled', 'failed'
-    status: str
\ No newline at end of file
+    status: str
+
+
+def set_event_validation(enabled: bool) -> None:
+    """
+    Turns full validation of every constructed event on or off.
+
+    Args:
+        enabled: True to validate each event as it is built (debugging).
+    """
+    global _validate_all
+    _validate_all = enabled
+
+
+@lru_cache(maxsize=None)
+def _schema(event_type: type):
+    """Builds (once per type) the Pydantic model mirroring an event's fields."""
+    from pydantic import create_model
+    return create_model(
+        f'{event_type.__name__}Schema',
+        **{field.name: (field.type, ...) for field in fields(event_type)}
+    )
+
+
+def parse_event(event_type: Type[EventT], data: Dict[str, Any]) -> EventT:
+    """
+    Builds an event from untrusted input with full validation.
+
+    Use this at trust boundaries, e.g. for payloads received from an exchange.
+    Values are coerced where Pydantic allows it (ISO strings to datetimes,
+    numeric strings to floats) and Literal fields are enforced.
+
+    Args:
+        event_type: The event class to build.
+        data: The raw field values.
+
+    Returns:
+        A validated event instance.
+
+    Raises:
+        pydantic.ValidationError: If the data does not match the event schema.
+    """
+    validated = _schema(event_type).model_validate(data)
+    return event_type(**{field.name: getattr(validated, field.name) for field in fields(event_type)})
+
+
+def validate_event(event: Event) -> None:
+    """
+    Checks an already constructed event against its schema.
+
+    Args:
+        event: The event to check.
+
+    Raises:
+        pydantic.ValidationError: If a field has the wrong type or value.
+    """
+    data = {field.name: getattr(event, field.name) for field in fields(event)}
+    _schema(type(event)).model_validate(data)
@@ -0,0 +1,226 @@
+# src/core/instrumentation.py
+"""
+Latency and throughput instrumentation for the agent pipeline.
+
+A PipelineMetrics instance handed to the EventBus times every handler
+call and counts the events going in and out of it. Filter stages are
+registered by name so the events they drop (hold signals, signals
+without a decision, ...) are reported too. Without one the bus does not
+time anything, so a disabled run pays a single `is None` check per batch.
+"""
+import json
+import threading
+import time
+import numpy as np
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Type
+from src.core.config import Settings, config
+from src.core.events import Event
+
+
+class LatencyStats:
+    """
+    Keeps the most recent latency samples (in milliseconds) in a ring buffer.
+    """
+
+    def __init__(self, capacity: int = 100_000):
+        """
+        Initializes empty statistics.
+
+        Args:
+            capacity: Number of recent samples kept for the percentiles.
+        """
+        self._samples = np.empty(capacity)
+        self.count = 0
+
+    def record(self, latency_ms: float):
+        """Adds one sample."""
+        self._samples[self.count % len(self._samples)] = latency_ms
+        self.count += 1
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Summarizes the kept samples.
+
+        Returns:
+            Sample count, mean, p50, p99 and max in milliseconds.
+        """
+        samples = self._samples[:min(self.count, len(self._samples))]
+        if not len(samples):
+            return {'count': 0}
+        p50, p99 = np.percentile(samples, [50, 99])
+        return {
+            'count': self.count,
+            'mean_ms': float(samples.mean()),
+            'p50_ms': float(p50),
+            'p99_ms': float(p99),
+            'max_ms': float(samples.max()),
+        }
+
+
+class HandlerMetrics:
+    """Timings and event counts of one stage's handler for one event type."""
+
+    def __init__(self, capacity: int):
+        self.latency = LatencyStats(capacity)
+        self.batches = 0
+        self.events_in = 0
+        self.events_out = 0
+        self.busy_seconds = 0.0
+
+
+class PipelineMetrics:
+    """
+    Per-stage latency histograms, throughput and drop counters of one run.
+
+    Usage:
+        metrics = PipelineMetrics()
+        metrics.track_drops('hold_signals', 'signal', MarketDataEvent)
+        bus = EventBus(metrics=metrics)
+        ...
+        metrics.dump('reports/metrics.json')
+    """
+
+    def __init__(self, capacity: int = 10_000):
+        """
+        Initializes empty metrics; the wall clock starts now.
+
+        Args:
+            capacity: Latency samples kept per handler for the percentiles.
+        """
+        self.capacity = capacity
+        self.handlers: Dict[str, HandlerMetrics] = {}
+        self.counters: Dict[str, int] = {}
+        self._filters: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def start(self):
+        """Restarts the wall clock, e.g. once setup is done."""
+        self._started = time.perf_counter()
+
+    @classmethod
+    def from_config(cls, settings: Optional[Settings] = None) -> Optional['PipelineMetrics']:
+        """Returns metrics if metrics.enabled is set (in settings, else the active config), otherwise None."""
+        if settings is None:
+            settings = config.settings
+        if not settings.get('metrics.enabled', False):
+            return None
+        return cls(settings.get('metrics.capacity', 10_000))
+
+    @staticmethod
+    def _key(stage: str, event_type: Optional[Type[Event]]) -> str:
+        return stage if event_type is None else f"{stage}.{event_type.__name__}"
+
+    def record(self, stage: str, event_type: Optional[Type[Event]], n_in: int, n_out: int, seconds: float):
+        """
+        Records one handler call.
+
+        Args:
+            stage: Stage name.
+            event_type: Type of the batch handled; None for work outside the bus.
+            n_in: Events handled.
+            n_out: Events produced.
+            seconds: Time the call took.
+        """
+        key = self._key(stage, event_type)
+        with self._lock:
+            handler = self.handlers.get(key)
+            if handler is None:
+                handler = self.handlers[key] = HandlerMetrics(self.capacity)
+            handler.latency.record(seconds * 1000)
+            handler.batches += 1
+            handler.events_in += n_in
+            handler.events_out += n_out
+            handler.busy_seconds += seconds
+
+    def count(self, name: str, n: int = 1):
+        """Adds n dropped events to a named drop counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def track_drops(self, name: str, stage: str, event_type: Type[Event]):
+        """
+        Counts the events a filtering handler consumes without output as drops.
+
+        Args:
+            name: Drop counter name, e.g. 'hold_signals'.
+            stage: Stage of the handler.
+            event_type: Event type the handler filters.
+        """
+        self._filters[name] = self._key(stage, event_type)
+
+    @contextmanager
+    def measure(self, stage: str, n_in: int = 0):
+        """Times a block of work outside the bus as a stage."""
+        start = time.perf_counter()
+        yield
+        self.record(stage, None, n_in, 0, time.perf_counter() - start)
+
+    def timed_batches(self, stage: str, batches: Iterable[Any], size: Callable[[Any], int] = len) -> Iterator[Any]:
+        """
+        Times how long an iterator takes to produce each batch.
+
+        Args:
+            stage: Stage name to record under, e.g. 'data'.
+            batches: E.g. lists of one timestamp's market data events.
+            size: Returns the number of events in a batch.
+        """
+        iterator = iter(batches)
+        while True:
+            start = time.perf_counter()
+            try:
+                batch = next(iterator)
+            except StopIteration:
+                return
+            self.record(stage, None, 0, size(batch), time.perf_counter() - start)
+            yield batch
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarizes the run so far.
+
+        Returns:
+            Wall-clock seconds; per handler its latency percentiles, batch
+            and event counts, busy time and events per second (events
+            handled or produced over wall-clock time); and drop counts.
+        """
+        wall_seconds = time.perf_counter() - self._started
+        with self._lock:
+            stages = {}
+            for key, handler in self.handlers.items():
+                stages[key] = {
+                    **handler.latency.summary(),
+                    'batches': handler.batches,
+                    'events_in': handler.events_in,
+                    'events_out': handler.events_out,
+                    'busy_seconds': handler.busy_seconds,
+                    'events_per_sec': max(handler.events_in, handler.events_out) / wall_seconds,
+                }
+            drops = dict(self.counters)
+            for name, key in self._filters.items():
+                handler = self.handlers.get(key)
+                if handler is not None:
+                    drops[name] = drops.get(name, 0) + handler.events_in - handler.events_out
+            return {
+                'wall_seconds': wall_seconds,
+                'stages': stages,
+                'drops': drops,
+            }
+
+    def dump(self, path, **extra: Any) -> Path:
+        """
+        Writes the summary as JSON.
+
+        Args:
+            path: Output file; parent directories are created.
+            **extra: Additional top-level entries, e.g. the run's results.
+
+        Returns:
+            The path written.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({**self.summary(), **extra}, indent=2, default=str))
+        return path
@@ -0,0 +1,280 @@
+# src/core/journal.py
+"""
+Append-only binary journal of decisions, fills and equity snapshots.
+
+Records are fixed-size NumPy structured rows. They are collected in a
+preallocated buffer, and full buffers are written by a background thread,
+so recording a row on the hot path is an array assignment. The file
+starts with a magic header and can be appended to across runs;
+`read_journal` loads it back as a DataFrame.
+"""
+import os
+import queue
+import threading
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Sequence
+from src.core.events import OrderExecutionEvent, PortfolioDecisionEvent
+
+MAGIC = b'CMFJRN01'
+
+KINDS = ('decision', 'fill', 'equity')
+SIDES = {'buy': 1, 'sell': -1}
+STATUSES = ('', 'filled', 'partially_filled', 'failed')
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<i8'),  # ns since epoch (UTC)
+    ('kind', 'u1'),  # index into KINDS
+    ('side', 'i1'),  # +1 buy, -1 sell, 0 for equity rows
+    ('status', 'u1'),  # index into STATUSES
+    ('symbol', 'S20'),
+    ('quantity', '<f8'),
+    ('price', '<f8'),  # fill price; cash for equity rows
+    ('commission', '<f8'),
+    ('value', '<f8'),  # notional; total portfolio value for equity rows
+])
+
+
+def _ns(timestamp: datetime) -> int:
+    """Nanoseconds since epoch of a timezone-aware datetime."""
+    return pd.Timestamp(timestamp).value
+
+
+class TradeJournal:
+    """
+    Buffers journal rows and appends them to a file from a writer thread.
+
+    Usage:
+        journal = TradeJournal('reports/journal.bin')
+        journal.record_decisions(decision_events)
+        journal.record_fills(execution_events)
+        journal.record_equity(timestamp, cash, total_value)
+        journal.close()
+    """
+
+    def __init__(self, path, buffer_rows: int = 4096):
+        """
+        Opens (or creates) the journal file for appending.
+
+        Args:
+            path: Journal file.
+            buffer_rows: Rows collected before a buffer is handed to the writer.
+
+        Raises:
+            ValueError: If an existing file is not a journal.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists() and self.path.stat().st_size:
+            with open(self.path, 'rb') as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    raise ValueError(f"{self.path} is not a trade journal")
+        else:
+            self.path.write_bytes(MAGIC)
+        self.buffer_rows = buffer_rows
+        self._buffer = np.zeros(buffer_rows, dtype=RECORD_DTYPE)
+        self._n = 0
+        self._lock = threading.Lock()
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_loop, name='trade-journal', daemon=True)
+        self._writer.start()
+        self.rows_written = 0
+
+    def _write_loop(self):
+        """Appends buffers as they arrive; None stops the thread, an Event is set once reached."""
+        with open(self.path, 'ab') as f:
+            while True:
+                rows = self._queue.get()
+                if rows is None:
+                    return
+                if isinstance(rows, threading.Event):
+                    rows.set()
+                    continue
+                f.write(rows.tobytes())
+                f.flush()
+                self.rows_written += len(rows)
+
+    def _append(self, timestamp: int, kind: int, side: int, status: int, symbol: str,
+                quantity: float, price: float, commission: float, value: float):
+        """Adds one row, handing the buffer to the writer when full."""
+        with self._lock:
+            self._buffer[self._n] = (timestamp, kind, side, status, symbol.encode(), quantity, price, commission, value)
+            self._n += 1
+            if self._n == self.buffer_rows:
+                self._queue.put(self._buffer)
+                self._buffer = np.zeros(self.buffer_rows, dtype=RECORD_DTYPE)
+                self._n = 0
+
+    def record_decisions(self, decision_events: List[PortfolioDecisionEvent]):
+        """Journals the orders of one rebalance."""
+        for event in decision_events:
+            self._append(_ns(event.timestamp), 0, SIDES[event.action], 0, event.symbol, event.quantity, 0.0, 0.0, 0.0)
+
+    def record_fills(self, execution_events: List[OrderExecutionEvent]):
+        """Journals execution results, failed orders included."""
+        for event in execution_events:
+            self._append(
+                _ns(event.timestamp), 1, SIDES[event.action], STATUSES.index(event.status), event.symbol,
+                event.quantity, event.fill_price, event.commission, event.quantity * event.fill_price,
+            )
+
+    def _extend(self, rows: np.ndarray):
+        """Adds many rows at once."""
+        with self._lock:
+            while len(rows):
+                n = min(len(rows), self.buffer_rows - self._n)
+                self._buffer[self._n:self._n + n] = rows[:n]
+                self._n += n
+                rows = rows[n:]
+                if self._n == self.buffer_rows:
+                    self._queue.put(self._buffer)
+                    self._buffer = np.zeros(self.buffer_rows, dtype=RECORD_DTYPE)
+                    self._n = 0
+
+    @staticmethod
+    def _trade_panel_rows(
+        timestamps: np.ndarray,
+        symbols: Sequence[str],
+        orders: np.ndarray,
+        fills: np.ndarray,
+        prices: np.ndarray,
+        commissions: np.ndarray
+    ) -> np.ndarray:
+        """Decision and fill rows of a (time x symbol) panel, sells before buys, then by symbol."""
+        t, j = np.nonzero(orders)
+        order = np.lexsort((j, orders[t, j] > 0, t))
+        t, j = t[order], j[order]
+        ordered, filled = orders[t, j], fills[t, j]
+        rows = np.zeros(2 * len(t), dtype=RECORD_DTYPE)
+        decisions, executions = rows[:len(t)], rows[len(t):]
+        for part in (decisions, executions):
+            part['timestamp'] = timestamps.astype('datetime64[ns]').astype(np.int64)[t]
+            part['side'] = np.sign(ordered)
+            part['symbol'] = np.array(symbols, dtype='S20')[j]
+        decisions['quantity'] = np.abs(ordered)
+        executions['kind'] = 1
+        executions['status'] = np.select(
+            [filled == 0, np.abs(filled) < np.abs(ordered)],
+            [STATUSES.index('failed'), STATUSES.index('partially_filled')],
+            STATUSES.index('filled'),
+        )
+        executions['quantity'] = np.abs(filled)
+        executions['price'] = prices[t, j]
+        executions['commission'] = commissions[t, j]
+        executions['value'] = executions['quantity'] * executions['price']
+        return rows
+
+    @staticmethod
+    def _equity_panel_rows(timestamps: np.ndarray, cash: np.ndarray, total_value: np.ndarray) -> np.ndarray:
+        """One equity row per bar."""
+        rows = np.zeros(len(timestamps), dtype=RECORD_DTYPE)
+        rows['timestamp'] = timestamps.astype('datetime64[ns]').astype(np.int64)
+        rows['kind'] = 2
+        rows['price'] = cash
+        rows['value'] = total_value
+        return rows
+
+    def record_equity(self, timestamp, cash: float, total_value: float):
+        """Journals a portfolio snapshot (cash in `price`, total value in `value`)."""
+        self._append(_ns(timestamp), 2, 0, 0, '', 0.0, cash, 0.0, total_value)
+
+    def record_panel(
+        self,
+        timestamps: np.ndarray,
+        symbols: Sequence[str],
+        orders: np.ndarray,
+        fills: np.ndarray,
+        prices: np.ndarray,
+        commissions: np.ndarray,
+        cash: np.ndarray,
+        total_value: np.ndarray
+    ):
+        """
+        Journals a panel's decisions, fills and end-of-bar snapshots, bar by bar.
+
+        Each bar gets the rows an event-driven backtest journals for it, in
+        the same order: its decisions, their fills (failed ones included),
+        then its snapshot. The journal thus does not depend on the engine
+        or on how the run was split into panels.
+
+        Args:
+            timestamps: Bar times, shape (T,), datetime64.
+            symbols: Column symbols.
+            orders: Signed decided quantities, shape (T, N); 0 for no order.
+            fills: Signed filled quantities, shape (T, N).
+            prices: Fill prices, shape (T, N).
+            commissions: Commissions paid, shape (T, N).
+            cash: Cash after each bar, shape (T,).
+            total_value: Portfolio value after each bar, shape (T,).
+        """
+        rows = np.concatenate([
+            self._trade_panel_rows(timestamps, symbols, orders, fills, prices, commissions),
+            self._equity_panel_rows(timestamps, cash, total_value),
+        ])
+        # Stable, so each kind keeps its order within a bar
+        self._extend(rows[np.lexsort((rows['kind'], rows['timestamp']))])
+
+    def flush(self):
+        """Hands the rows collected so far to the writer."""
+        with self._lock:
+            if self._n:
+                self._queue.put(self._buffer[:self._n].copy())
+                self._n = 0
+
+    def sync(self) -> int:
+        """
+        Writes every collected row and waits until it is in the file.
+
+        Returns:
+            The journal's size in bytes, e.g. to truncate back to on resume.
+        """
+        self.flush()
+        written = threading.Event()
+        self._queue.put(written)
+        written.wait()
+        return self.path.stat().st_size
+
+    def truncate(self, size: int):
+        """Drops everything written after the journal was `size` bytes long."""
+        self.sync()
+        os.truncate(self.path, max(size, len(MAGIC)))
+
+    def close(self):
+        """Writes every collected row and stops the writer thread."""
+        self.flush()
+        self._queue.put(None)
+        self._writer.join()
+
+
+def read_journal(path, kind: Optional[str] = None) -> pd.DataFrame:
+    """
+    Loads a journal file.
+
+    Args:
+        path: Journal file written by TradeJournal.
+        kind: Only rows of this kind ('decision', 'fill' or 'equity').
+
+    Returns:
+        One row per record with columns timestamp (UTC), kind, side,
+        status, symbol, quantity, price, commission and value.
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a trade journal")
+        rows = np.fromfile(f, dtype=RECORD_DTYPE)
+    frame = pd.DataFrame({
+        'timestamp': pd.to_datetime(rows['timestamp'], utc=True),
+        'kind': pd.Categorical.from_codes(rows['kind'], KINDS),
+        'side': pd.Categorical.from_codes(np.select([rows['side'] > 0, rows['side'] < 0], [1, 2], 0), ['', 'buy', 'sell']),
+        'status': pd.Categorical.from_codes(rows['status'], STATUSES),
+        'symbol': rows['symbol'].astype(str),
+        'quantity': rows['quantity'],
+        'price': rows['price'],
+        'commission': rows['commission'],
+        'value': rows['value'],
+    })
+    if kind is not None:
+        frame = frame[frame['kind'] == kind].reset_index(drop=True)
+    return frame
@@ -0,0 +1,108 @@
+# src/core/logger.py
+"""
+Leveled logging for the CMF application.
+
+Modules log through `logging.getLogger(__name__)`; everything under the
+`src` package goes to one QueueHandler, and a QueueListener thread does
+the formatting and I/O, so a log call on the hot path only enqueues a
+record. Calls below the configured level return after a cached level
+check. Per-event messages (signals, sizes, decisions, fills) are logged
+at DEBUG.
+
+Usage:
+    from src.core.logger import setup_logging
+    setup_logging()  # after config.load_config(...)
+"""
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+from pathlib import Path
+from typing import List, Optional
+from src.core.config import config
+
+ROOT_LOGGER = 'src'
+CONSOLE_FORMAT = '%(message)s'
+FILE_FORMAT = '%(asctime)s %(levelname)-7s %(name)s: %(message)s'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(level: Optional[str] = None, path: Optional[str] = None) -> logging.Logger:
+    """
+    Routes the application's loggers through a background writer thread.
+
+    Calling it again replaces the previous setup.
+
+    Args:
+        level: Minimum level, e.g. 'DEBUG'; defaults to logging.level.
+        path: Log file to append to; defaults to logging.file (null logs
+            to the console only).
+
+    Returns:
+        The application's root logger.
+    """
+    global _listener
+    shutdown_logging()
+
+    level = (level or config.get('logging.level', 'INFO')).upper()
+    path = path or config.get('logging.file')
+    handlers: List[logging.Handler] = []
+    if config.get('logging.console', True):
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        handlers.append(console)
+    if path:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.FileHandler(path)
+        file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
+        handlers.append(file_handler)
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(level)
+    root.propagate = False
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    root.addHandler(logging.handlers.QueueHandler(records))
+
+    _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    return root
+
+
+def setup_worker_logging(level: str = 'WARNING'):
+    """
+    Logs straight to stderr in a worker process.
+
+    A forked worker inherits the parent's queue handler but not its
+    writer thread; this replaces it so records are not queued forever.
+
+    Args:
+        level: Minimum level logged by the worker.
+    """
+    global _listener
+    _listener = None
+    root = logging.getLogger(ROOT_LOGGER)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter(FILE_FORMAT))
+    root.addHandler(handler)
+    root.setLevel(level)
+    root.propagate = False
+
+
+def shutdown_logging():
+    """Writes out the queued records and stops the writer thread."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+atexit.register(shutdown_logging)
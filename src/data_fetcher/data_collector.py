@@ -2,64 +2,314 @@
 """
 Collects market data.
 
-For this prototype, it generates mock data. In a real-world scenario,
-this module would connect to a cryptocurrency exchange API (e.g., Binance).
+For this prototype, it generates mock data or replays candles kept in the
+local OHLCVStore. In a real-world scenario, the store would be filled from
+a cryptocurrency exchange API (e.g., Binance).
 """
+import logging
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-from typing import Generator, List
+from functools import reduce
+from typing import Any, Dict, Generator, List, NamedTuple, Optional
 from src.core.events import MarketDataEvent
-from src.core.config import config
+from src.core.config import Settings, config
+from src.data_fetcher.history_store import OHLCVStore
+
+logger = logging.getLogger(__name__)
+
+
+class OHLCVPanel(NamedTuple):
+    """
+    OHLCV data for several symbols laid out as (time x symbol) arrays.
+
+    Column j of every price/volume matrix belongs to symbols[j].
+    """
+    timestamps: np.ndarray  # datetime64[ns], UTC, shape (T,)
+    symbols: List[str]
+    open: np.ndarray  # shape (T, N)
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
 
 class DataCollector:
-    """Generates a stream of market data for backtesting."""
+    """
+    Provides a stream of market data for backtesting.
+
+    Bars come from an in-memory panel or a local OHLCVStore when one is
+    given, otherwise they are generated as mock data.
+    """
 
-    def __init__(self, symbols: List[str], start_date: str, end_date: str):
+    def __init__(
+        self,
+        symbols: List[str],
+        start_date: str,
+        end_date: str,
+        seed=None,
+        chunk_size: Optional[int] = None,
+        store: Optional[OHLCVStore] = None,
+        exchange: Optional[str] = None,
+        timeframe: str = '1h',
+        panel: Optional[OHLCVPanel] = None,
+        settings: Optional[Settings] = None,
+        base_timeframe: Optional[str] = None
+    ):
         """
-        Initializes the mock data generator.
+        Initializes the data collector.
 
         Args:
             symbols: A list of trading symbols (e.g., ['BTC/USDT']).
             start_date: The start date for the data stream (ISO format).
             end_date: The end date for the data stream (ISO format).
+            seed: Seed (or SeedSequence) for the mock price generator.
+            chunk_size: Bars per symbol generated in one block. Defaults to
+                `backtester.chunk_size` from the config.
+            store: Candle store to replay instead of generating mock data.
+            exchange: Exchange id of the stored candles.
+            timeframe: Bar timeframe (e.g., '1h').
+            panel: Bars already in memory (e.g., shared by a parameter sweep)
+                to replay instead of generating mock data.
+            settings: Configuration to use; defaults to the active config.
+            base_timeframe: Finer stored timeframe (e.g., '1m') to build the
+                stored `timeframe` bars from, instead of reading them directly.
         """
+        if settings is None:
+            settings = config.settings
         self.symbols = symbols
-        self.start_dt = pd.to_datetime(start_date)
-        self.end_dt = pd.to_datetime(end_date)
+        self.start_dt = self._to_utc(start_date)
+        self.end_dt = self._to_utc(end_date)
         self.current_dt = self.start_dt
-        self.base_prices = {symbol: np.random.uniform(20000, 40000) for symbol in symbols}
+        self.store = store
+        self.exchange = exchange
+        self.timeframe = timeframe
+        self.base_timeframe = base_timeframe if base_timeframe != timeframe else None
+        self.panel = panel
+        self.bar_interval = pd.Timedelta(timeframe)
+        self.chunk_size = chunk_size or settings.get('backtester.chunk_size', 1000)
+        self.rng = np.random.default_rng(seed)
+        self.base_prices = self.rng.uniform(20000, 40000, len(symbols))
+        # Mock blocks starting at or before current_dt, as (start, RNG state,
+        # prices before the block), so any bar can be regenerated
+        self._origins = [(self.start_dt, self.rng.bit_generator.state, self.base_prices.copy())]
+
+    @staticmethod
+    def _to_utc(date: str) -> pd.Timestamp:
+        """Parses a date, treating naive values as UTC."""
+        timestamp = pd.Timestamp(date)
+        return timestamp.tz_localize('UTC') if timestamp.tzinfo is None else timestamp.tz_convert('UTC')
+
+    def get_bar_chunks(self) -> Generator[OHLCVPanel, None, None]:
+        """
+        A generator that yields blocks of bars for all symbols at once.
+
+        Each block covers up to `chunk_size` consecutive timestamps and is
+        produced by one vectorized draw, so memory stays bounded no matter
+        how long the date range is.
+
+        Yields:
+            An OHLCVPanel with arrays of shape (chunk_len, n_symbols).
+        """
+        if self.panel is not None:
+            yield from self._get_panel_chunks()
+            return
+        if self.store is not None:
+            yield from self._get_stored_chunks()
+            return
+
+        n_symbols = len(self.symbols)
+        shape = (self.chunk_size, n_symbols)
+        while self.current_dt <= self.end_dt:
+            # Every block is drawn in full, so the bars do not depend on
+            # end_date and a later run can extend this one exactly
+            block_start, rng_state, self.base_prices = self._origins[-1]
+            self.rng.bit_generator.state = rng_state
+            skip = (self.current_dt - block_start) // self.bar_interval
+            remaining = (self.end_dt - self.current_dt) // self.bar_interval + 1
+            stop = int(min(self.chunk_size, skip + remaining))
+
+            # Simulate price movement: each bar opens at a small random
+            # move from the previous close and closes inside its range.
+            change_pct = self.rng.normal(0.0001, 0.01, shape)
+            up_pct = self.rng.uniform(0, 0.01, shape)
+            down_pct = self.rng.uniform(0, 0.01, shape)
+            close_pos = self.rng.random(shape)
+            volume = self.rng.uniform(100, 1000, shape)
+
+            bar_return = (1 + change_pct) * (1 - down_pct + (up_pct + down_pct) * close_pos)
+            close = self.base_prices * np.cumprod(bar_return, axis=0)
+            prev_close = np.vstack([self.base_prices, close[:-1]])
+            open_price = prev_close * (1 + change_pct)
+            # Guard the range against rounding in the cumulative product
+            high = np.maximum(open_price * (1 + up_pct), close)
+            low = np.minimum(open_price * (1 - down_pct), close)
+
+            timestamps = pd.date_range(
+                self.current_dt, periods=stop - skip, freq=self.bar_interval
+            ).tz_convert(None).to_numpy()
+
+            next_start = block_start + self.chunk_size * self.bar_interval
+            self._origins = self._origins[-1:] + [(next_start, self.rng.bit_generator.state, close[-1].copy())]
+            self.current_dt = block_start + stop * self.bar_interval
+            if stop < self.chunk_size:
+                # Ended inside the block; keep regenerating it from its origin
+                self._origins.pop()
+
+            yield OHLCVPanel(
+                timestamps=timestamps,
+                symbols=list(self.symbols),
+                open=open_price[skip:stop],
+                high=high[skip:stop],
+                low=low[skip:stop],
+                close=close[skip:stop],
+                volume=volume[skip:stop],
+            )
+
+    def get_state(self, next_dt: pd.Timestamp) -> Dict[str, Any]:
+        """
+        Captures where a consumer of the stream stands.
+
+        The generator may already have produced bars past next_dt (up to
+        one chunk ahead); the state describes the stream from next_dt on.
+
+        Args:
+            next_dt: The first bar the consumer has not processed.
+
+        Returns:
+            A picklable state for set_state.
+        """
+        origin = max((origin for origin in self._origins if origin[0] <= next_dt), key=lambda origin: origin[0])
+        return {'current_dt': next_dt, 'origin': origin}
+
+    def set_state(self, state: Dict[str, Any]):
+        """Continues the stream from a state captured by get_state."""
+        self.current_dt = state['current_dt']
+        self._origins = [state['origin']]
+
+    def _get_panel_chunks(self) -> Generator[OHLCVPanel, None, None]:
+        """Replays the in-memory panel in chunks of views (no copies)."""
+        to_naive = lambda dt: dt.tz_convert(None).to_datetime64()
+        lo = int(np.searchsorted(self.panel.timestamps, to_naive(self.current_dt), side='left'))
+        end = int(np.searchsorted(self.panel.timestamps, to_naive(self.end_dt), side='right'))
+        for start in range(lo, end, self.chunk_size):
+            stop = min(start + self.chunk_size, end)
+            self.current_dt = pd.Timestamp(self.panel.timestamps[stop - 1], tz='UTC') + self.bar_interval
+            yield OHLCVPanel(
+                self.panel.timestamps[start:stop],
+                list(self.panel.symbols),
+                *(field[start:stop] for field in self.panel[2:])
+            )
+
+    def _get_stored_chunks(self) -> Generator[OHLCVPanel, None, None]:
+        """
+        Replays candles from the store in chunks.
+
+        Only timestamps present for every symbol are served. The store reads
+        are zero-copy; each chunk gathers its rows into (chunk_len x N) arrays.
+        With a base timeframe, the bars are resampled from it and cached in
+        the store first, aggregating only candles added since the last run.
+        """
+        timeframe = self.timeframe
+        if self.base_timeframe is not None:
+            # Imported here: the resampler builds on this module's panels
+            from src.data_fetcher.resampler import cached_timeframe, update_resampled
+            for symbol in self.symbols:
+                update_resampled(self.store, self.exchange, symbol, self.base_timeframe, [self.timeframe])
+            timeframe = cached_timeframe(self.timeframe, self.base_timeframe)
+        to_ms = lambda dt: dt.value // 1_000_000
+        series = [
+            self.store.read(self.exchange, symbol, timeframe, to_ms(self.current_dt), to_ms(self.end_dt))
+            for symbol in self.symbols
+        ]
+        common = reduce(np.intersect1d, [candles.timestamp for candles in series])
+        if not len(common):
+            logger.warning("DataCollector: No stored %s candles shared by %s.", timeframe, self.symbols)
+            return
+        positions = [np.searchsorted(candles.timestamp, common) for candles in series]
+
+        for lo in range(0, len(common), self.chunk_size):
+            hi = min(lo + self.chunk_size, len(common))
+            gather = lambda name: np.column_stack([
+                getattr(candles, name)[rows[lo:hi]] for candles, rows in zip(series, positions)
+            ])
+            self.current_dt = pd.Timestamp(int(common[hi - 1]), unit='ms', tz='UTC') + self.bar_interval
+            yield OHLCVPanel(
+                timestamps=common[lo:hi].astype('datetime64[ms]').astype('datetime64[ns]'),
+                symbols=list(self.symbols),
+                open=gather('open'),
+                high=gather('high'),
+                low=gather('low'),
+                close=gather('close'),
+                volume=gather('volume'),
+            )
 
     def get_data_stream(self) -> Generator[MarketDataEvent, None, None]:
         """
         A generator that yields new market data events at each timestep.
 
+        Thin adapter over get_bar_chunks for the event-driven pipeline.
+
         Yields:
             A MarketDataEvent object.
         """
-        print("DataCollector: Starting data stream...")
-        while self.current_dt <= self.end_dt:
-            for symbol in self.symbols:
-                # Simulate price movement
-                base_price = self.base_prices[symbol]
-                change_pct = np.random.normal(0.0001, 0.01)
-                open_price = base_price * (1 + change_pct)
-                high_price = open_price * (1 + np.random.uniform(0, 0.01))
-                low_price = open_price * (1 - np.random.uniform(0, 0.01))
-                close_price = np.random.uniform(low_price, high_price)
-                volume = np.random.uniform(100, 1000)
-
-                self.base_prices[symbol] = close_price # Update for next tick
-
-                yield MarketDataEvent(
-                    timestamp=self.current_dt,
-                    symbol=symbol,
-                    open=open_price,
-                    high=high_price,
-                    low=low_price,
-                    close=close_price,
-                    volume=volume,
-                )
-            # Move to the next hour
-            self.current_dt += timedelta(hours=1)
-        print("DataCollector: Data stream finished.")
\ No newline at end of file
+        logger.info("DataCollector: Starting data stream...")
+        for chunk in self.get_bar_chunks():
+            rows = zip(
+                pd.DatetimeIndex(chunk.timestamps, tz='UTC'),
+                chunk.open.tolist(),
+                chunk.high.tolist(),
+                chunk.low.tolist(),
+                chunk.close.tolist(),
+                chunk.volume.tolist(),
+            )
+            for timestamp, opens, highs, lows, closes, volumes in rows:
+                for j, symbol in enumerate(self.symbols):
+                    yield MarketDataEvent(
+                        timestamp=timestamp,
+                        symbol=symbol,
+                        open=opens[j],
+                        high=highs[j],
+                        low=lows[j],
+                        close=closes[j],
+                        volume=volumes[j],
+                    )
+        logger.info("DataCollector: Data stream finished.")
+
+    def get_ohlcv_panel(self) -> OHLCVPanel:
+        """
+        Collects the whole date range into (time x symbol) arrays.
+
+        The panel holds exactly the bars `get_data_stream` would yield,
+        so both backtest engines see the same market.
+
+        Returns:
+            An OHLCVPanel covering start_date to end_date.
+        """
+        return concat_panels(list(self.get_bar_chunks()), self.symbols)
+
+
+def concat_panels(chunks: List[OHLCVPanel], symbols: List[str]) -> OHLCVPanel:
+    """
+    Joins consecutive chunks into a single panel.
+
+    Args:
+        chunks: Chunks in time order, all over the same symbols.
+        symbols: The symbols, used when there are no chunks.
+
+    Returns:
+        An OHLCVPanel spanning all chunks.
+    """
+    if not chunks:
+        return OHLCVPanel(
+            np.empty(0, dtype='datetime64[ns]'), list(symbols),
+            *(np.empty((0, len(symbols))) for _ in range(5))
+        )
+    return OHLCVPanel(
+        timestamps=np.concatenate([chunk.timestamps for chunk in chunks]),
+        symbols=list(chunks[0].symbols),
+        open=np.concatenate([chunk.open for chunk in chunks]),
+        high=np.concatenate([chunk.high for chunk in chunks]),
+        low=np.concatenate([chunk.low for chunk in chunks]),
+        close=np.concatenate([chunk.close for chunk in chunks]),
+        volume=np.concatenate([chunk.volume for chunk in chunks]),
+    )
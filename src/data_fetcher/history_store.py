@@ -0,0 +1,204 @@
+# src/data_fetcher/history_store.py
+"""
+Local on-disk store for historical OHLCV candles.
+
+Each (exchange, symbol, timeframe) series lives in its own directory as
+one raw binary file per column plus a small metadata file:
+
+    <root>/<exchange>/<BASE-QUOTE>/<timeframe>/
+        timestamp.bin   int64, milliseconds since epoch, sorted ascending
+        open.bin ... volume.bin   float64
+        meta.json       committed row count
+
+Columns are read back with np.memmap, so range queries are a binary search
+on the timestamp column followed by zero-copy slices. Updates only append
+candles newer than the last stored one.
+"""
+import json
+import logging
+import numpy as np
+from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# ccxt-style fetcher: fetch_ohlcv(symbol, timeframe, since=ms, limit=n)
+# returning [[timestamp_ms, open, high, low, close, volume], ...]
+FetchOHLCV = Callable[..., Sequence[Sequence[float]]]
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class CandleSeries(NamedTuple):
+    """A contiguous range of candles for one symbol (views into the store)."""
+    timestamp: np.ndarray  # int64 milliseconds since epoch
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+
+class OHLCVStore:
+    """Append-only, memory-mapped candle store keyed by exchange, symbol and timeframe."""
+
+    def __init__(self, root: Path):
+        """
+        Initializes the store.
+
+        Args:
+            root: Directory holding the store; created on first write.
+        """
+        self.root = Path(root)
+
+    def _series_dir(self, exchange: str, symbol: str, timeframe: str) -> Path:
+        """Returns the directory of one candle series."""
+        return self.root / exchange / symbol.replace('/', '-') / timeframe
+
+    def _row_count(self, series_dir: Path) -> int:
+        """Returns the number of committed rows in a series."""
+        meta_path = series_dir / 'meta.json'
+        if not meta_path.exists():
+            return 0
+        with open(meta_path, 'r') as f:
+            return json.load(f)['rows']
+
+    def symbols(self, exchange: str, timeframe: str) -> List[str]:
+        """
+        Lists the symbols stored for an exchange and timeframe.
+
+        Returns:
+            Symbols in 'BASE/QUOTE' form.
+        """
+        exchange_dir = self.root / exchange
+        if not exchange_dir.exists():
+            return []
+        return sorted(
+            path.name.replace('-', '/') for path in exchange_dir.iterdir()
+            if (path / timeframe / 'meta.json').exists()
+        )
+
+    def last_timestamp(self, exchange: str, symbol: str, timeframe: str) -> Optional[int]:
+        """
+        Returns the timestamp (ms) of the newest stored candle, or None if empty.
+        """
+        series = self.read(exchange, symbol, timeframe)
+        return int(series.timestamp[-1]) if len(series.timestamp) else None
+
+    def append(self, exchange: str, symbol: str, timeframe: str, candles: Sequence[Sequence[float]]) -> int:
+        """
+        Appends candles to a series.
+
+        Candles at or before the last stored timestamp are ignored, so
+        overlapping fetches are safe to append.
+
+        Args:
+            exchange: Exchange id (e.g., 'binance').
+            symbol: Trading symbol (e.g., 'BTC/USDT').
+            timeframe: Candle timeframe (e.g., '1h').
+            candles: Rows of [timestamp_ms, open, high, low, close, volume].
+
+        Returns:
+            The number of candles written.
+        """
+        rows = np.asarray(candles, dtype=np.float64).reshape(-1, 6)
+        timestamps = rows[:, 0].astype(np.int64)
+        order = np.argsort(timestamps, kind='stable')
+        timestamps, rows = timestamps[order], rows[order]
+
+        series_dir = self._series_dir(exchange, symbol, timeframe)
+        n_rows = self._row_count(series_dir)
+        last = self.last_timestamp(exchange, symbol, timeframe)
+        keep = np.ones(len(timestamps), dtype=bool)
+        keep[1:] = timestamps[1:] != timestamps[:-1]
+        if last is not None:
+            keep &= timestamps > last
+        if not keep.any():
+            return 0
+
+        series_dir.mkdir(parents=True, exist_ok=True)
+        columns = {'timestamp': timestamps[keep]}
+        columns.update({name: rows[keep, i + 1] for i, name in enumerate(PRICE_COLUMNS)})
+        for name, values in columns.items():
+            path = series_dir / f'{name}.bin'
+            with open(path, 'ab') as f:
+                # Drop bytes from an append that was interrupted before commit
+                f.truncate(n_rows * values.itemsize)
+                f.write(np.ascontiguousarray(values).tobytes())
+
+        new_rows = n_rows + int(keep.sum())
+        with open(series_dir / 'meta.json', 'w') as f:
+            json.dump({'rows': new_rows, 'columns': list(columns)}, f)
+        return new_rows - n_rows
+
+    def read(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None
+    ) -> CandleSeries:
+        """
+        Reads candles in [start_ms, end_ms] as read-only memory-mapped views.
+
+        Args:
+            exchange: Exchange id.
+            symbol: Trading symbol.
+            timeframe: Candle timeframe.
+            start_ms: Inclusive lower bound in ms, or None for the first candle.
+            end_ms: Inclusive upper bound in ms, or None for the last candle.
+
+        Returns:
+            A CandleSeries; empty if the series does not exist.
+        """
+        series_dir = self._series_dir(exchange, symbol, timeframe)
+        n_rows = self._row_count(series_dir)
+        if n_rows == 0:
+            return CandleSeries(np.empty(0, dtype=np.int64), *(np.empty(0) for _ in PRICE_COLUMNS))
+
+        timestamp = np.memmap(series_dir / 'timestamp.bin', dtype=np.int64, mode='r', shape=(n_rows,))
+        lo = 0 if start_ms is None else int(np.searchsorted(timestamp, start_ms, side='left'))
+        hi = n_rows if end_ms is None else int(np.searchsorted(timestamp, end_ms, side='right'))
+        prices = [
+            np.memmap(series_dir / f'{name}.bin', dtype=np.float64, mode='r', shape=(n_rows,))[lo:hi]
+            for name in PRICE_COLUMNS
+        ]
+        return CandleSeries(timestamp[lo:hi], *prices)
+
+    def update(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        fetch_ohlcv: FetchOHLCV,
+        since_ms: Optional[int] = None,
+        limit: int = 1000
+    ) -> int:
+        """
+        Fetches and appends only the candles after the last stored one.
+
+        Args:
+            exchange: Exchange id.
+            symbol: Trading symbol.
+            timeframe: Candle timeframe.
+            fetch_ohlcv: A ccxt-style fetcher, e.g. ccxt.binance().fetch_ohlcv,
+                or any callable with the same signature (such as a fixture).
+            since_ms: Where to start if the series is empty.
+            limit: Candles requested per call.
+
+        Returns:
+            The number of candles added.
+        """
+        last = self.last_timestamp(exchange, symbol, timeframe)
+        since = since_ms if last is None else last + 1
+        added = 0
+        while True:
+            candles = fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+            written = self.append(exchange, symbol, timeframe, candles) if candles else 0
+            if not written:
+                break
+            added += written
+            since = self.last_timestamp(exchange, symbol, timeframe) + 1
+        logger.info("OHLCVStore: Added %d %s candles for %s on %s.", added, timeframe, symbol, exchange)
+        return added
@@ -0,0 +1,176 @@
+# src/data_fetcher/live_feed.py
+"""
+Ingests live candles for many symbols concurrently.
+
+One polling task per symbol shares the pooled exchange client; all of
+them start at the latest bar closed on the exchange's clock. Closed
+bars are validated into MarketDataEvents, grouped per timestamp and put on
+a bounded queue. When the consumer falls behind the queue fills up and
+the pollers stop fetching until it drains; bars missed meanwhile are
+fetched in one request on resume, so memory stays bounded without losing
+data. A symbol that stops delivering bars holds back at most
+`max_pending` timestamps; older ones are then emitted without it.
+"""
+import asyncio
+import logging
+import time
+import pandas as pd
+from typing import Dict, List, Optional
+from src.core.events import MarketDataEvent, parse_event
+from src.exchange.http_client import HTTPError
+from src.exchange.rest_api import ExchangeRestAPI
+from src.core.instrumentation import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+# Fields of an exchange candle after its timestamp
+CANDLE_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class LiveDataFeed:
+    """
+    Polls closed candles for a set of symbols into a bounded queue of batches.
+
+    Each queue item is the list of MarketDataEvents of one timestamp, in
+    symbol order, like the batches the Backtester passes to the agents.
+    """
+
+    def __init__(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        api: ExchangeRestAPI,
+        queue_size: int = 64,
+        poll_delay: float = 0.25,
+        limit: int = 1000,
+        max_pending: int = 16
+    ):
+        """
+        Initializes the feed; call run() to start polling.
+
+        Args:
+            symbols: Symbols in 'BASE/QUOTE' form.
+            timeframe: Candle interval, e.g. '1m'.
+            api: The exchange client.
+            queue_size: Maximum number of batches waiting for the consumer.
+            poll_delay: Seconds after a bar's expected close to poll for it,
+                and between retries.
+            limit: Maximum candles per request when catching up.
+            max_pending: Maximum incomplete timestamps held back; beyond it
+                the oldest is emitted with the bars it has.
+        """
+        self.symbols = list(symbols)
+        self.timeframe = timeframe
+        self.interval_ms = int(pd.Timedelta(timeframe).total_seconds() * 1000)
+        self.api = api
+        self.poll_delay = poll_delay
+        self.limit = limit
+        self.max_pending = max_pending
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._pending: Dict[int, Dict[str, MarketDataEvent]] = {}
+        self._last_emitted: Optional[int] = None
+        self._emit_lock = asyncio.Lock()
+        self.bars_received = 0
+        self.batches_emitted = 0
+        self.late_bars = 0
+        self.incomplete_batches = 0
+        self.invalid_bars = 0
+        self.backpressure_waits = 0
+        self.fetch_errors = 0
+        self.ingest_latency = LatencyStats()
+
+    async def run(self):
+        """Polls every symbol until cancelled."""
+        logger.info("LiveDataFeed: Polling %d symbols (%s bars)...", len(self.symbols), self.timeframe)
+        # One start bar for all symbols, so none begins a bar before the others
+        since = await self._latest_closed_bar()
+        await asyncio.gather(*(self._poll(symbol, since) for symbol in self.symbols))
+
+    async def _latest_closed_bar(self) -> int:
+        """Returns the open time (ms) of the latest closed bar on the exchange's clock."""
+        while True:
+            try:
+                now_ms = await self.api.fetch_time()
+            except (HTTPError, OSError, asyncio.TimeoutError) as e:
+                self.fetch_errors += 1
+                logger.warning("LiveDataFeed: Fetching the exchange time failed: %s", e)
+                await asyncio.sleep(self.poll_delay)
+                continue
+            return (now_ms // self.interval_ms - 1) * self.interval_ms
+
+    async def _poll(self, symbol: str, since: int):
+        """Fetches one symbol's bars from `since` on, waking up at each bar close."""
+        while True:
+            try:
+                rows = await self.api.fetch_ohlcv(symbol, self.timeframe, since=since, limit=self.limit)
+            except (HTTPError, OSError, asyncio.TimeoutError) as e:
+                self.fetch_errors += 1
+                logger.warning("LiveDataFeed: Fetching %s failed: %s", symbol, e)
+                await asyncio.sleep(self.poll_delay)
+                continue
+
+            now_ms = time.time() * 1000
+            closed = [row for row in rows if row[0] + self.interval_ms <= now_ms]
+            for row in closed:
+                await self._on_bar(symbol, row)
+            if closed:
+                since = closed[-1][0] + self.interval_ms
+            if len(rows) >= self.limit and closed:
+                continue  # Still catching up
+
+            await asyncio.sleep(max(since + self.interval_ms - time.time() * 1000, 0) / 1000 + self.poll_delay)
+
+    async def _on_bar(self, symbol: str, row: List[float]):
+        """Adds a closed bar and emits every timestamp it completes."""
+        self.bars_received += 1
+        try:
+            # Exchange payloads are untrusted: malformed rows are dropped, not passed on
+            timestamp_ms = int(row[0])
+            event = parse_event(MarketDataEvent, {
+                'timestamp': pd.Timestamp(timestamp_ms, unit='ms', tz='UTC'),
+                'symbol': symbol,
+                **dict(zip(CANDLE_FIELDS, row[1:])),
+            })
+        except (TypeError, ValueError, IndexError) as e:
+            self.invalid_bars += 1
+            logger.warning("LiveDataFeed: Dropping invalid %s candle %r: %s", symbol, row, e)
+            return
+        if self._last_emitted is not None and timestamp_ms <= self._last_emitted:
+            self.late_bars += 1
+            return
+        pending = self._pending.setdefault(timestamp_ms, {})
+        pending[symbol] = event
+        if len(pending) == len(self.symbols):
+            # A complete timestamp also releases older, incomplete ones in order
+            await self._emit(sorted(ts for ts in self._pending if ts <= timestamp_ms))
+        elif len(self._pending) > self.max_pending:
+            oldest = sorted(self._pending)[:len(self._pending) - self.max_pending]
+            missing = set(self.symbols).difference(*(self._pending[ts] for ts in oldest))
+            logger.warning("LiveDataFeed: Emitting %d incomplete timestamps without %s bars; %d newer ones are waiting.",
+                           len(oldest), sorted(missing), self.max_pending)
+            await self._emit(oldest)
+
+    async def _emit(self, ready: List[int]):
+        """Queues the pending batches of the given timestamps, oldest first."""
+        batches = [self._pending.pop(ts) for ts in ready]
+        self.incomplete_batches += sum(len(events) < len(self.symbols) for events in batches)
+        self._last_emitted = ready[-1]
+        async with self._emit_lock:
+            for ts, events in zip(ready, batches):
+                if self.queue.full():
+                    self.backpressure_waits += 1
+                await self.queue.put([events[s] for s in self.symbols if s in events])
+                self.batches_emitted += 1
+                self.ingest_latency.record(time.time() * 1000 - (ts + self.interval_ms))
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the feed's counters."""
+        return {
+            'bars_received': self.bars_received,
+            'batches_emitted': self.batches_emitted,
+            'late_bars': self.late_bars,
+            'incomplete_batches': self.incomplete_batches,
+            'invalid_bars': self.invalid_bars,
+            'backpressure_waits': self.backpressure_waits,
+            'fetch_errors': self.fetch_errors,
+        }
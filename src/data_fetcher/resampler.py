@@ -0,0 +1,199 @@
+# src/data_fetcher/resampler.py
+"""
+Builds coarser bars (e.g. 5m, 1h, 4h, 1d) from one base series incrementally.
+
+Bars are aligned to the Unix epoch, so daily bars start at UTC midnight
+and 4h bars at 00:00, 04:00, ... UTC. Each target timeframe keeps its
+still-forming bar; every chunk of base bars updates it and emits the bars
+that completed, aggregated with one vectorized pass per timeframe, so
+one Resampler serves several timeframes from a single pass over the base
+bars.
+
+Completed aggregates of stored candles are cached back into the
+OHLCVStore (see `update_resampled`), so a repeated run only aggregates
+the base candles added since the last one.
+
+Usage:
+    resampler = Resampler(symbols, '1m', ['5m', '1h', '4h'])
+    for chunk in collector.get_bar_chunks():
+        completed = resampler.update(chunk)
+        strategy.on_bars(completed['1h'], completed['4h'])
+"""
+import logging
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional, Sequence
+from src.data_fetcher.data_collector import OHLCVPanel
+from src.data_fetcher.history_store import OHLCVStore
+
+logger = logging.getLogger(__name__)
+
+def timeframe_ns(timeframe: str) -> int:
+    """Length of a timeframe (e.g. '4h') in nanoseconds."""
+    return pd.Timedelta(timeframe).value
+
+
+def cached_timeframe(timeframe: str, base_timeframe: str) -> str:
+    """Store timeframe under which bars resampled from base_timeframe are cached."""
+    return f"{timeframe}@{base_timeframe}"
+
+
+class Resampler:
+    """
+    Aggregates base bars of several symbols into coarser timeframes.
+
+    Expects chunks in time order, all over the same symbols, as yielded by
+    DataCollector.get_bar_chunks.
+    """
+
+    def __init__(self, symbols: Sequence[str], base_timeframe: str, timeframes: Sequence[str]):
+        """
+        Initializes the resampler.
+
+        Args:
+            symbols: The symbols of the base bars, in column order.
+            base_timeframe: Timeframe of the base bars (e.g., '1m').
+            timeframes: Target timeframes, each a multiple of the base one.
+
+        Raises:
+            ValueError: If a target timeframe is not a multiple of the base timeframe.
+        """
+        self.symbols = list(symbols)
+        self.base_timeframe = base_timeframe
+        self.base_ns = timeframe_ns(base_timeframe)
+        self.steps: Dict[str, int] = {}
+        for timeframe in timeframes:
+            step = timeframe_ns(timeframe)
+            if step < self.base_ns or step % self.base_ns:
+                raise ValueError(f"Timeframe {timeframe} is not a multiple of the base timeframe {base_timeframe}")
+            self.steps[timeframe] = step
+        # Still-forming bar per timeframe, as a one-row OHLCVPanel
+        self._open: Dict[str, Optional[OHLCVPanel]] = dict.fromkeys(self.steps)
+
+    def open_bar(self, timeframe: str) -> Optional[OHLCVPanel]:
+        """The bar of a timeframe still forming, or None right after a completed one."""
+        return self._open[timeframe]
+
+    def get_state(self) -> Dict[str, Any]:
+        """The forming bars, for checkpoints."""
+        return {'open': dict(self._open)}
+
+    def set_state(self, state: Dict[str, Any]):
+        """Restores forming bars captured by get_state."""
+        self._open = dict(state['open'])
+
+    def update(self, chunk: OHLCVPanel) -> Dict[str, OHLCVPanel]:
+        """
+        Folds a chunk of base bars into every timeframe.
+
+        Args:
+            chunk: Base bars, later than every bar seen so far.
+
+        Returns:
+            The bars each timeframe completed, oldest first, keyed by
+            timeframe; panels are empty where none completed.
+        """
+        completed = {}
+        if not len(chunk.timestamps):
+            return {timeframe: self._empty() for timeframe in self.steps}
+        base_ns = chunk.timestamps.astype('datetime64[ns]').astype(np.int64)
+        for timeframe, step in self.steps.items():
+            bars = self._aggregate(base_ns, chunk, step, self._open[timeframe])
+            # The last bar is complete once its final base bar is in
+            if base_ns[-1] + self.base_ns >= bars.timestamps[-1].astype(np.int64) + step:
+                self._open[timeframe] = None
+            else:
+                self._open[timeframe] = OHLCVPanel(bars.timestamps[-1:], bars.symbols, *(field[-1:] for field in bars[2:]))
+                bars = OHLCVPanel(bars.timestamps[:-1], bars.symbols, *(field[:-1] for field in bars[2:]))
+            completed[timeframe] = bars
+        return completed
+
+    def _aggregate(
+        self,
+        base_ns: np.ndarray,
+        chunk: OHLCVPanel,
+        step: int,
+        forming: Optional[OHLCVPanel]
+    ) -> OHLCVPanel:
+        """Aggregates a chunk into bars of `step`, continuing the forming bar."""
+        bucket = base_ns - base_ns % step
+        starts = np.flatnonzero(np.concatenate([[True], bucket[1:] != bucket[:-1]]))
+        ends = np.concatenate([starts[1:], [len(bucket)]]) - 1
+        timestamps = bucket[starts].astype('datetime64[ns]')
+        open_price = chunk.open[starts]
+        high = np.maximum.reduceat(chunk.high, starts, axis=0)
+        low = np.minimum.reduceat(chunk.low, starts, axis=0)
+        close = chunk.close[ends]
+        volume = np.add.reduceat(chunk.volume, starts, axis=0)
+
+        if forming is not None:
+            if forming.timestamps[0] == timestamps[0]:
+                # The chunk continues the forming bar
+                open_price[0] = forming.open[0]
+                high[0] = np.maximum(high[0], forming.high[0])
+                low[0] = np.minimum(low[0], forming.low[0])
+                volume[0] += forming.volume[0]
+            else:
+                # A gap in the base bars left the forming bar without its end
+                timestamps = np.concatenate([forming.timestamps, timestamps])
+                open_price, high, low, close, volume = (
+                    np.concatenate([previous, current])
+                    for previous, current in zip(forming[2:], (open_price, high, low, close, volume))
+                )
+        return OHLCVPanel(timestamps, list(self.symbols), open_price, high, low, close, volume)
+
+    def _empty(self) -> OHLCVPanel:
+        """A panel without bars."""
+        n_symbols = len(self.symbols)
+        return OHLCVPanel(np.empty(0, dtype='datetime64[ns]'), list(self.symbols), *(np.empty((0, n_symbols)) for _ in range(5)))
+
+
+def update_resampled(
+    store: OHLCVStore,
+    exchange: str,
+    symbol: str,
+    base_timeframe: str,
+    timeframes: Sequence[str],
+    block_rows: int = 1_000_000
+) -> Dict[str, int]:
+    """
+    Caches stored base candles of a symbol as coarser series in the store.
+
+    Only base candles after the last cached bar are aggregated, in blocks
+    of block_rows, and only completed bars are cached. A still-forming
+    bar is aggregated again, in full, once more base candles are stored.
+
+    Args:
+        store: The candle store holding the base series.
+        exchange: Exchange id.
+        symbol: Trading symbol.
+        base_timeframe: Stored timeframe to aggregate (e.g., '1m').
+        timeframes: Target timeframes; cached as cached_timeframe(timeframe, base_timeframe).
+        block_rows: Base candles read and aggregated at a time.
+
+    Returns:
+        The number of bars added per timeframe.
+    """
+    added = {}
+    for timeframe in timeframes:
+        key = cached_timeframe(timeframe, base_timeframe)
+        last = store.last_timestamp(exchange, symbol, key)
+        since_ms = None if last is None else last + timeframe_ns(timeframe) // 1_000_000
+        base = store.read(exchange, symbol, base_timeframe, since_ms)
+        resampler = Resampler([symbol], base_timeframe, [timeframe])
+        added[timeframe] = 0
+        for lo in range(0, len(base.timestamp), block_rows):
+            rows = slice(lo, lo + block_rows)
+            bars = resampler.update(OHLCVPanel(
+                base.timestamp[rows].astype('datetime64[ms]').astype('datetime64[ns]'),
+                [symbol],
+                *(field[rows, None] for field in base[1:]),
+            ))[timeframe]
+            if len(bars.timestamps):
+                candles = np.column_stack([
+                    bars.timestamps.astype('datetime64[ms]').astype(np.int64), *(field[:, 0] for field in bars[2:])
+                ])
+                added[timeframe] += store.append(exchange, symbol, key, candles)
+        if added[timeframe]:
+            logger.info("Resampler: Cached %d %s bars of %s from %s candles.", added[timeframe], timeframe, symbol, base_timeframe)
+    return added
@@ -0,0 +1,354 @@
+# src/data_fetcher/scenario.py
+"""
+Generates reproducible synthetic markets for stress tests.
+
+Prices follow a one-factor model: each symbol's return loads on a shared
+market shock with the correlation of the current regime, plus a shock of
+its own. A Markov chain switches the market between regimes (e.g. calm,
+volatile, crisis), each with its own drift, volatility and correlation.
+Volatility clusters through an AR(1) log-volatility, half shared by the
+market and half per symbol. Flash crashes hit every symbol at once and are
+partly recovered over the following bars.
+
+Randomness is drawn in blocks of `block_bars` bars, each from its own
+stream: SeedSequence(seed, spawn_key=(MARKET_STREAM, block)) for the
+market path and SeedSequence(seed, spawn_key=(SYMBOL_STREAM, crc32(symbol),
+block)) for a symbol. A symbol's bars depend only on the seed, its name and
+the market path, never on the process that generates it or on the rest of
+the universe, so a seed gives the same bytes with any number of workers.
+
+The market path is generated first; worker processes then fill disjoint
+symbol columns of memory-mapped files directly, so a large universe never
+has to fit in one process's memory. The files are keyed by a hash of
+everything that defines them, and DataCollector replays them as a panel.
+
+Usage:
+    generator = ScenarioGenerator(symbols, '2023-01-01', '2023-12-31', seed=42)
+    panel = generator.load()
+    collector = DataCollector(symbols, '2023-01-01', '2023-12-31', panel=panel)
+"""
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import zlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+from src.core.config import Settings, config
+from src.data_fetcher.data_collector import DataCollector, OHLCVPanel
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the same settings would generate different data
+SCENARIO_VERSION = 1
+# First spawn_key entry of each kind of random stream
+MARKET_STREAM, SYMBOL_STREAM, PROFILE_STREAM = 0, 1, 2
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+MARKET_FIELDS = (('regime', np.int8), ('shock', np.float64), ('log_vol', np.float64), ('jump', np.float64))
+# Symbols generated per worker task
+SYMBOLS_PER_TASK = 256
+
+DEFAULT_REGIMES = (
+    {'name': 'calm', 'duration': 720, 'drift': 0.2, 'vol_scale': 1.0, 'correlation': 0.4},
+    {'name': 'volatile', 'duration': 240, 'drift': 0.0, 'vol_scale': 2.0, 'correlation': 0.6},
+    {'name': 'crisis', 'duration': 72, 'drift': -2.0, 'vol_scale': 3.5, 'correlation': 0.9},
+)
+
+
+def _stream(spec: Dict[str, Any], *key: int) -> np.random.Generator:
+    """The random stream of one kind, symbol and block of a scenario."""
+    return np.random.default_rng(np.random.SeedSequence(spec['seed'], spawn_key=key))
+
+
+def _symbol_key(symbol: str) -> int:
+    """Stable stream key of a symbol, independent of its column."""
+    return zlib.crc32(symbol.encode())
+
+
+def _n_blocks(spec: Dict[str, Any]) -> int:
+    return -(-spec['rows'] // spec['block_bars'])
+
+
+def generate_market(spec: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Generates the market-wide path of a scenario.
+
+    Args:
+        spec: The scenario specification (see ScenarioGenerator.spec).
+
+    Returns:
+        Per-bar arrays of shape (rows,): 'regime' (index into spec['regimes']),
+        'shock' (standard normal market shock), 'log_vol' (market part of
+        the log-volatility) and 'jump' (crash and recovery log returns).
+    """
+    block_bars, recovery_bars = spec['block_bars'], spec['recovery_bars']
+    total = _n_blocks(spec) * block_bars
+    durations = [regime['duration'] for regime in spec['regimes']]
+    phi = spec['vol_persistence']
+    scale = spec['vol_of_vol'] / np.sqrt(2)
+    crash_probability = spec['crashes_per_year'] * spec['interval'] / pd.Timedelta('365D').value
+
+    regime = np.empty(total, dtype=np.int8)
+    shock = np.empty(total)
+    log_vol = np.empty(total)
+    jump = np.zeros(total + recovery_bars)
+    current, remaining, h = 0, 0, 0.0
+    for block in range(_n_blocks(spec)):
+        rng = _stream(spec, MARKET_STREAM, block)
+        lo, hi = block * block_bars, (block + 1) * block_bars
+        shock[lo:hi] = rng.standard_normal(block_bars)
+        vol_shock = rng.standard_normal(block_bars)
+        crash = rng.random(block_bars) < crash_probability
+        depth = rng.uniform(*spec['crash_depth'], block_bars)
+
+        for t, shock_t in enumerate(vol_shock.tolist(), start=lo):
+            h = phi * h + scale * shock_t
+            log_vol[t] = h
+
+        for t, depth_t in zip(lo + np.flatnonzero(crash), depth[crash].tolist()):
+            drop = np.log1p(-depth_t)
+            jump[t] += drop
+            if recovery_bars:
+                jump[t + 1:t + 1 + recovery_bars] -= drop * spec['crash_recovery'] / recovery_bars
+
+        # Regimes last a geometric number of bars, then switch to another one
+        t = lo
+        while t < hi:
+            if not remaining:
+                remaining = int(rng.geometric(1 / durations[current])) if len(durations) > 1 else total
+            n = min(remaining, hi - t)
+            regime[t:t + n] = current
+            t += n
+            remaining -= n
+            if not remaining:
+                others = [k for k in range(len(durations)) if k != current]
+                current = others[int(rng.integers(len(others)))]
+
+    rows = spec['rows']
+    return {'regime': regime[:rows], 'shock': shock[:rows], 'log_vol': log_vol[:rows], 'jump': jump[:rows]}
+
+
+def _map_market(path: Path, rows: int) -> Dict[str, np.ndarray]:
+    """Memory-maps the market path files."""
+    return {
+        name: np.memmap(path / f'market_{name}.bin', dtype=dtype, mode='r', shape=(rows,))
+        for name, dtype in MARKET_FIELDS
+    }
+
+
+def open_market(path: Path) -> Dict[str, np.ndarray]:
+    """Memory-maps the market path of a generated scenario (e.g. to find its crisis bars)."""
+    with open(Path(path) / 'meta.json', 'r') as f:
+        rows = json.load(f)['rows']
+    return _map_market(Path(path), rows)
+
+
+def open_scenario(path: Path) -> OHLCVPanel:
+    """
+    Memory-maps a generated scenario as a panel.
+
+    Args:
+        path: A directory written by ScenarioGenerator.generate.
+
+    Returns:
+        An OHLCVPanel whose arrays are read-only views of the files.
+    """
+    path = Path(path)
+    with open(path / 'meta.json', 'r') as f:
+        meta = json.load(f)
+    shape = (meta['rows'], len(meta['symbols']))
+    timestamps = np.memmap(path / 'timestamps.bin', dtype='datetime64[ns]', mode='r', shape=(meta['rows'],))
+    return OHLCVPanel(
+        timestamps, list(meta['symbols']),
+        *(np.memmap(path / f'{name}.bin', dtype=np.float64, mode='r', shape=shape) for name in FIELDS)
+    )
+
+
+def generate_symbols(path: Path, spec: Dict[str, Any], lo: int, hi: int):
+    """
+    Generates the bars of symbol columns [lo, hi) into a scenario's files.
+
+    Runs in worker processes; columns are written in place, block by block.
+
+    Args:
+        path: The scenario directory, with the market path and the
+            preallocated bar files already written.
+        spec: The scenario specification.
+        lo, hi: The columns to generate.
+    """
+    path = Path(path)
+    rows, block_bars = spec['rows'], spec['block_bars']
+    shape = (rows, len(spec['symbols']))
+    bars = {name: np.memmap(path / f'{name}.bin', dtype=np.float64, mode='r+', shape=shape) for name in FIELDS}
+    market = _map_market(path, rows)
+    keys = [_symbol_key(symbol) for symbol in spec['symbols'][lo:hi]]
+
+    # Per-symbol profile: volatility, crash sensitivity, price and traded value
+    profile = np.array([_stream(spec, PROFILE_STREAM, key).random(4) for key in keys]).T
+    low_vol, high_vol = spec['volatility']
+    years_per_bar = spec['interval'] / pd.Timedelta('365D').value
+    base_sigma = (low_vol + (high_vol - low_vol) * profile[0]) * np.sqrt(years_per_bar)
+    crash_beta = 0.5 + profile[1]
+    close = 10 ** (5 * profile[2])
+    notional = 10 ** (5 + 2 * profile[3])
+
+    regimes = spec['regimes']
+    drift = np.array([regime['drift'] for regime in regimes]) * years_per_bar
+    vol_scale = np.array([regime['vol_scale'] for regime in regimes], dtype=float)
+    loading = np.sqrt([regime['correlation'] for regime in regimes])
+    phi = spec['vol_persistence']
+    scale = spec['vol_of_vol'] / np.sqrt(2)
+    # Variance of each log-volatility half; removing it keeps the mean volatility at base_sigma
+    half_variance = scale ** 2 / (1 - phi ** 2)
+
+    h = np.zeros(len(keys))
+    for block in range(_n_blocks(spec)):
+        start, stop = block * block_bars, min((block + 1) * block_bars, rows)
+        n_rows = stop - start
+        # Every block is drawn in full, so bars do not depend on the end date
+        draws = np.stack([_stream(spec, SYMBOL_STREAM, key, block).standard_normal((5, block_bars)) for key in keys], axis=-1)
+        shock, vol_shock, up, down, volume_noise = draws[:, :n_rows]
+
+        log_vol = np.empty((n_rows, len(keys)))
+        for t in range(n_rows):
+            h = phi * h + scale * vol_shock[t]
+            log_vol[t] = h
+
+        k = market['regime'][start:stop]
+        sigma = base_sigma * vol_scale[k, None] * np.exp(log_vol + market['log_vol'][start:stop, None] - half_variance)
+        rho = loading[k, None]
+        log_return = (
+            drift[k, None] - 0.5 * sigma ** 2
+            + sigma * (rho * market['shock'][start:stop, None] + np.sqrt(1 - rho ** 2) * shock)
+            + crash_beta * market['jump'][start:stop, None]
+        )
+        path_close = close * np.exp(np.cumsum(log_return, axis=0))
+        open_price = np.vstack([close, path_close[:-1]])
+        columns = (slice(start, stop), slice(lo, hi))
+        bars['open'][columns] = open_price
+        bars['high'][columns] = np.maximum(open_price, path_close) * np.exp(0.5 * sigma * np.abs(up))
+        bars['low'][columns] = np.minimum(open_price, path_close) * np.exp(-0.5 * sigma * np.abs(down))
+        bars['close'][columns] = path_close
+        # Volume rises with volatility
+        bars['volume'][columns] = notional / path_close * (sigma / base_sigma) * np.exp(0.5 * volume_noise - 0.125)
+        close = path_close[-1]
+
+
+def _generate_task(task: tuple):
+    """Worker entry point: one column range."""
+    generate_symbols(*task)
+
+
+class ScenarioGenerator:
+    """
+    Generates a scenario for a universe and date range once, then replays it.
+
+    Scenario parameters come from the `scenario` config section.
+    """
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        start_date: str,
+        end_date: str,
+        timeframe: str = '1h',
+        seed: Optional[int] = None,
+        settings: Optional[Settings] = None
+    ):
+        """
+        Initializes the generator.
+
+        Args:
+            symbols: The symbols to generate.
+            start_date: The first bar's time (ISO format).
+            end_date: The end of the range (ISO format), inclusive.
+            timeframe: Bar timeframe (e.g., '1h').
+            seed: Integer seed; None draws a fresh one, which is logged.
+            settings: Configuration to use; defaults to the active config.
+
+        Raises:
+            ValueError: If there are no symbols, the range holds no bars, or
+                the scenario parameters are inconsistent.
+        """
+        if settings is None:
+            settings = config.settings
+        start = DataCollector._to_utc(start_date)
+        interval = pd.Timedelta(timeframe)
+        rows = (DataCollector._to_utc(end_date) - start) // interval + 1
+        if not symbols or rows <= 0:
+            raise ValueError("A scenario needs at least one symbol and one bar")
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+            logger.info("ScenarioGenerator: Drew seed %d.", seed)
+        regimes = [regime.to_dict() for regime in settings.get('scenario.regimes', ())] or list(DEFAULT_REGIMES)
+        if any(regime['duration'] < 1 or not 0 <= regime['correlation'] <= 1 for regime in regimes):
+            raise ValueError("Regime durations must be at least one bar and correlations in [0, 1]")
+
+        self.root = Path(settings.get('scenario.path', 'data/scenarios'))
+        self.n_workers = settings.get('scenario.n_workers') or os.cpu_count()
+        # Everything that defines the data; saved as meta.json and hashed into the path
+        self.spec = {
+            'version': SCENARIO_VERSION,
+            'seed': int(seed),
+            'symbols': list(symbols),
+            'start': start.value,
+            'interval': interval.value,
+            'rows': int(rows),
+            'block_bars': settings.get('scenario.block_bars', 1000),
+            'volatility': list(settings.get('scenario.volatility', (0.4, 1.2))),
+            'vol_persistence': settings.get('scenario.vol_persistence', 0.98),
+            'vol_of_vol': settings.get('scenario.vol_of_vol', 0.1),
+            'regimes': regimes,
+            'crashes_per_year': settings.get('scenario.crashes_per_year', 4),
+            'crash_depth': list(settings.get('scenario.crash_depth', (0.1, 0.3))),
+            'crash_recovery': settings.get('scenario.crash_recovery', 0.6),
+            'recovery_bars': settings.get('scenario.recovery_bars', 12),
+        }
+        digest = hashlib.sha1(json.dumps(self.spec, sort_keys=True).encode()).hexdigest()[:16]
+        self.path = self.root / digest
+
+    def generate(self) -> Path:
+        """
+        Writes the scenario's files unless they already exist.
+
+        Returns:
+            The directory holding them.
+        """
+        path, spec = self.path, self.spec
+        if (path / 'meta.json').exists():
+            logger.info("ScenarioGenerator: Reusing scenario in %s", path)
+            return path
+        path.mkdir(parents=True, exist_ok=True)
+        rows, n_symbols = spec['rows'], len(spec['symbols'])
+
+        for name, values in generate_market(spec).items():
+            values.tofile(path / f'market_{name}.bin')
+        (spec['start'] + spec['interval'] * np.arange(rows, dtype=np.int64)).tofile(path / 'timestamps.bin')
+        for name in FIELDS:
+            # Sized up front; workers write their columns in place
+            with open(path / f'{name}.bin', 'wb') as f:
+                f.truncate(rows * n_symbols * np.dtype(np.float64).itemsize)
+
+        tasks = [(path, spec, lo, min(lo + SYMBOLS_PER_TASK, n_symbols)) for lo in range(0, n_symbols, SYMBOLS_PER_TASK)]
+        n_workers = min(self.n_workers, len(tasks))
+        logger.info("ScenarioGenerator: Generating %d bars x %d symbols on %d workers...", rows, n_symbols, n_workers)
+        if n_workers <= 1:
+            for task in tasks:
+                _generate_task(task)
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context()) as pool:
+                list(pool.map(_generate_task, tasks))
+
+        # Written last: its presence marks a complete scenario
+        with open(path / 'meta.json', 'w') as f:
+            json.dump(spec, f)
+        logger.info("ScenarioGenerator: Wrote scenario to %s", path)
+        return path
+
+    def load(self) -> OHLCVPanel:
+        """The scenario as a memory-mapped panel, generated first if needed."""
+        return open_scenario(self.generate())
@@ -0,0 +1,228 @@
+# src/exchange/http_client.py
+"""
+A small asyncio HTTP/1.1 client with a keep-alive connection pool.
+
+Built on asyncio streams only, so the live components need no extra
+dependency. Connections to the one host are reused across requests and
+at most `max_connections` requests are in flight at a time.
+"""
+import asyncio
+import json
+import ssl
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+
+class HTTPError(Exception):
+    """Raised for error responses (status >= 400)."""
+
+    def __init__(self, status: int, body: bytes):
+        super().__init__(f"HTTP {status}: {body[:200]!r}")
+        self.status = status
+        self.body = body
+
+
+class Response(NamedTuple):
+    """A complete HTTP response."""
+    status: int
+    headers: Dict[str, str]  # lower-cased names
+    body: bytes
+
+    def json(self) -> Any:
+        """Decodes the body as JSON."""
+        return json.loads(self.body)
+
+
+Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+# Methods safe to resend when a reused connection turns out to be closed
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'DELETE'})
+
+
+class AsyncHTTPClient:
+    """
+    Sends requests to a single base URL over pooled keep-alive connections.
+
+    Usage:
+        async with AsyncHTTPClient('http://127.0.0.1:8080') as client:
+            data = await client.get_json('/api/v3/time')
+    """
+
+    def __init__(self, base_url: str, max_connections: int = 4, timeout: float = 10.0):
+        """
+        Initializes the client; connections are opened on demand.
+
+        Args:
+            base_url: Scheme, host and optional port, e.g. 'https://api.binance.com'.
+            max_connections: Maximum number of concurrent connections.
+            timeout: Seconds to wait for a response.
+        """
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported URL scheme '{parts.scheme}'")
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == 'https' else None
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._slots = asyncio.Semaphore(max_connections)
+        self._idle: List[Connection] = []
+        self.connections_opened = 0
+
+    async def __aenter__(self) -> 'AsyncHTTPClient':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _connect(self) -> Connection:
+        """Opens a new connection to the host."""
+        connection = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=self.ssl), self.timeout
+        )
+        self.connections_opened += 1
+        return connection
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Response:
+        """
+        Sends one request and reads the whole response.
+
+        An idempotent request (GET, HEAD, DELETE) on a reused connection
+        that the server has since closed is retried once on a fresh
+        connection. Other requests are never resent: the server may have
+        acted on them, so the failure is raised for the caller to handle.
+
+        Args:
+            method: HTTP method, e.g. 'GET'.
+            path: Request path, e.g. '/api/v3/klines'.
+            params: Query string parameters.
+            body: Request body.
+            headers: Extra request headers.
+
+        Returns:
+            The response; error statuses are returned, not raised.
+
+        Raises:
+            ConnectionError: If the connection fails or closes before the
+                whole response is read.
+        """
+        target = f"{path}?{urlencode(params)}" if params else path
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {self.host}", "Connection: keep-alive"]
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        body = body or b''
+        if body or method in ('POST', 'PUT'):
+            lines.append(f"Content-Length: {len(body)}")
+        payload = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+        async with self._slots:
+            for attempt in range(2):
+                reused = bool(self._idle)
+                reader, writer = self._idle.pop() if reused else await self._connect()
+                try:
+                    writer.write(payload)
+                    await writer.drain()
+                    response, keep_alive = await asyncio.wait_for(self._read_response(reader), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError) as e:
+                    writer.close()
+                    if reused and attempt == 0 and method in IDEMPOTENT_METHODS:
+                        continue
+                    if isinstance(e, ConnectionError):
+                        raise
+                    raise ConnectionError("Connection closed before the whole response was read") from e
+                except BaseException:
+                    writer.close()
+                    raise
+                if keep_alive:
+                    self._idle.append((reader, writer))
+                else:
+                    writer.close()
+                return response
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader) -> Tuple[Response, bool]:
+        """Reads one response; returns it and whether the connection stays open."""
+        status_line = await reader.readuntil(b'\r\n')
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readuntil(b'\r\n')
+            if line == b'\r\n':
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            parts = []
+            while True:
+                size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                if size == 0:
+                    await reader.readuntil(b'\r\n')
+                    break
+                parts.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b''.join(parts)
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        else:
+            # No framing: the body runs to the end of the connection
+            return Response(status, headers, await reader.read()), False
+        return Response(status, headers, body), headers.get('connection', '').lower() != 'close'
+
+    async def request_json(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Any:
+        """
+        Sends a request with query parameters and decodes the JSON response.
+
+        Raises:
+            HTTPError: If the response status is 400 or higher.
+        """
+        response = await self.request(method, path, params=params, headers=headers)
+        if response.status >= 400:
+            raise HTTPError(response.status, response.body)
+        return response.json()
+
+    async def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Sends a GET request and decodes the JSON response.
+
+        Raises:
+            HTTPError: If the response status is 400 or higher.
+        """
+        return await self.request_json('GET', path, params=params)
+
+    async def post_json(self, path: str, data: Any, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Sends a JSON body with POST and decodes the JSON response.
+
+        Raises:
+            HTTPError: If the response status is 400 or higher.
+        """
+        body = json.dumps(data).encode()
+        response = await self.request(
+            'POST', path, params=params, body=body, headers={'Content-Type': 'application/json'}
+        )
+        if response.status >= 400:
+            raise HTTPError(response.status, response.body)
+        return response.json()
+
+    async def close(self):
+        """Closes all idle connections."""
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
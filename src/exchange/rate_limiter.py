@@ -0,0 +1,52 @@
+# src/exchange/rate_limiter.py
+"""
+Token-bucket rate limiting for exchange requests.
+"""
+import asyncio
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """
+    Allows bursts of up to `capacity` requests and `rate` requests per second on average.
+
+    Waiters are served in arrival order, so a burst of concurrent orders
+    goes out as fast as the limit allows without starving any of them.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Initializes a full bucket.
+
+        Args:
+            rate: Tokens added per second.
+            capacity: Maximum tokens (burst size); defaults to `rate`.
+            clock: Monotonic time source in seconds.
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        """Adds the tokens earned since the last update."""
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Takes tokens if available; returns whether it did."""
+        self._refill()
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+    async def acquire(self, tokens: float = 1.0):
+        """Waits until tokens are available and takes them."""
+        async with self._lock:
+            while not self.try_acquire(tokens):
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
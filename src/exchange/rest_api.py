@@ -0,0 +1,128 @@
+# src/exchange/rest_api.py
+"""
+Async client for the exchange's REST API (Binance-style endpoints).
+"""
+import hashlib
+import hmac
+import json
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
+from src.exchange.http_client import AsyncHTTPClient
+
+
+def exchange_symbol(symbol: str) -> str:
+    """Converts 'BTC/USDT' to the exchange's 'BTCUSDT' form."""
+    return symbol.replace('/', '')
+
+
+class ExchangeRestAPI:
+    """
+    Maps exchange endpoints to ccxt-style results.
+
+    All calls go through one pooled AsyncHTTPClient, so concurrent calls
+    for many symbols share a few keep-alive connections.
+    """
+
+    def __init__(self, client: AsyncHTTPClient, api_key: Optional[str] = None, secret: Optional[str] = None):
+        """
+        Initializes the API wrapper.
+
+        Args:
+            client: The pooled HTTP client for the exchange's base URL.
+            api_key: API key sent with trading requests.
+            secret: Secret used to sign trading requests (HMAC-SHA256).
+        """
+        self.client = client
+        self.api_key = api_key
+        self.secret = secret
+
+    async def fetch_time(self) -> int:
+        """Returns the exchange's clock in milliseconds since epoch."""
+        return (await self.client.get_json('/api/v3/time'))['serverTime']
+
+    async def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str,
+        since: Optional[int] = None,
+        limit: int = 500
+    ) -> List[List[float]]:
+        """
+        Fetches candles, oldest first; the last one may still be open.
+
+        Args:
+            symbol: Symbol in 'BASE/QUOTE' form.
+            timeframe: Kline interval, e.g. '1m'.
+            since: Earliest bar open time (ms) to return.
+            limit: Maximum number of candles.
+
+        Returns:
+            [[timestamp_ms, open, high, low, close, volume], ...]
+        """
+        params = {'symbol': exchange_symbol(symbol), 'interval': timeframe, 'limit': limit}
+        if since is not None:
+            params['startTime'] = since
+        rows = await self.client.get_json('/api/v3/klines', params)
+        return [[int(row[0]), *(float(value) for value in row[1:6])] for row in rows]
+
+    async def fetch_balances(self) -> Dict[str, float]:
+        """
+        Fetches the account's balances, free plus locked, by asset.
+
+        Returns:
+            {'USDT': 1000.0, 'BTC': 0.5, ...}
+        """
+        account = await self._signed('GET', '/api/v3/account', {})
+        return {
+            balance['asset']: float(balance['free']) + float(balance['locked'])
+            for balance in account['balances']
+        }
+
+    async def _signed(self, method: str, path: str, params: Dict[str, Any]) -> Any:
+        """Sends a trading request, signed when credentials are configured."""
+        headers = None
+        if self.api_key and self.secret:
+            params = {**params, 'timestamp': int(time.time() * 1000)}
+            params['signature'] = hmac.new(
+                self.secret.encode(), urlencode(params).encode(), hashlib.sha256
+            ).hexdigest()
+            headers = {'X-MBX-APIKEY': self.api_key}
+        return await self.client.request_json(method, path, params=params, headers=headers)
+
+    @staticmethod
+    def _order_params(order: Dict[str, Any]) -> Dict[str, Any]:
+        """Converts {symbol, side, quantity, client_order_id} to exchange parameters."""
+        return {
+            'symbol': exchange_symbol(order['symbol']),
+            'side': order['side'].upper(),
+            'type': 'MARKET',
+            'quantity': f"{order['quantity']:.8f}",
+            'newClientOrderId': order['client_order_id'],
+        }
+
+    async def create_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Places one market order.
+
+        Args:
+            order: {'symbol', 'side' ('buy'/'sell'), 'quantity', 'client_order_id'}.
+
+        Returns:
+            The exchange's order response (status, executedQty, fills, ...).
+        """
+        return await self._signed('POST', '/api/v3/order', self._order_params(order))
+
+    async def create_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Places several market orders in one request (venues with a batch endpoint).
+
+        Args:
+            orders: Orders as accepted by create_order.
+
+        Returns:
+            One response per order, in order; rejected orders come back as
+            {'code': ..., 'msg': ...}.
+        """
+        batch = json.dumps([self._order_params(order) for order in orders])
+        return await self._signed('POST', '/api/v3/batchOrders', {'batchOrders': batch})
@@ -0,0 +1,308 @@
+# src/exchange/stub_exchange.py
+"""
+A local stub exchange serving a Binance-style REST API over HTTP/1.1.
+
+Candles follow the wall clock: a bar opens every `timeframe` and its
+prices are a seeded random walk, so every poll sees the same closed bars.
+Market orders fill at the current bar's close, optionally only in part,
+move the account's balances, and order requests are rate limited like a
+real venue. Use it to run the
+live pipeline without network access or API keys:
+
+    poetry run python -m src.exchange.stub_exchange --port 8080
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+import numpy as np
+import pandas as pd
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+from src.core.logger import setup_logging
+from src.exchange.rate_limiter import TokenBucket
+from src.exchange.rest_api import exchange_symbol
+
+logger = logging.getLogger(__name__)
+
+# A route handler gets (query params, body) and returns (status, JSON payload)
+Handler = Callable[[Dict[str, str], bytes], Awaitable[Tuple[int, Any]]]
+
+
+class StubExchange:
+    """
+    Serves candles for a fixed set of symbols on a local port.
+    """
+
+    def __init__(
+        self,
+        symbols: List[str],
+        timeframe: str = '1m',
+        seed: Optional[int] = None,
+        latency: float = 0.0,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        history: int = 1000,
+        order_rate: Optional[float] = None,
+        max_batch_size: int = 5,
+        partial_fill_ratio: float = 0.0,
+        commission_rate: float = 0.001,
+        balances: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initializes the stub; call start() to begin serving.
+
+        Args:
+            symbols: Symbols in 'BASE/QUOTE' form.
+            timeframe: The only kline interval served, e.g. '1s' or '1m'.
+            seed: Seed for the price paths.
+            latency: Seconds added to every response.
+            host: Interface to listen on.
+            port: Port to listen on; 0 picks a free one.
+            history: Closed bars available before the server started.
+            order_rate: Order requests allowed per second (a batch counts
+                as one request); excess requests get HTTP 429. None disables.
+            max_batch_size: Most orders accepted by /api/v3/batchOrders.
+            partial_fill_ratio: Share of orders that fill only in part.
+            commission_rate: Commission charged on the filled notional.
+            balances: The account's starting balances by asset, e.g.
+                {'USDT': 100000.0}; None starts empty.
+        """
+        self.symbols = {exchange_symbol(symbol): j for j, symbol in enumerate(symbols)}
+        self.assets = {exchange_symbol(symbol): tuple(symbol.split('/')) for symbol in symbols}
+        self.balances: Dict[str, float] = dict(balances or {})
+        self.timeframe = timeframe
+        self.interval_ms = int(pd.Timedelta(timeframe).total_seconds() * 1000)
+        self.seed = seed if seed is not None else 0
+        self.latency = latency
+        self.host = host
+        self.port = port
+        self.requests_served = 0
+        self.orders_filled = 0
+        self.rate_limited = 0
+        self.order_limiter = TokenBucket(order_rate) if order_rate else None
+        self.max_batch_size = max_batch_size
+        self.partial_fill_ratio = partial_fill_ratio
+        self.commission_rate = commission_rate
+        self._order_rng = np.random.default_rng(self.seed)
+        self._next_order_id = 1
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._first_bar = int(time.time() * 1000) // self.interval_ms - history
+        self._bars: Dict[int, List[List[float]]] = {j: [] for j in self.symbols.values()}
+        self.routes: Dict[Tuple[str, str], Handler] = {
+            ('GET', '/api/v3/time'): self._time,
+            ('GET', '/api/v3/klines'): self._klines,
+            ('GET', '/api/v3/account'): self._account,
+            ('POST', '/api/v3/order'): self._order,
+            ('POST', '/api/v3/batchOrders'): self._batch_orders,
+        }
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        """Starts listening for connections."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("StubExchange: Serving %d symbols (%s bars) on %s", len(self.symbols), self.timeframe, self.url)
+
+    async def stop(self):
+        """Stops the server and closes its connections."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serves keep-alive requests on one connection until the client closes it."""
+        try:
+            while True:
+                try:
+                    request_line = await reader.readuntil(b'\r\n')
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readuntil(b'\r\n')
+                    if line == b'\r\n':
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                url = urlsplit(target)
+                handler = self.routes.get((method, url.path))
+                if handler is None:
+                    status, payload = 404, {'code': -1, 'msg': f"Unknown endpoint {method} {url.path}"}
+                else:
+                    try:
+                        status, payload = await handler(dict(parse_qsl(url.query)), body)
+                    except (KeyError, ValueError) as e:
+                        status, payload = 400, {'code': -1100, 'msg': f"Bad request: {e}"}
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                self.requests_served += 1
+
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status < 400 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode('latin-1')
+                    + data
+                )
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _time(self, params: Dict[str, str], body: bytes) -> Tuple[int, Any]:
+        """GET /api/v3/time"""
+        return 200, {'serverTime': int(time.time() * 1000)}
+
+    def _extend(self, j: int, last_bar: int) -> List[List[float]]:
+        """Generates symbol j's bars up to and including bar index last_bar."""
+        bars = self._bars[j]
+        while self._first_bar + len(bars) <= last_bar:
+            index = self._first_bar + len(bars)
+            rng = np.random.default_rng([self.seed, j, index])
+            open_ = bars[-1][4] if bars else 20000.0 + 1000.0 * j
+            close = open_ * float(np.exp(rng.normal(0, 0.002)))
+            high = max(open_, close) * (1 + float(rng.uniform(0, 0.001)))
+            low = min(open_, close) * (1 - float(rng.uniform(0, 0.001)))
+            volume = float(rng.uniform(1, 100))
+            bars.append([index * self.interval_ms, open_, high, low, close, volume])
+        return bars
+
+    async def _klines(self, params: Dict[str, str], body: bytes) -> Tuple[int, Any]:
+        """GET /api/v3/klines, including the still-open current bar like Binance."""
+        if params['interval'] != self.timeframe:
+            raise ValueError(f"interval must be {self.timeframe}")
+        if params['symbol'] not in self.symbols:
+            raise ValueError(f"unknown symbol {params['symbol']}")
+        limit = min(int(params.get('limit', 500)), 1000)
+        current_bar = int(time.time() * 1000) // self.interval_ms
+        bars = self._extend(self.symbols[params['symbol']], current_bar)
+
+        if 'startTime' in params:
+            start = max(-(-int(params['startTime']) // self.interval_ms) - self._first_bar, 0)
+            rows = bars[start:start + limit]
+        else:
+            rows = bars[-limit:]
+        return 200, [
+            [ts, f"{o:.8f}", f"{h:.8f}", f"{l:.8f}", f"{c:.8f}", f"{v:.8f}", ts + self.interval_ms - 1]
+            for ts, o, h, l, c, v in rows
+        ]
+
+    async def _account(self, params: Dict[str, str], body: bytes) -> Tuple[int, Any]:
+        """GET /api/v3/account (balances only)"""
+        return 200, {'balances': [
+            {'asset': asset, 'free': f"{amount:.8f}", 'locked': "0.00000000"}
+            for asset, amount in self.balances.items()
+        ]}
+
+    def _fill(self, params: Dict[str, str]) -> Dict[str, Any]:
+        """Fills one market order at the current bar's close."""
+        if params['symbol'] not in self.symbols:
+            raise ValueError(f"unknown symbol {params['symbol']}")
+        if params['side'] not in ('BUY', 'SELL'):
+            raise ValueError(f"bad side {params['side']}")
+        quantity = float(params['quantity'])
+        if quantity <= 0:
+            raise ValueError("quantity must be positive")
+        current_bar = int(time.time() * 1000) // self.interval_ms
+        price = self._extend(self.symbols[params['symbol']], current_bar)[-1][4]
+
+        executed = quantity
+        status = 'FILLED'
+        if self._order_rng.random() < self.partial_fill_ratio:
+            executed = quantity * float(self._order_rng.uniform(0.3, 0.9))
+            status = 'PARTIALLY_FILLED'
+        order_id = self._next_order_id
+        self._next_order_id += 1
+        self.orders_filled += 1
+        base, quote = self.assets[params['symbol']]
+        sign = 1.0 if params['side'] == 'BUY' else -1.0
+        self.balances[base] = self.balances.get(base, 0.0) + sign * executed
+        self.balances[quote] = (self.balances.get(quote, 0.0) - sign * executed * price
+                                - executed * price * self.commission_rate)
+        return {
+            'symbol': params['symbol'],
+            'orderId': order_id,
+            'clientOrderId': params.get('newClientOrderId', str(order_id)),
+            'transactTime': int(time.time() * 1000),
+            'side': params['side'],
+            'status': status,
+            'origQty': f"{quantity:.8f}",
+            'executedQty': f"{executed:.8f}",
+            'cummulativeQuoteQty': f"{executed * price:.8f}",
+            'fills': [{
+                'price': f"{price:.8f}",
+                'qty': f"{executed:.8f}",
+                'commission': f"{executed * price * self.commission_rate:.8f}",
+                'commissionAsset': 'USDT',
+            }],
+        }
+
+    def _rate_limit(self) -> Optional[Tuple[int, Any]]:
+        """Returns a 429 response when the order request rate is exceeded."""
+        if self.order_limiter is not None and not self.order_limiter.try_acquire():
+            self.rate_limited += 1
+            return 429, {'code': -1003, 'msg': 'Too many requests.'}
+        return None
+
+    async def _order(self, params: Dict[str, str], body: bytes) -> Tuple[int, Any]:
+        """POST /api/v3/order (market orders only)"""
+        return self._rate_limit() or (200, self._fill(params))
+
+    async def _batch_orders(self, params: Dict[str, str], body: bytes) -> Tuple[int, Any]:
+        """POST /api/v3/batchOrders with a JSON list in the batchOrders parameter."""
+        limited = self._rate_limit()
+        if limited:
+            return limited
+        orders = json.loads(params['batchOrders'])
+        if not 0 < len(orders) <= self.max_batch_size:
+            raise ValueError(f"batch must hold 1 to {self.max_batch_size} orders")
+        results = []
+        for order in orders:
+            try:
+                results.append(self._fill({key: str(value) for key, value in order.items()}))
+            except (KeyError, ValueError) as e:
+                results.append({'code': -1100, 'msg': f"Bad request: {e}"})
+        return 200, results
+
+
+def main():
+    """Runs a stub exchange until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve a local stub exchange.")
+    parser.add_argument('--symbols', nargs='+', default=['BTC/USDT', 'ETH/USDT'])
+    parser.add_argument('--timeframe', default='1m')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--order-rate', type=float, default=None)
+    parser.add_argument('--partial-fill-ratio', type=float, default=0.0)
+    parser.add_argument('--cash', type=float, default=100000.0, help="Starting balance of the quote currency")
+    parser.add_argument('--port', type=int, default=8080)
+    args = parser.parse_args()
+    setup_logging('INFO')
+
+    async def serve():
+        stub = StubExchange(
+            args.symbols, args.timeframe, args.seed, args.latency, port=args.port,
+            order_rate=args.order_rate, partial_fill_ratio=args.partial_fill_ratio,
+            balances={args.symbols[0].split('/')[1]: args.cash}
+        )
+        await stub.start()
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+# src/executor/fill_simulator.py
+"""
+Simulates backtest fills on finer candles inside each decision bar.
+
+An order decided on a bar reaches the market `latency` after the bar's
+close and may trade until the next decision, i.e. for one bar interval.
+Within that window it takes at most `max_participation` of each fine
+candle's volume, in time order; whatever the window's volume cannot
+absorb is left unfilled. Fine candles are priced at their typical price
+(high + low + close) / 3, and the order pays a market impact proportional
+to its size against the window's volume.
+
+Cumulative volume and notional per symbol are precomputed once, so a fill
+is a few binary searches on the timestamp and volume index, never a scan
+of the window.
+
+Usage:
+    book = IntrabarBook.from_store(store, 'binance', symbols, '1m', start_ns, end_ns)
+    simulator = FillSimulator(book, bar_interval_ns, latency_ns=250_000_000)
+    quantity, price = simulator.fill(0, decision_ns, 'buy', 1.5)
+"""
+import logging
+import numpy as np
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+from src.data_fetcher.history_store import OHLCVStore
+
+logger = logging.getLogger(__name__)
+
+
+class IntrabarSeries(NamedTuple):
+    """Fine candles of one symbol, indexed for window queries."""
+    timestamps: np.ndarray  # int64 ns since epoch (UTC), candle open times, sorted
+    price: np.ndarray  # typical price per candle, shape (M,)
+    cum_volume: np.ndarray  # volume before each candle, shape (M + 1,)
+    cum_notional: np.ndarray  # price * volume before each candle, shape (M + 1,)
+
+
+def index_candles(
+    timestamps: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray
+) -> IntrabarSeries:
+    """
+    Precomputes the cumulative sums a window query needs.
+
+    Args:
+        timestamps: Candle open times as int64 ns, sorted ascending.
+        high, low, close, volume: Candle fields, same length.
+
+    Returns:
+        An IntrabarSeries.
+    """
+    price = (np.asarray(high) + np.asarray(low) + np.asarray(close)) / 3
+    volume = np.nan_to_num(np.asarray(volume, dtype=float))
+    cum_volume = np.concatenate([[0.0], np.cumsum(volume)])
+    cum_notional = np.concatenate([[0.0], np.cumsum(price * volume)])
+    return IntrabarSeries(np.asarray(timestamps, dtype=np.int64), price, cum_volume, cum_notional)
+
+
+class IntrabarBook:
+    """
+    The fine candles of every traded symbol.
+
+    Independent of the fill parameters, so a sweep worker can build it once
+    and reuse it for every run.
+    """
+
+    def __init__(self, symbols: Sequence[str], series: Sequence[IntrabarSeries]):
+        """
+        Initializes the book.
+
+        Args:
+            symbols: The traded symbols.
+            series: Indexed fine candles per symbol, in the same order.
+        """
+        self.symbols = list(symbols)
+        self.symbol_index = {symbol: j for j, symbol in enumerate(self.symbols)}
+        self.series: List[IntrabarSeries] = list(series)
+
+    @classmethod
+    def from_store(
+        cls,
+        store: OHLCVStore,
+        exchange: str,
+        symbols: Sequence[str],
+        timeframe: str,
+        start_ns: int,
+        end_ns: int
+    ) -> 'IntrabarBook':
+        """
+        Loads and indexes stored fine candles for a date range.
+
+        Args:
+            store: The local candle store.
+            exchange: Exchange id of the candles.
+            symbols: The traded symbols.
+            timeframe: Fine candle timeframe (e.g., '1m').
+            start_ns: First decision bar's open time (ns).
+            end_ns: Last time an order may trade (ns).
+
+        Returns:
+            An IntrabarBook; symbols without stored candles get an empty series.
+        """
+        series = []
+        for symbol in symbols:
+            candles = store.read(exchange, symbol, timeframe, start_ns // 1_000_000, end_ns // 1_000_000)
+            if not len(candles.timestamp):
+                logger.warning("IntrabarBook: No stored %s candles for %s; its orders will not fill.", timeframe, symbol)
+            series.append(index_candles(
+                candles.timestamp * 1_000_000, candles.high, candles.low, candles.close, candles.volume
+            ))
+        return cls(symbols, series)
+
+
+class FillSimulator:
+    """
+    Fills orders against the fine candles of an IntrabarBook.
+
+    Stateless between orders: consecutive decisions trade in disjoint
+    windows. Rebalances are sized at the close, so a buy may cost more than
+    planned; given the cash left, it is cut to what that pays for and
+    never overdraws the account.
+    """
+
+    def __init__(
+        self,
+        book: IntrabarBook,
+        bar_interval_ns: int,
+        latency_ns: int = 0,
+        max_participation: float = 0.1,
+        impact: float = 0.1
+    ):
+        """
+        Initializes the simulator.
+
+        Args:
+            book: Fine candles of the traded symbols.
+            bar_interval_ns: Length of a decision bar.
+            latency_ns: Delay from the bar's close to the order reaching the market.
+            max_participation: Max fraction of each fine candle's volume an
+                order may take.
+            impact: Price move, as a fraction, of trading the window's whole
+                volume; smaller orders move it proportionally less.
+
+        Raises:
+            ValueError: If max_participation is not in (0, 1] or a length is negative.
+        """
+        if not 0 < max_participation <= 1:
+            raise ValueError("max_participation must be in (0, 1]")
+        if bar_interval_ns <= 0 or latency_ns < 0:
+            raise ValueError("bar_interval_ns must be positive and latency_ns non-negative")
+        self.book = book
+        self.symbol_index = book.symbol_index
+        self.bar_interval_ns = int(bar_interval_ns)
+        self.latency_ns = int(latency_ns)
+        self.max_participation = float(max_participation)
+        self.impact = float(impact)
+
+    def fill(
+        self,
+        j: int,
+        decision_ns: int,
+        action: str,
+        quantity: float,
+        budget: Optional[float] = None
+    ) -> Tuple[float, float]:
+        """
+        Simulates one order.
+
+        Args:
+            j: Index of the symbol in the book.
+            decision_ns: Open time (ns) of the bar the order was decided on.
+            action: 'buy' or 'sell'.
+            quantity: Quantity to trade.
+            budget: Most a buy may spend, in quote currency before
+                commission; None for no limit.
+
+        Returns:
+            A tuple (filled_quantity, average_price). The filled quantity is
+            below `quantity` for a partial fill and 0.0 (with price 0.0) when
+            the window holds no volume or the budget is spent.
+        """
+        series = self.book.series[j]
+        cum_volume = series.cum_volume
+        arrival = decision_ns + self.bar_interval_ns + self.latency_ns
+        lo, hi = np.searchsorted(series.timestamps, (arrival, arrival + self.bar_interval_ns)).tolist()
+        window_volume = float(cum_volume[hi] - cum_volume[lo])
+        if window_volume <= 0 or quantity <= 0:
+            return 0.0, 0.0
+
+        # Market volume the order trades alongside
+        needed = quantity / self.max_participation
+        if needed >= window_volume:
+            traded = window_volume
+            notional = float(series.cum_notional[hi] - series.cum_notional[lo])
+            quantity = window_volume * self.max_participation
+        else:
+            traded = needed
+            target = cum_volume[lo] + needed
+            # Candles before k - 1 are taken in full, candle k - 1 in part
+            k = int(np.searchsorted(cum_volume, target, side='left'))
+            notional = float(
+                series.cum_notional[k - 1] - series.cum_notional[lo]
+                + (target - cum_volume[k - 1]) * series.price[k - 1]
+            )
+
+        slippage = self.impact * quantity / window_volume
+        price = notional / traded * (1 + slippage if action == 'buy' else 1 - slippage)
+        if action == 'buy' and budget is not None and quantity * price > budget:
+            # Stop once the budget is spent, at the order's average price
+            if budget <= 0:
+                return 0.0, 0.0
+            quantity = budget / price
+        return quantity, price
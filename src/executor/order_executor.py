@@ -2,24 +2,84 @@
 """
 Executes trading orders, either live or in a simulated environment.
 """
-from typing import Optional
-from src.core.events import PortfolioDecisionEvent, OrderExecutionEvent
+import itertools
+import logging
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
+from src.core.events import MarketDataEvent, PortfolioDecisionEvent, OrderExecutionEvent
+from src.core.config import Settings, config
+
+if TYPE_CHECKING:
+    from src.executor.fill_simulator import FillSimulator
+    from src.exchange.rate_limiter import TokenBucket
+    from src.exchange.rest_api import ExchangeRestAPI
+
+logger = logging.getLogger(__name__)
+
+# Exchange order statuses that carry an executed quantity
+FILL_STATUSES = {'FILLED': 'filled', 'PARTIALLY_FILLED': 'partially_filled', 'EXPIRED': 'partially_filled'}
+
 
 class OrderExecutor:
     """
     Handles the execution of trade orders.
+
+    In live mode with an exchange API, a rebalance's orders are sent
+    concurrently (in batches where the venue supports them) through a
+    token-bucket rate limiter, and fills are reported as they arrive.
+
+    Simulated orders fill in full at the bar close unless a FillSimulator
+    is given, which fills them on finer candles within the next bar.
     """
-    def __init__(self, mode: str):
+    def __init__(
+        self,
+        mode: str,
+        api: Optional['ExchangeRestAPI'] = None,
+        settings: Optional[Settings] = None,
+        fill_simulator: Optional['FillSimulator'] = None
+    ):
         """
         Initializes the OrderExecutor.
 
         Args:
             mode: 'live' for real trading, 'backtest' for simulation.
+            api: Exchange client for live orders; without one, live
+                orders are simulated.
+            settings: Configuration to use; defaults to the active config.
+            fill_simulator: Intrabar fill model for simulated orders.
         """
+        if settings is None:
+            settings = config.settings
         if mode not in ['live', 'backtest']:
             raise ValueError("Mode must be either 'live' or 'backtest'")
         self.mode = mode
-        print(f"OrderExecutor: Initialized in {mode} mode.")
+        self.api = api
+        self.commission_rate = settings.get('executor.commission_rate', 0.001)
+        self.max_batch_size = settings.get('executor.max_batch_size', 1)
+        self.max_retries = settings.get('executor.max_retries', 3)
+        self.fill_simulator = fill_simulator
+        self.rate_limiter: Optional['TokenBucket'] = None
+        if api is not None:
+            # The exchange stack (and asyncio) is only imported for live orders
+            from src.exchange.rate_limiter import TokenBucket
+            self.rate_limiter = TokenBucket(
+                settings.get('executor.requests_per_second', 10.0),
+                settings.get('executor.burst', None),
+            )
+        self._order_ids = itertools.count(1)
+        # Last close per symbol, the reference price for simulated fills
+        self.market_prices: Dict[str, float] = {}
+        logger.info("OrderExecutor: Initialized in %s mode.", mode)
+
+    def get_state(self) -> Dict[str, Any]:
+        """The reference prices and the next client order id, for checkpoints."""
+        next_order_id = next(self._order_ids)
+        self._order_ids = itertools.count(next_order_id)
+        return {'market_prices': dict(self.market_prices), 'next_order_id': next_order_id}
+
+    def set_state(self, state: Dict[str, Any]):
+        """Restores a state captured by get_state."""
+        self.market_prices = dict(state['market_prices'])
+        self._order_ids = itertools.count(state['next_order_id'])
 
     def execute_order(
         self,
@@ -38,10 +98,9 @@ class OrderExecutor:
         """
         if self.mode == 'live':
             # --- Live Trading Logic ---
-            # Here you would integrate with the exchange's API
-            # e.g., client.create_order(...)
-            print(f"LIVE MODE: Would execute {decision_event.action} {decision_event.quantity} of {decision_event.symbol}")
-            # For now, we'll simulate it like a backtest
+            # Orders go to the exchange through execute_orders_async;
+            # a single synchronous call is only simulated.
+            logger.debug("LIVE MODE: Would execute %s %s of %s", decision_event.action, decision_event.quantity, decision_event.symbol)
             return self._simulate_execution(decision_event, market_price)
 
         elif self.mode == 'backtest':
@@ -49,26 +108,198 @@ class OrderExecutor:
 
         return None
 
+    def update_market_batch(self, market_events: List[MarketDataEvent]):
+        """
+        Records the latest close of each symbol.
+
+        Args:
+            market_events: One timestamp's market data events.
+        """
+        for event in market_events:
+            self.market_prices[event.symbol] = event.close
+
+    def execute_batch(
+        self,
+        decision_events: List[PortfolioDecisionEvent],
+        cash: Optional[float] = None
+    ) -> List[OrderExecutionEvent]:
+        """
+        Executes one rebalance's decisions at the latest recorded prices.
+
+        Args:
+            decision_events: The decisions, in the order to execute them.
+            cash: Cash before the rebalance. With a fill simulator, each buy
+                may then spend only what is left after the fills before it,
+                so partial sells or slippage cannot overdraw it.
+
+        Returns:
+            The execution results, in the same order.
+        """
+        if self.fill_simulator is None:
+            cash = None
+        executions = []
+        for decision_event in decision_events:
+            market_price = self.market_prices[decision_event.symbol]
+            if cash is None:
+                execution_event = self.execute_order(decision_event, market_price)
+            else:
+                execution_event = self._simulate_execution(decision_event, market_price, cash)
+                # The ledger arithmetic of PortfolioManager.update_holdings_from_fill
+                cost = execution_event.quantity * execution_event.fill_price
+                if decision_event.action == 'buy':
+                    cash -= (cost + execution_event.commission)
+                else:
+                    cash += (cost - execution_event.commission)
+            if execution_event:
+                executions.append(execution_event)
+        return executions
+
+    async def execute_batch_async(
+        self,
+        decision_events: List[PortfolioDecisionEvent]
+    ) -> AsyncIterator[OrderExecutionEvent]:
+        """
+        Async counterpart of execute_batch; yields results as they arrive.
+
+        Args:
+            decision_events: The decisions of one rebalance.
+        """
+        async for execution_event in self.execute_orders_async(decision_events, self.market_prices):
+            yield execution_event
+
+    async def execute_orders_async(
+        self,
+        decision_events: List[PortfolioDecisionEvent],
+        market_prices: Dict[str, float]
+    ) -> AsyncIterator[OrderExecutionEvent]:
+        """
+        Executes a rebalance's decisions concurrently.
+
+        Sells go out first, so their proceeds are available to the buys;
+        within each side orders are independent and sent at once, batched
+        up to executor.max_batch_size per request.
+
+        Args:
+            decision_events: The decisions of one rebalance.
+            market_prices: Current prices by symbol, for simulation.
+
+        Yields:
+            OrderExecutionEvents as their responses arrive, including
+            partial fills and failures.
+        """
+        if self.mode != 'live' or self.api is None:
+            for decision_event in decision_events:
+                yield self._simulate_execution(decision_event, market_prices[decision_event.symbol])
+            return
+
+        import asyncio
+        for action in ('sell', 'buy'):
+            side = [event for event in decision_events if event.action == action]
+            batch_size = max(self.max_batch_size, 1)
+            requests = [
+                asyncio.create_task(self._submit(side[i:i + batch_size]))
+                for i in range(0, len(side), batch_size)
+            ]
+            for request in asyncio.as_completed(requests):
+                for execution_event in await request:
+                    yield execution_event
+
+    async def _submit(self, decision_events: List[PortfolioDecisionEvent]) -> List[OrderExecutionEvent]:
+        """Sends one order (or batch), retrying when the venue rate limits it."""
+        import asyncio
+        from src.exchange.http_client import HTTPError
+        orders = [
+            {
+                'symbol': event.symbol,
+                'side': event.action,
+                'quantity': event.quantity,
+                'client_order_id': f"cmf-{next(self._order_ids)}",
+            }
+            for event in decision_events
+        ]
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire()
+            try:
+                if len(orders) == 1:
+                    responses = [await self.api.create_order(orders[0])]
+                else:
+                    responses = await self.api.create_orders(orders)
+                break
+            except HTTPError as e:
+                if e.status in (418, 429) and attempt < self.max_retries:
+                    await asyncio.sleep(0.1 * 2 ** attempt)
+                    continue
+                logger.warning("EXECUTOR (LIVE): Order request failed: %s", e)
+                responses = [{}] * len(orders)
+                break
+            except (OSError, asyncio.TimeoutError) as e:
+                # The outcome is unknown; report it as failed rather than resending
+                logger.warning("EXECUTOR (LIVE): Order request failed: %s", e)
+                responses = [{}] * len(orders)
+                break
+        return [self._to_execution(event, response) for event, response in zip(decision_events, responses)]
+
+    @staticmethod
+    def _to_execution(decision_event: PortfolioDecisionEvent, response: Dict[str, Any]) -> OrderExecutionEvent:
+        """Converts an exchange order response to an OrderExecutionEvent."""
+        status = FILL_STATUSES.get(response.get('status'), 'failed')
+        quantity = float(response.get('executedQty', 0.0))
+        if quantity <= 0:
+            status = 'failed'
+        fill_price = float(response['cummulativeQuoteQty']) / quantity if quantity > 0 else 0.0
+        commission = sum(float(fill['commission']) for fill in response.get('fills', []))
+
+        logger.debug("EXECUTOR (LIVE): %s %s of %.4f %s at %s",
+                     status, decision_event.action, quantity, decision_event.symbol, fill_price)
+
+        return OrderExecutionEvent(
+            timestamp=decision_event.timestamp,
+            symbol=decision_event.symbol,
+            action=decision_event.action,
+            quantity=quantity,
+            fill_price=fill_price,
+            commission=commission,
+            status=status
+        )
+
     def _simulate_execution(
         self,
         decision_event: PortfolioDecisionEvent,
-        market_price: float
+        market_price: float,
+        cash: Optional[float] = None
     ) -> OrderExecutionEvent:
         """
         Simulates the execution of an order for backtesting.
+
+        Fills at market_price, or through the fill simulator if there is
+        one; a simulated buy then spends at most `cash`, commission included.
         """
-        commission_rate = 0.001  # 0.1% commission
-        cost = decision_event.quantity * market_price
-        commission = cost * commission_rate
+        quantity, fill_price, status = decision_event.quantity, market_price, 'filled'
+        simulator = self.fill_simulator
+        if simulator is not None:
+            quantity, fill_price = simulator.fill(
+                simulator.symbol_index[decision_event.symbol],
+                decision_event.timestamp.value,
+                decision_event.action,
+                quantity,
+                None if cash is None else cash / (1 + self.commission_rate),
+            )
+            if quantity <= 0:
+                status = 'failed'
+            elif quantity < decision_event.quantity:
+                status = 'partially_filled'
+        cost = quantity * fill_price
+        commission = cost * self.commission_rate
 
-        print(f"EXECUTOR (SIM): Executed {decision_event.action} of {decision_event.quantity:.4f} {decision_event.symbol} at {market_price}")
+        logger.debug("EXECUTOR (SIM): %s %s of %.4f %s at %s",
+                     status, decision_event.action, quantity, decision_event.symbol, fill_price)
 
         return OrderExecutionEvent(
             timestamp=decision_event.timestamp,
             symbol=decision_event.symbol,
             action=decision_event.action,
-            quantity=decision_event.quantity,
-            fill_price=market_price,
+            quantity=quantity,
+            fill_price=fill_price,
             commission=commission,
-            status='filled'
-        )
\ No newline at end of file
+            status=status
+        )
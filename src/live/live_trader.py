@@ -0,0 +1,272 @@
+# src/live/live_trader.py
+"""
+Runs the agent pipeline on live market data.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import List, Optional
+from src.core.config import Settings, config
+from src.core.event_bus import EventBus
+from src.core.events import (
+    MarketDataEvent, SignalEvent, RiskAdjustedSignalEvent, PortfolioDecisionEvent, OrderExecutionEvent
+)
+from src.agents.signal_agent import SignalAgent
+from src.agents.risk_manager import RiskManager
+from src.agents.portfolio_manager import PortfolioManager
+from src.data_fetcher.live_feed import LiveDataFeed
+from src.exchange.http_client import AsyncHTTPClient, HTTPError
+from src.exchange.rest_api import ExchangeRestAPI
+from src.executor.order_executor import OrderExecutor
+from src.core.instrumentation import LatencyStats, PipelineMetrics
+from src.core.journal import TradeJournal
+
+logger = logging.getLogger(__name__)
+
+
+class LiveTrader:
+    """
+    Feeds live candles through the signal, risk, portfolio and execution stages.
+
+    Ingestion and order execution run on an asyncio event loop. The
+    agents run on the same EventBus stages as in backtests, dispatched
+    asynchronously (live.dispatch: 'async') or on worker threads
+    ('threaded'), so polling continues while they work. The bounded feed
+    queue and the bus's stage queues sit between the two. The portfolio
+    starts from the exchange account's balances; against the local stub
+    exchange that account holds backtester.initial_capital.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        """
+        Initializes the live components from the configuration.
+
+        Args:
+            settings: Configuration to use; defaults to the active config.
+        """
+        if settings is None:
+            settings = config.settings
+        self.settings = settings
+        self.symbols = settings.get('trading.pairs')
+        self.timeframe = settings.get('live.timeframe', '1m')
+        self.base_url = settings.get('live.base_url')
+        self.duration = settings.get('live.duration')
+
+        self.signal_agent = SignalAgent(self.symbols, settings=settings)
+        # Empty until run_async loads the exchange account's balances
+        self.portfolio_manager = PortfolioManager(
+            self.symbols, 0.0, settings.get('backtester.base_currency'), settings=settings,
+        )
+        # Reads the portfolio's positions across stages; _rebalance keeps them settled
+        self.risk_manager = RiskManager(self.symbols, self.timeframe, settings=settings, portfolio=self.portfolio_manager)
+        self.order_executor: Optional[OrderExecutor] = None
+        self.n_trades = 0
+        self.total_commission = 0.0
+        # Orders decided by the last rebalance whose results are not booked yet
+        self.open_orders = 0
+        # Bar close to signal, end to end (wall clock vs bar close time)
+        self.signal_latency = LatencyStats()
+        self.feed: Optional[LiveDataFeed] = None
+        self.metrics = PipelineMetrics.from_config(settings)
+        journal_path = settings.get('journal.path')
+        self.journal = TradeJournal(journal_path, settings.get('journal.buffer_rows', 4096)) if journal_path else None
+        self.bus = EventBus(
+            mode=settings.get('live.dispatch', 'async'),
+            queue_size=settings.get('live.queue_size', 64),
+            metrics=self.metrics,
+        )
+
+        logger.info("\n--- Live Trader Initialized ---")
+
+    def run(self):
+        """Runs until live.duration elapses or the process is interrupted."""
+        try:
+            asyncio.run(self.run_async())
+        except KeyboardInterrupt:
+            logger.info("LiveTrader: Interrupted.")
+        self.print_metrics()
+
+    async def run_async(self):
+        """Starts ingestion and processes batches as they arrive."""
+        stub = None
+        base_url = self.base_url
+        if base_url is None:
+            from src.exchange.stub_exchange import StubExchange
+            stub = StubExchange(
+                self.symbols, self.timeframe, self.settings.get('backtester.seed'),
+                balances={self.portfolio_manager.base_currency: self.settings.get('backtester.initial_capital')},
+            )
+            await stub.start()
+            base_url = stub.url
+
+        client = AsyncHTTPClient(
+            base_url,
+            max_connections=self.settings.get('live.max_connections', 4),
+            timeout=self.settings.get('live.request_timeout', 10.0),
+        )
+        # Orders get their own pool so they never queue behind candle polls
+        order_client = AsyncHTTPClient(
+            base_url,
+            max_connections=self.settings.get('executor.max_connections', 4),
+            timeout=self.settings.get('live.request_timeout', 10.0),
+        )
+        credentials = {}
+        if stub is None:
+            credentials = self.settings.get(f"api.{self.settings.get('trading.exchange')}", {})
+        order_api = ExchangeRestAPI(order_client, credentials.get('api_key'), credentials.get('secret'))
+        self.order_executor = OrderExecutor(mode='live', api=order_api, settings=self.settings)
+        try:
+            # Orders are sized against what the account holds, never a simulated capital
+            self.portfolio_manager.set_balances(await order_api.fetch_balances())
+        except (HTTPError, OSError, asyncio.TimeoutError) as e:
+            logger.error("LiveTrader: Cannot load the account balances (%s); not starting.", e)
+            await client.close()
+            await order_client.close()
+            if stub is not None:
+                await stub.stop()
+            raise
+        logger.info("LiveTrader: Starting from the account's holdings: %s", self.portfolio_manager.current_holdings)
+        self._subscribe_stages()
+        self.feed = LiveDataFeed(
+            self.symbols,
+            self.timeframe,
+            ExchangeRestAPI(client),
+            queue_size=self.settings.get('live.queue_size', 64),
+            max_pending=self.settings.get('live.max_pending', 16),
+            poll_delay=self.settings.get('live.poll_delay', 0.25),
+        )
+        logger.info("\n--- Starting Live Run ---")
+        if self.metrics is not None:
+            self.metrics.start()
+        if self.bus.mode == 'async':
+            await self.bus.start_async()
+        else:
+            self.bus.start(loop=asyncio.get_running_loop())
+        feed_task = asyncio.create_task(self.feed.run())
+        try:
+            await asyncio.wait_for(self._consume(feed_task), self.duration)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            feed_task.cancel()
+            await asyncio.gather(feed_task, return_exceptions=True)
+            # Let the batches already on the bus finish, orders included
+            if self.bus.mode == 'async':
+                await self.bus.stop_async()
+            else:
+                await asyncio.to_thread(self.bus.stop)
+            if self.journal is not None:
+                self.journal.close()
+                logger.info("Trade journal written to %s", self.journal.path)
+            await client.close()
+            await order_client.close()
+            if stub is not None:
+                await stub.stop()
+
+    async def _consume(self, feed_task: asyncio.Task):
+        """Moves batches from the feed queue onto the bus until the feed stops."""
+        queue = self.feed.queue
+        while True:
+            get = asyncio.ensure_future(queue.get())
+            try:
+                await asyncio.wait([get, feed_task], return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                if not get.done():
+                    get.cancel()
+            if get.cancelled():
+                feed_task.result()  # Re-raise why ingestion stopped
+                return
+            if self.bus.mode == 'async':
+                await self.bus.publish_async(get.result())
+            else:
+                # A full stage queue blocks the publisher; keep the loop free
+                await asyncio.to_thread(self.bus.publish, get.result())
+
+    def _subscribe_stages(self):
+        """Wires the agents into the event bus, upstream stages first."""
+        bus = self.bus
+        # 1. Signal Generation
+        bus.subscribe(MarketDataEvent, self._generate_signals, stage='signal')
+        # 2. Risk Assessment
+        bus.subscribe(MarketDataEvent, self.risk_manager.update_market_batch, stage='risk')
+        bus.subscribe(SignalEvent, self.risk_manager.assess_batch, stage='risk')
+        # 3. Portfolio Decision
+        bus.subscribe(MarketDataEvent, self.portfolio_manager.update_market_batch, stage='portfolio')
+        bus.subscribe(RiskAdjustedSignalEvent, self._rebalance, stage='portfolio')
+        # 5. Update Portfolio, booking full and partial fills as they come back
+        bus.subscribe(OrderExecutionEvent, self._book_executions, stage='portfolio')
+        # 4. Order Execution
+        bus.subscribe(MarketDataEvent, self.order_executor.update_market_batch, stage='executor')
+        bus.subscribe(PortfolioDecisionEvent, self.order_executor.execute_batch_async, stage='executor')
+        bus.subscribe(OrderExecutionEvent, self._record_executions, stage='recorder')
+        if self.journal is not None:
+            # Equity rows are approximate: stages run concurrently
+            bus.subscribe(MarketDataEvent, self._journal_equity, stage='journal')
+            bus.subscribe(PortfolioDecisionEvent, self.journal.record_decisions, stage='journal')
+            bus.subscribe(OrderExecutionEvent, self.journal.record_fills, stage='journal')
+        if self.metrics is not None:
+            self.metrics.track_drops('hold_signals', 'signal', MarketDataEvent)
+            self.metrics.track_drops('no_decision', 'portfolio', RiskAdjustedSignalEvent)
+
+    def _generate_signals(self, market_events: List[MarketDataEvent]) -> List[SignalEvent]:
+        """Runs the SignalAgent and records the bar close to signal latency."""
+        signal_events = self.signal_agent.process_market_batch(market_events)
+        bar_close_ms = market_events[0].timestamp.timestamp() * 1000 + self.feed.interval_ms
+        self.signal_latency.record(time.time() * 1000 - bar_close_ms)
+        return signal_events
+
+    def _rebalance(self, risk_events: List[RiskAdjustedSignalEvent]) -> List[PortfolioDecisionEvent]:
+        """
+        Rebalances, unless the previous rebalance's orders are still outstanding.
+
+        Stages run concurrently, so a timestamp's signals can reach the
+        portfolio before the fills of the previous timestamp's orders.
+        Rebalancing on positions that do not include them would order the
+        same trades again, so that timestamp is skipped instead. Both
+        handlers run on the portfolio stage, one batch at a time.
+        """
+        if self.open_orders:
+            logger.warning("LiveTrader: Skipping the %s rebalance; %d orders of the previous one are not booked yet.",
+                           risk_events[0].timestamp, self.open_orders)
+            if self.metrics is not None:
+                self.metrics.count('skipped_rebalances')
+            return []
+        decisions = self.portfolio_manager.rebalance(risk_events)
+        self.open_orders = len(decisions)
+        return decisions
+
+    def _book_executions(self, execution_events: List[OrderExecutionEvent]):
+        """Books fills; every decision gets exactly one result, filled or not."""
+        self.portfolio_manager.update_from_executions(execution_events)
+        self.open_orders = max(self.open_orders - len(execution_events), 0)
+
+    def _journal_equity(self, market_events: List[MarketDataEvent]):
+        """Journals the portfolio's cash and value at a timestamp."""
+        portfolio = self.portfolio_manager
+        self.journal.record_equity(market_events[0].timestamp, portfolio.cash, portfolio.total_value)
+
+    def _record_executions(self, execution_events: List[OrderExecutionEvent]):
+        """Counts the run's fills and commissions."""
+        for event in execution_events:
+            if event.status in ('filled', 'partially_filled'):
+                self.n_trades += 1
+                self.total_commission += event.commission
+            elif self.metrics is not None:
+                self.metrics.count('unfilled')
+
+    def print_metrics(self):
+        """Prints the run's portfolio and latency metrics."""
+        logger.info("\n--- Live Run Finished ---")
+        logger.info("Portfolio Value: %.2f", self.portfolio_manager.total_value)
+        logger.info("Trades: %d, Commission: %.2f", self.n_trades, self.total_commission)
+        if self.feed is not None:
+            logger.info("Feed: %s", json.dumps(self.feed.stats()))
+            logger.info("Bar close -> queued latency: %s", json.dumps(self.feed.ingest_latency.summary()))
+        logger.info("Bar close -> signal latency: %s", json.dumps(self.signal_latency.summary()))
+        if self.metrics is not None:
+            extra = {'signal_latency': self.signal_latency.summary()}
+            if self.feed is not None:
+                extra.update(feed=self.feed.stats(), ingest_latency=self.feed.ingest_latency.summary())
+            path = self.metrics.dump(self.settings.get('metrics.path', 'reports/metrics.json'), **extra)
+            logger.info("Pipeline metrics written to %s", path)
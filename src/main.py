@@ -1,13 +1,20 @@
 # src/main.py
+import logging
 import sys
 import os
 from pathlib import Path
-from src.backtester.backtester import Backtester    
 from src.core.config import config
+from src.core.logger import setup_logging
+
+# Named explicitly: run as a script, __name__ is '__main__', outside the 'src' loggers
+logger = logging.getLogger('src.main')
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 """
 Main entry point for the CMF application.
+
+Only the selected mode's (and engine's) modules are imported, so a run
+does not pay for the startup of the ones it does not use.
 """
 
 
@@ -18,20 +25,33 @@ def main():
     # Define the path to the configuration file
     config_path = Path(__file__).parent / 'core' / 'config.yaml'
 
-    # Initialize the backtester with the config path
-    backtester = Backtester(config_path=config_path)
+    settings = config.load_config(config_path)
+    setup_logging()
+    # load_config logged before there was a handler to show it
+    logger.info("Configuration loaded from %s", config_path)
 
     # Get the trading mode from the configuration
-    mode = config.get('trading.mode')
+    mode = settings.get('trading.mode')
 
     if mode == 'backtest':
+        # Pick the engine and initialize it with the loaded settings
+        engine = settings.get('trading.engine', 'event')
+        if engine == 'vectorized':
+            from src.backtester.vectorized_backtester import VectorizedBacktester
+            backtester = VectorizedBacktester(settings=settings)
+        elif engine == 'event':
+            from src.backtester.backtester import Backtester
+            backtester = Backtester(settings=settings)
+        else:
+            logger.error("Error: Backtest engine '%s' is not recognized.", engine)
+            return
         backtester.run()
     elif mode == 'live':
-        print("Live trading mode is not implemented yet.")
-        # live_trader = LiveTrader()
-        # live_trader.run()
+        from src.live.live_trader import LiveTrader
+        live_trader = LiveTrader(settings=settings)
+        live_trader.run()
     else:
-        print(f"Error: Trading mode '{mode}' is not recognized.")
+        logger.error("Error: Trading mode '%s' is not recognized.", mode)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
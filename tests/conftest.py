@@ -0,0 +1,42 @@
+"""
+Shared fixtures for the test suite.
+
+Run from the repository root:
+    poetry run python -m pytest
+
+The tests check correctness invariants only; throughput is tracked by
+benchmarks/suite.py, which compares against benchmarks/baseline.json.
+That file is machine-specific and not checked in: create it on the
+machine you compare on with
+    poetry run python -m benchmarks.suite --save-baseline
+"""
+import copy
+import yaml
+import pytest
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from src.core.config import Settings
+
+CONFIG_PATH = Path(__file__).resolve().parents[1] / 'src' / 'core' / 'config.yaml'
+
+
+@pytest.fixture(scope='session')
+def base_config() -> Dict[str, Any]:
+    """The shipped configuration as nested dicts; copy before changing it."""
+    with open(CONFIG_PATH) as f:
+        return yaml.safe_load(f)
+
+
+@pytest.fixture
+def make_settings(base_config) -> Callable[[Optional[Dict[str, Any]]], Settings]:
+    """Builds validated settings from the shipped config with dotted-key overrides."""
+    def make(overrides: Optional[Dict[str, Any]] = None) -> Settings:
+        data = copy.deepcopy(base_config)
+        for key, value in (overrides or {}).items():
+            *sections, name = key.split('.')
+            section = data
+            for part in sections:
+                section = section.setdefault(part, {})
+            section[name] = value
+        return Settings.from_dict(data)
+    return make
@@ -0,0 +1,117 @@
+"""
+Checkpoints: an extended or interrupted run resumes to the same result as one
+uninterrupted run, bit for bit, and both engines agree with each other.
+"""
+import logging
+import numpy as np
+import pytest
+from src.backtester.backtester import Backtester
+from src.backtester.vectorized_backtester import VectorizedBacktester
+from src.core.journal import read_journal
+
+ENGINES = {'event': Backtester, 'vectorized': VectorizedBacktester}
+PAIRS = ['BTC/USDT', 'ETH/USDT', 'SOL/USDT', 'XRP/USDT']
+SHORT_END = '2023-01-20T13:00:00Z'
+END = '2023-03-10T00:00:00Z'
+
+
+@pytest.fixture
+def run(make_settings, tmp_path):
+    """Runs a backtest; `interrupt_after` stops it like Ctrl-C once that many data items were read."""
+    def run(engine, name, end=END, resume=False, checkpoint=True, interrupt_after=None, **overrides):
+        settings = make_settings({
+            'trading.engine': engine,
+            'trading.pairs': PAIRS,
+            'backtester.end_date': end,
+            'backtester.chunk_size': 250,
+            'checkpoint.path': str(tmp_path / f'{name}.ckpt') if checkpoint else None,
+            'checkpoint.every_bars': 100,
+            'checkpoint.resume': resume,
+            'journal.path': str(tmp_path / f'{name}.bin'),
+            **overrides,
+        })
+        backtester = ENGINES[engine](settings=settings)
+        if interrupt_after is not None:
+            collector = backtester.data_collector
+            source = 'get_data_stream' if engine == 'event' else 'get_bar_chunks'
+            read = getattr(collector, source)
+
+            def interrupted():
+                for n, item in enumerate(read()):
+                    if n == interrupt_after:
+                        raise KeyboardInterrupt
+                    yield item
+            setattr(collector, source, interrupted)
+            with pytest.raises(KeyboardInterrupt):
+                backtester.run()
+            backtester.journal.close()
+            return None
+        backtester.run()
+        return backtester
+    return run
+
+
+def outcome(backtester):
+    """Everything a run leaves behind that must not depend on how it got there."""
+    return (
+        backtester.summary(),
+        backtester.portfolio_manager.current_holdings,
+        read_journal(backtester.journal.path),
+        backtester.recorder.bars['equity'][:backtester.recorder.n_bars].copy(),
+    )
+
+
+def assert_same(a, b):
+    assert a[0] == b[0]
+    assert a[1] == b[1]
+    assert a[2].equals(b[2])
+    np.testing.assert_array_equal(a[3], b[3])
+
+
+@pytest.fixture(scope='module', params=list(ENGINES))
+def engine(request):
+    return request.param
+
+
+def test_extension_matches_full_run(run, engine):
+    full = outcome(run(engine, 'full', checkpoint=False))
+    run(engine, 'ext', end=SHORT_END)
+    assert_same(outcome(run(engine, 'ext', resume=True)), full)
+
+
+def test_interrupted_run_resumes_bit_identical(run, engine, caplog):
+    full = outcome(run(engine, 'full', checkpoint=False))
+    run(engine, 'int', interrupt_after=1750 if engine == 'event' else 3)
+    with caplog.at_level(logging.INFO, logger='src'):
+        resumed = outcome(run(engine, 'int', resume=True))
+    assert 'Resuming from checkpoint' in caplog.text
+    assert_same(resumed, full)
+    # Resuming a finished run adds nothing
+    assert_same(outcome(run(engine, 'int', resume=True)), full)
+
+
+def test_resume_with_other_settings_is_refused(run, engine):
+    run(engine, 'changed', end=SHORT_END)
+    with pytest.raises(ValueError, match='different settings'):
+        run(engine, 'changed', resume=True, **{'risk.ewma_lambda': 0.9})
+
+
+def test_engines_agree(run):
+    event, vectorized = (outcome(run(engine, engine, checkpoint=False)) for engine in ENGINES)
+    assert_same(event, vectorized)
+
+
+def test_scenario_settings_are_part_of_the_checkpoint(run, tmp_path):
+    scenario = {
+        'data.source': 'scenario',
+        'scenario.path': str(tmp_path / 'scenarios'),
+        'scenario.n_workers': 1,
+        'scenario.block_bars': 500,
+    }
+    full = outcome(run('vectorized', 'full', checkpoint=False, **scenario))
+    run('vectorized', 'scenario', end=SHORT_END, **scenario)
+    with pytest.raises(ValueError, match='different settings'):
+        run('vectorized', 'scenario', resume=True, **{**scenario, 'scenario.crash_recovery': 0.5})
+    # Where scenarios are stored and how many workers build them do not change the data
+    resumed = run('vectorized', 'scenario', resume=True, **{**scenario, 'scenario.n_workers': 2})
+    assert_same(outcome(resumed), full)
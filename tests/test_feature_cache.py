@@ -0,0 +1,50 @@
+"""FeatureCache: extending a cached entry gives the same features as a fresh build."""
+import numpy as np
+from src.data_fetcher.data_collector import DataCollector
+from src.MLmodule.feature_engine.feature_cache import FeatureCache, open_features
+from src.MLmodule.feature_engine.feature_engine import DEFAULT_FEATURES
+
+SYMBOLS = ['A/USDT', 'B/USDT']
+DATA_KEY = {'seed': 1}
+
+
+def make_collector(end: str) -> DataCollector:
+    return DataCollector(SYMBOLS, '2022-01-01', end, seed=1, chunk_size=250)
+
+
+def read_all(path, rows):
+    """Stacks the per-symbol arrays to (symbols, rows, F) features and (symbols, rows) closes."""
+    _, arrays = open_features(path, rows)
+    return np.stack([f for f, _ in arrays]), np.stack([c for _, c in arrays])
+
+
+def test_extension_equals_fresh_build(tmp_path):
+    cache = FeatureCache(tmp_path / 'cached')
+    cache.get(make_collector('2022-01-20'), DEFAULT_FEATURES, DATA_KEY)
+    extended = cache.get(make_collector('2022-02-25'), DEFAULT_FEATURES, DATA_KEY)
+    assert cache.stats['extensions'] == 1
+
+    fresh = FeatureCache(tmp_path / 'fresh').get(make_collector('2022-02-25'), DEFAULT_FEATURES, DATA_KEY)
+    assert extended[1] == fresh[1]
+    for a, b in zip(read_all(*extended), read_all(*fresh)):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_shorter_range_is_a_prefix_hit(tmp_path):
+    cache = FeatureCache(tmp_path)
+    path, rows = cache.get(make_collector('2022-02-25'), DEFAULT_FEATURES, DATA_KEY)
+    prefix_path, prefix_rows = cache.get(make_collector('2022-01-10'), DEFAULT_FEATURES, DATA_KEY)
+    assert prefix_path == path and prefix_rows < rows
+    assert cache.stats['hits'] == 1 and cache.stats['misses'] == 1
+
+    features, close = read_all(path, rows)
+    prefix_features, prefix_close = read_all(prefix_path, prefix_rows)
+    np.testing.assert_array_equal(prefix_features, features[:, :prefix_rows])
+    np.testing.assert_array_equal(prefix_close, close[:, :prefix_rows])
+
+
+def test_data_key_separates_entries(tmp_path):
+    cache = FeatureCache(tmp_path)
+    first, _ = cache.get(make_collector('2022-01-20'), DEFAULT_FEATURES, DATA_KEY)
+    second, _ = cache.get(make_collector('2022-01-20'), DEFAULT_FEATURES, {'seed': 2})
+    assert first != second and cache.stats['misses'] == 2
@@ -0,0 +1,55 @@
+"""Streaming features: per-event and per-chunk updates agree, and match pandas-ta."""
+import numpy as np
+import pandas as pd
+import pytest
+from src.data_fetcher.data_collector import DataCollector
+from src.MLmodule.feature_engine.feature_engine import FeatureEngine
+from src.MLmodule.feature_engine.indicators import RollingState
+
+SYMBOLS = ['A/USDT', 'B/USDT', 'C/USDT']
+
+
+def make_collector() -> DataCollector:
+    return DataCollector(SYMBOLS, '2023-01-01', '2023-03-01', seed=2, chunk_size=100)
+
+
+@pytest.fixture(scope='module')
+def panel():
+    return make_collector().get_ohlcv_panel()
+
+
+@pytest.fixture(scope='module')
+def streamed(panel):
+    return FeatureEngine(SYMBOLS).update_chunk(panel)
+
+
+def test_event_updates_match_chunk_updates(streamed):
+    engine = FeatureEngine(SYMBOLS)
+    events = [engine.update_event(event) for event in make_collector().get_data_stream()]
+    np.testing.assert_array_equal(np.array(events).reshape(streamed.shape), streamed)
+
+
+@pytest.mark.parametrize('j', range(len(SYMBOLS)))
+def test_streaming_matches_pandas_ta(panel, streamed, j):
+    pytest.importorskip('pandas_ta')
+    engine = FeatureEngine(SYMBOLS)
+    frame = pd.DataFrame(
+        {name: getattr(panel, name)[:, j] for name in ('open', 'high', 'low', 'close', 'volume')},
+        index=pd.DatetimeIndex(panel.timestamps)
+    )
+    batch = engine.batch_features(frame).to_numpy()
+    np.testing.assert_array_equal(np.isnan(batch), np.isnan(streamed[:, j, :]))
+    np.testing.assert_allclose(streamed[:, j, :], batch, rtol=1e-9, atol=1e-12)
+
+
+def test_rolling_state_does_not_drift():
+    rng = np.random.default_rng(1)
+    length, n = 20, 50_000
+    x = 30000 + np.cumsum(rng.normal(0, 50, n)) + 1e4 * np.sin(np.arange(n) / 5000)
+    state, rows = RollingState(1, length), np.array([0])
+    for t in range(n):
+        full = state.update(rows, x[t:t + 1])
+        if full[0] and t % 997 == 0:
+            window = x[t - length + 1:t + 1]
+            assert state.mean[0] == pytest.approx(window.mean(), rel=1e-12)
+            assert state.variance(rows, 1)[0] == pytest.approx(window.var(ddof=1), rel=1e-9)
@@ -0,0 +1,57 @@
+"""OHLCVStore: appends round-trip exactly and overlapping fetches are deduplicated."""
+import numpy as np
+from src.data_fetcher.history_store import OHLCVStore
+
+HOUR_MS = 3_600_000
+
+
+def make_candles(n: int, start: int = 0, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    timestamps = (np.arange(start, start + n) * HOUR_MS).astype(np.float64)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return np.column_stack([timestamps, close * 0.999, close * 1.01, close * 0.99, close, rng.uniform(1, 10, n)])
+
+
+def test_round_trip(tmp_path):
+    candles = make_candles(200)
+    store = OHLCVStore(tmp_path)
+    assert store.append('binance', 'BTC/USDT', '1h', candles) == 200
+
+    series = OHLCVStore(tmp_path).read('binance', 'BTC/USDT', '1h')
+    np.testing.assert_array_equal(series.timestamp, candles[:, 0].astype(np.int64))
+    for i, name in enumerate(('open', 'high', 'low', 'close', 'volume'), start=1):
+        np.testing.assert_array_equal(getattr(series, name), candles[:, i])
+    assert store.last_timestamp('binance', 'BTC/USDT', '1h') == 199 * HOUR_MS
+    assert store.symbols('binance', '1h') == ['BTC/USDT']
+
+
+def test_read_bounds_are_inclusive(tmp_path):
+    store = OHLCVStore(tmp_path)
+    store.append('binance', 'ETH/USDT', '1h', make_candles(50))
+    series = store.read('binance', 'ETH/USDT', '1h', start_ms=10 * HOUR_MS, end_ms=20 * HOUR_MS)
+    np.testing.assert_array_equal(series.timestamp, np.arange(10, 21) * HOUR_MS)
+
+
+def test_overlapping_appends_are_ignored(tmp_path):
+    candles = make_candles(100)
+    store = OHLCVStore(tmp_path)
+    store.append('binance', 'BTC/USDT', '1h', candles[:60])
+    assert store.append('binance', 'BTC/USDT', '1h', candles[40:]) == 40
+    assert store.append('binance', 'BTC/USDT', '1h', candles[:10]) == 0
+    np.testing.assert_array_equal(store.read('binance', 'BTC/USDT', '1h').close, candles[:, 4])
+
+
+def test_update_fetches_only_new_candles(tmp_path):
+    candles = make_candles(120)
+    calls = []
+
+    def fetch_ohlcv(symbol, timeframe, since=None, limit=1000):
+        calls.append(since)
+        rows = candles[candles[:, 0] >= (since or 0)][:limit]
+        return rows.tolist()
+
+    store = OHLCVStore(tmp_path)
+    store.append('binance', 'BTC/USDT', '1h', candles[:70])
+    assert store.update('binance', 'BTC/USDT', '1h', fetch_ohlcv, limit=30) == 50
+    assert calls[0] == 69 * HOUR_MS + 1
+    np.testing.assert_array_equal(store.read('binance', 'BTC/USDT', '1h').close, candles[:, 4])
@@ -0,0 +1,135 @@
+"""
+Live ingestion against the local stub exchange, the feed's handling of bad
+and missing bars, and the live portfolio's starting balances.
+"""
+import asyncio
+import socket
+import pytest
+from src.agents.portfolio_manager import PortfolioManager
+from src.data_fetcher.live_feed import LiveDataFeed
+from src.exchange.http_client import AsyncHTTPClient
+from src.exchange.rest_api import ExchangeRestAPI
+from src.exchange.stub_exchange import StubExchange
+from src.live.live_trader import LiveTrader
+
+SYMBOLS = ['BTC/USDT', 'ETH/USDT', 'SOL/USDT']
+
+
+def closed_port() -> int:
+    """A local port nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def drain(queue: asyncio.Queue):
+    batches = []
+    while not queue.empty():
+        batches.append(queue.get_nowait())
+    return batches
+
+
+def test_feed_ingests_complete_batches_from_stub():
+    async def main():
+        stub = StubExchange(SYMBOLS, timeframe='1s', seed=3)
+        await stub.start()
+        try:
+            async with AsyncHTTPClient(stub.url) as client:
+                api = ExchangeRestAPI(client)
+                feed = LiveDataFeed(SYMBOLS, '1s', api, queue_size=100, poll_delay=0.05)
+                task = asyncio.create_task(feed.run())
+                await asyncio.sleep(3.5)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+                history = {
+                    symbol: {row[0]: row for row in await api.fetch_ohlcv(symbol, '1s', limit=20)}
+                    for symbol in SYMBOLS
+                }
+        finally:
+            await stub.stop()
+        return feed, drain(feed.queue), history
+
+    feed, batches, history = asyncio.run(main())
+    assert len(batches) >= 2
+    assert feed.stats()['invalid_bars'] == 0 and feed.stats()['incomplete_batches'] == 0
+    timestamps = [batch[0].timestamp for batch in batches]
+    assert all((b - a).total_seconds() == 1 for a, b in zip(timestamps, timestamps[1:]))
+    for batch in batches:
+        assert [event.symbol for event in batch] == SYMBOLS
+        for event in batch:
+            row = history[event.symbol][int(event.timestamp.timestamp() * 1000)]
+            assert [event.open, event.high, event.low, event.close, event.volume] == row[1:]
+
+
+def test_feed_drops_invalid_rows():
+    async def main():
+        feed = LiveDataFeed(['A/USDT', 'B/USDT'], '1m', api=None)
+        await feed._on_bar('A/USDT', [60000, '1.0', 2, 0.5, 1.5, 10])
+        for row in ([60000, 1, 2, 0.5, 'x', 10], [60000, 1, 2, 0.5], [None, 1, 2, 0.5, 1, 1]):
+            await feed._on_bar('B/USDT', row)
+        await feed._on_bar('B/USDT', [60000, 1, 2, 0.5, 1.2, 3])
+        return feed, drain(feed.queue)
+
+    feed, batches = asyncio.run(main())
+    assert feed.stats()['invalid_bars'] == 3
+    [batch] = batches
+    assert [(event.symbol, event.open) for event in batch] == [('A/USDT', 1.0), ('B/USDT', 1.0)]
+    assert all(isinstance(event.open, float) for event in batch)
+
+
+def test_feed_bounds_incomplete_timestamps():
+    async def main():
+        feed = LiveDataFeed(['A/USDT', 'B/USDT'], '1m', api=None, queue_size=100, max_pending=3)
+        for i in range(10):
+            await feed._on_bar('A/USDT', [i * 60000, 1, 2, 0.5, 1.5, 10])
+            assert len(feed._pending) <= 3
+        await feed._on_bar('B/USDT', [60000, 1, 2, 0.5, 1.5, 10])
+        await feed._on_bar('B/USDT', [9 * 60000, 1, 2, 0.5, 1.5, 10])
+        return feed, drain(feed.queue)
+
+    feed, batches = asyncio.run(main())
+    assert [len(batch) for batch in batches] == [1] * 9 + [2]
+    assert [batch[0].timestamp.minute for batch in batches] == list(range(10))
+    assert feed.stats()['incomplete_batches'] == 9 and feed.stats()['late_bars'] == 1
+    assert not feed._pending
+
+
+def test_portfolio_starts_from_account_balances(make_settings):
+    async def main():
+        stub = StubExchange(SYMBOLS, timeframe='1s', seed=3, balances={'USDT': 5000.0, 'ETH': 2.0})
+        await stub.start()
+        try:
+            async with AsyncHTTPClient(stub.url) as client:
+                api = ExchangeRestAPI(client)
+                before = await api.fetch_balances()
+                fill = await api.create_order(
+                    {'symbol': 'BTC/USDT', 'side': 'buy', 'quantity': 0.1, 'client_order_id': 'test-1'}
+                )
+                after = await api.fetch_balances()
+        finally:
+            await stub.stop()
+        return before, fill, after
+
+    before, fill, after = asyncio.run(main())
+    portfolio = PortfolioManager(SYMBOLS, 0.0, 'USDT', settings=make_settings())
+    portfolio.set_balances(before)
+    assert portfolio.current_holdings == {'USDT': 5000.0, 'BTC': 0.0, 'ETH': 2.0, 'SOL': 0.0}
+
+    notional = float(fill['cummulativeQuoteQty'])
+    commission = float(fill['fills'][0]['commission'])
+    assert after['BTC'] == pytest.approx(0.1)
+    assert after['USDT'] == pytest.approx(5000.0 - notional - commission)
+
+
+def test_live_trader_refuses_to_start_without_balances(make_settings):
+    settings = make_settings({
+        'trading.pairs': SYMBOLS,
+        'live.base_url': f'http://127.0.0.1:{closed_port()}',
+        'live.request_timeout': 1.0,
+        'journal.path': None,
+    })
+    trader = LiveTrader(settings=settings)
+    with pytest.raises(OSError):
+        asyncio.run(trader.run_async())
+    assert trader.portfolio_manager.cash == 0.0
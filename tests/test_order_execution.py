@@ -0,0 +1,84 @@
+"""
+Live order execution against the local stub exchange, and the HTTP client's
+handling of connections the server dropped.
+"""
+import asyncio
+from datetime import datetime, timezone
+import pytest
+from src.core.events import PortfolioDecisionEvent
+from src.exchange.http_client import AsyncHTTPClient
+from src.exchange.rest_api import ExchangeRestAPI
+from src.exchange.stub_exchange import StubExchange
+from src.executor.order_executor import OrderExecutor
+
+SYMBOLS = ['BTC/USDT', 'ETH/USDT', 'SOL/USDT']
+
+
+@pytest.mark.parametrize('max_batch_size', [1, 2])
+def test_executor_reports_every_order(make_settings, max_batch_size):
+    now = datetime.now(timezone.utc)
+    decisions = [
+        PortfolioDecisionEvent(timestamp=now, symbol=symbol, action=action, quantity=0.5)
+        for symbol, action in [('BTC/USDT', 'sell'), ('ETH/USDT', 'buy'), ('SOL/USDT', 'buy'),
+                               ('XRP/USDT', 'buy'), ('BTC/USDT', 'buy')]
+    ]
+    settings = make_settings({'executor.max_batch_size': max_batch_size, 'executor.requests_per_second': 100.0})
+
+    async def main():
+        stub = StubExchange(SYMBOLS, timeframe='1s', seed=5, partial_fill_ratio=0.5)
+        await stub.start()
+        try:
+            async with AsyncHTTPClient(stub.url) as client:
+                executor = OrderExecutor('live', api=ExchangeRestAPI(client), settings=settings)
+                executions = [event async for event in executor.execute_orders_async(decisions, {})]
+        finally:
+            await stub.stop()
+        return stub, executions
+
+    stub, executions = asyncio.run(main())
+    assert len(executions) == len(decisions)
+    # Sells go out before buys
+    assert executions[0].action == 'sell'
+    by_symbol = {(event.symbol, event.action): event for event in executions}
+    # XRP/USDT is not listed on the stub, so its order is rejected
+    assert by_symbol['XRP/USDT', 'buy'].status == 'failed'
+    filled = [event for event in executions if event.status != 'failed']
+    assert len(filled) == stub.orders_filled == len(decisions) - 1
+    for event in filled:
+        assert event.fill_price > 0 and event.commission > 0
+        if event.status == 'filled':
+            assert event.quantity == pytest.approx(0.5)
+        else:
+            assert event.status == 'partially_filled' and 0 < event.quantity < 0.5
+    assert any(event.status == 'partially_filled' for event in filled)
+
+
+def test_stale_connection_retries_only_idempotent_requests():
+    async def main():
+        requests = []
+
+        async def handle(reader, writer):
+            # One response per connection, then close without announcing it
+            requests.append(await reader.readuntil(b'\r\n\r\n'))
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}')
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            async with AsyncHTTPClient(f'http://127.0.0.1:{port}') as client:
+                await client.get_json('/a')
+                await asyncio.sleep(0.05)
+                assert await client.get_json('/b') == {}
+                assert len(requests) == 2
+                await asyncio.sleep(0.05)
+                with pytest.raises(ConnectionError):
+                    await client.post_json('/order', {'quantity': 1})
+                # The POST may have reached the venue, so it is never resent
+                assert len(requests) == 2
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(main())
@@ -0,0 +1,40 @@
+"""ScenarioGenerator: the generated market does not depend on how it was computed."""
+import numpy as np
+import pytest
+from src.data_fetcher.scenario import ScenarioGenerator
+
+SYMBOLS = [f'S{i}/USDT' for i in range(24)]
+
+
+@pytest.fixture
+def generate(make_settings, tmp_path):
+    def run(n_workers, symbols=SYMBOLS, end='2023-03-31', name=None):
+        settings = make_settings({
+            'scenario.path': str(tmp_path / (name or f'w{n_workers}')),
+            'scenario.n_workers': n_workers,
+            'scenario.block_bars': 500,
+        })
+        return ScenarioGenerator(symbols, '2023-01-01', end, '1h', seed=7, settings=settings).load()
+    return run
+
+
+def test_worker_count_does_not_change_output(generate):
+    serial, parallel = generate(1), generate(3)
+    np.testing.assert_array_equal(serial.timestamps, parallel.timestamps)
+    for a, b in zip(serial[2:], parallel[2:]):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_symbols_and_range_are_stable(generate):
+    full = generate(1)
+    subset = generate(1, SYMBOLS[10:14], name='subset')
+    np.testing.assert_array_equal(subset.close, full.close[:, 10:14])
+    longer = generate(2, SYMBOLS[:4], end='2023-06-30', name='longer')
+    np.testing.assert_array_equal(longer.close[:len(full.timestamps)], full.close[:, :4])
+
+
+def test_bars_are_valid(generate):
+    panel = generate(1)
+    assert (panel.high >= np.maximum(panel.open, panel.close)).all()
+    assert (panel.low <= np.minimum(panel.open, panel.close)).all()
+    assert (panel.low > 0).all()